@@ -8,12 +8,15 @@ load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 # Add the src directory to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from sentiment_analyzer import analyze_sentiment
+from sentiment_analyzer import sentiment_engines, warm_sentiment_pool
 from caption_generator import generate_caption
-from predict import predict_likes, predict_comments, predict_shares
-from flask import Flask, request, jsonify
+from predict import predict_likes, predict_comments, predict_shares, preload_models, get_model_stats, get_batching_stats
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
 import logging
+import random
+import time
+from contextlib import closing
 from datetime import datetime
 from routes.engagement import engagement_bp
 from routes.comments import comments_bp
@@ -22,13 +25,21 @@ from routes.sentiment import sentiment_bp
 from routes.caption import caption_bp
 from routes.optimize import optimize_bp
 from routes.time import time_bp
-from utils import transform_input_features, generate_optimization_recommendations
+from routes.batch import batch_bp
+from time_predict import load_time_prediction_model
+from utils import transform_input_features, generate_optimization_recommendations, format_sse
 from logger import logger
+from metrics import metrics, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from profiling import (PROFILING_ENABLED, PROFILE_SAMPLE_PERCENT, PROFILE_HEADER, PROFILE_TOKEN,
+                       PROFILER, PROFILE_FORMAT, PROFILE_FORMATS, PROFILE_DIR,
+                       create_profiler, profile_filename, write_profile)
 
 
 # LangChain integration (optional - graceful fallback if not available)
 try:
-    from langchain_integration import GeminiXGBoostOptimizer, SimFluenceLangChainAgent
+    from langchain_integration import get_agent_pool, get_agent_pool_stats, ANALYSIS_MODES
+    from llm_cache import get_llm_cache
+    from session_memory import session_store
     LANGCHAIN_AVAILABLE = True
     logger.info("LangChain integration loaded successfully")
 except ImportError as e:
@@ -45,6 +56,219 @@ app.register_blueprint(sentiment_bp)
 app.register_blueprint(caption_bp)
 app.register_blueprint(optimize_bp)
 app.register_blueprint(time_bp)
+app.register_blueprint(batch_bp)
+
+HTTP_REQUESTS = metrics.counter(
+    "simfluence_http_requests_total",
+    "HTTP requests, per blueprint, route, method and status",
+    ["blueprint", "route", "method", "status"])
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    "simfluence_http_request_duration_seconds",
+    "HTTP request latency (until the response body is sent), per blueprint and route",
+    ["blueprint", "route"])
+HTTP_ERRORS = metrics.counter(
+    "simfluence_http_request_errors_total",
+    "HTTP requests answered with a 5xx status, per blueprint and route",
+    ["blueprint", "route"])
+HTTP_IN_FLIGHT = metrics.gauge(
+    "simfluence_http_requests_in_flight",
+    "HTTP requests currently being served, per blueprint",
+    ["blueprint"])
+
+
+@app.before_request
+def start_request_metrics():
+    g.metrics_start = time.perf_counter()
+    g.metrics_labels = {
+        "blueprint": request.blueprint or "app",
+        "route": request.url_rule.rule if request.url_rule else "unmatched",
+    }
+    HTTP_IN_FLIGHT.inc(blueprint=g.metrics_labels["blueprint"])
+
+
+@app.after_request
+def record_request_metrics(response):
+    labels = g.pop('metrics_labels', None)
+    if labels is not None:
+        start, method, status = g.metrics_start, request.method, response.status_code
+
+        # Streamed responses are still running here, so finish timing when the body is done
+        def finish():
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, **labels)
+            HTTP_REQUESTS.inc(method=method, status=status, **labels)
+            if status >= 500:
+                HTTP_ERRORS.inc(**labels)
+            HTTP_IN_FLIGHT.dec(blueprint=labels["blueprint"])
+
+        response.call_on_close(finish)
+    return response
+
+
+@app.teardown_request
+def release_request_metrics(error=None):
+    # Labels are only left when an exception escaped before after_request ran
+    labels = g.pop('metrics_labels', None)
+    if labels is not None:
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - g.metrics_start, **labels)
+        HTTP_REQUESTS.inc(method=request.method, status=500, **labels)
+        HTTP_ERRORS.inc(**labels)
+        HTTP_IN_FLIGHT.dec(blueprint=labels["blueprint"])
+
+
+def collect_service_metrics():
+    """Cache, agent pool, session and micro-batching figures read at scrape time"""
+    caches = {"sentiment": sentiment_engines.stats()}
+    llm_cache = get_llm_cache() if LANGCHAIN_AVAILABLE else None
+    if llm_cache:
+        caches["llm_response"] = llm_cache.stats()
+    yield ("simfluence_cache_hits_total", "counter", "Cache hits, per cache",
+           [({"cache": name}, stats["hits"]) for name, stats in caches.items()])
+    yield ("simfluence_cache_misses_total", "counter", "Cache misses, per cache",
+           [({"cache": name}, stats["misses"]) for name, stats in caches.items()])
+    yield ("simfluence_cache_hit_ratio", "gauge", "Cache hit ratio since start, per cache",
+           [({"cache": name}, stats["hit_rate"]) for name, stats in caches.items()])
+
+    batching = get_batching_stats()
+    yield ("simfluence_predict_batches_total", "counter", "Micro-batched predicts run, per model",
+           [({"model": name}, stats["batches"]) for name, stats in batching.items()])
+    yield ("simfluence_predict_batch_items_total", "counter", "Rows predicted through the micro-batcher, per model",
+           [({"model": name}, stats["items"]) for name, stats in batching.items()])
+    yield ("simfluence_predict_batch_flushes_total", "counter", "Micro-batch flushes, per model and reason",
+           [({"model": name, "reason": reason}, count)
+            for name, stats in batching.items() for reason, count in stats["flushes"].items()])
+    yield ("simfluence_predict_batch_queue_wait_seconds_total", "counter",
+           "Time rows spent queued for a micro-batch, per model",
+           [({"model": name}, stats["queue_wait_seconds_total"]) for name, stats in batching.items()])
+    yield ("simfluence_predict_batch_max_size", "gauge", "Configured micro-batch size, per model",
+           [({"model": name}, stats["max_batch_size"]) for name, stats in batching.items()])
+    yield ("simfluence_predict_batch_max_wait_seconds", "gauge", "Configured micro-batch wait, per model",
+           [({"model": name}, stats["max_wait_ms"] / 1000) for name, stats in batching.items()])
+
+    if LANGCHAIN_AVAILABLE:
+        pool = get_agent_pool_stats()
+        if pool:
+            yield ("simfluence_gemini_agents_in_use", "gauge", "Gemini agents checked out of the pool",
+                   [({}, pool["in_use"])])
+            yield ("simfluence_gemini_agents", "gauge", "Gemini agent pool size", [({}, pool["size"])])
+        yield ("simfluence_sessions", "gauge", "Conversation sessions held in memory",
+               [({}, session_store.stats()["sessions"])])
+
+
+metrics.register_collector(collect_service_metrics)
+
+
+def should_profile() -> bool:
+    """Profile when the request asks for it via the header, or when sampled"""
+    header = request.headers.get(PROFILE_HEADER)
+    if header is not None:
+        if PROFILE_TOKEN:
+            return header == PROFILE_TOKEN
+        return header.lower() in ("1", "true", "yes")
+    return PROFILE_SAMPLE_PERCENT > 0 and random.random() * 100 < PROFILE_SAMPLE_PERCENT
+
+
+def install_request_profiling():
+    """
+    Profile selected requests and write one speedscope or collapsed-stack
+    file per request to PROFILE_DIR. Only installed when PROFILING_ENABLED is
+    set, so unprofiled deployments do not even run the hooks.
+    """
+    if PROFILE_FORMAT not in PROFILE_FORMATS:
+        raise ValueError(f"Unknown PROFILE_FORMAT '{PROFILE_FORMAT}' (expected one of {', '.join(PROFILE_FORMATS)})")
+    create_profiler(PROFILER)  # fail at startup on an unknown PROFILER
+
+    @app.before_request
+    def start_request_profile():
+        if should_profile():
+            g.profiler = create_profiler(PROFILER)
+            g.profiler.start()
+
+    @app.after_request
+    def finish_request_profile(response):
+        profiler = g.pop('profiler', None)
+        if profiler is None:
+            return response
+        filename = profile_filename(request.method, request.path, PROFILE_FORMAT)
+        name = f"{request.method} {request.path}"
+        response.headers["X-Profile-File"] = filename
+
+        # Stop once the body is sent so streamed responses are profiled in full
+        def finish():
+            try:
+                write_profile(profiler.stop(), os.path.join(PROFILE_DIR, filename), name, PROFILE_FORMAT)
+                logger.info(f"Profile for {name} written to {filename}")
+            except Exception as e:
+                logger.warning(f"Could not write profile for {name}: {str(e)}")
+
+        response.call_on_close(finish)
+        return response
+
+    @app.teardown_request
+    def abandon_request_profile(error=None):
+        # Only left set when an exception escaped before after_request ran
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.stop()
+
+    logger.info(f"Request profiling enabled ({PROFILER}, {PROFILE_FORMAT}, "
+                f"{PROFILE_SAMPLE_PERCENT}% sampled, header {PROFILE_HEADER}) -> {PROFILE_DIR}")
+
+
+if PROFILING_ENABLED:
+    install_request_profiling()
+
+
+def preload_all_models():
+    """
+    Load every model the API serves so requests only pay for inference.
+    Under gunicorn (preload_app) this runs once in the master, so the loaded
+    objects are shared copy-on-write by the forked workers.
+    """
+    timings = {}
+
+    start = time.perf_counter()
+    preload_errors = preload_models()
+    timings["engagement_models"] = time.perf_counter() - start
+    if preload_errors:
+        logger.warning(f"Some engagement models failed to preload: {preload_errors}")
+
+    start = time.perf_counter()
+    if load_time_prediction_model() is None:
+        logger.warning("Time prediction engine could not be preloaded")
+    timings["time_engine"] = time.perf_counter() - start
+
+    # Build every installed sentiment engine; first use loads the TextBlob lexicon
+    start = time.perf_counter()
+    for engine in sentiment_engines.names():
+        if sentiment_engines.is_available(engine):
+            sentiment_engines.get(engine).analyze("Warm up the sentiment lexicons")
+    timings["sentiment_engines"] = time.perf_counter() - start
+
+    logger.info("Models preloaded: " + ", ".join(
+        f"{name} {seconds * 1000:.0f}ms" for name, seconds in timings.items()))
+    return timings
+
+
+preload_all_models()
+
+
+def init_gemini_pool():
+    """
+    Build the Gemini agent pool up front so requests never pay for client setup.
+    Called per worker (gunicorn post_worker_init) rather than at import: the
+    gRPC client must be created after the fork.
+    """
+    if not LANGCHAIN_AVAILABLE or not os.getenv('GOOGLE_API_KEY'):
+        return None
+    try:
+        start = time.perf_counter()
+        pool = get_agent_pool()
+        logger.info(f"Gemini agent pool ready: {pool.size} agents in "
+                    f"{(time.perf_counter() - start) * 1000:.0f}ms")
+        return pool
+    except Exception as e:
+        logger.warning(f"Gemini agent pool could not be created: {str(e)}")
+        return None
 
 
 @app.route('/', methods=['GET'])
@@ -56,15 +280,23 @@ def root():
         "description": "AI-powered content optimization and analysis API",
         "endpoints": {
             "health": "/health",
+            "metrics": "/metrics",
             "ai": {
                 "gemini_optimize": "/ai/gemini/optimize",
                 "gemini_caption": "/ai/gemini/caption",
                 "comprehensive": "/ai/comprehensive",
+                "gemini_caption_stream": "/ai/gemini/caption/stream",
+                "comprehensive_stream": "/ai/comprehensive/stream",
                 "models_status": "/ai/models/status"
             }
         }
     })
 
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus metrics for this process"""
+    return Response(metrics.render(), content_type=METRICS_CONTENT_TYPE)
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -91,7 +323,9 @@ def gemini_optimize_content():
             "followers": 1200,
             "account_age_days": 700
         },
-        "optimization_goals": ["engagement", "authenticity", "discussion"]
+        "optimization_goals": ["engagement", "authenticity", "discussion"],
+        "mode": "direct", // optional: "agent" (ReAct tool calls) or "direct" (one LLM call)
+        "session_id": "abc123" // optional: keep conversation context across calls
     }
     """
     if not LANGCHAIN_AVAILABLE:
@@ -110,6 +344,12 @@ def gemini_optimize_content():
         content = data['content']
         user_profile = data.get('user_profile', {})
         optimization_goals = data.get('optimization_goals', ['engagement'])
+        mode = data.get('mode')
+        if mode is not None and mode not in ANALYSIS_MODES:
+            return jsonify({"error": f"Mode must be one of {list(ANALYSIS_MODES)}"}), 400
+        session_id = data.get('session_id')
+        if session_id is not None and not isinstance(session_id, str):
+            return jsonify({"error": "session_id must be a string"}), 400
 
         # Initialize Gemini optimizer
         google_api_key = os.getenv('GOOGLE_API_KEY')
@@ -119,14 +359,15 @@ def gemini_optimize_content():
                 "status": "error"
             }), 500
 
-        optimizer = GeminiXGBoostOptimizer(google_api_key)
-
         # Perform optimization
-        result = optimizer.quick_optimize(
-            content=content,
-            user_karma=user_profile.get('karma', 1000),
-            user_followers=user_profile.get('followers', 100)
-        )
+        with get_agent_pool().acquire() as optimizer:
+            result = optimizer.quick_optimize(
+                content=content,
+                user_karma=user_profile.get('karma', 1000),
+                user_followers=user_profile.get('followers', 100),
+                mode=mode,
+                session_id=session_id
+            )
 
         logger.info(
             f"Gemini optimization completed for content: {content[:50]}...")
@@ -186,13 +427,12 @@ def gemini_generate_caption():
                 "status": "error"
             }), 500
 
-        optimizer = GeminiXGBoostOptimizer(google_api_key)
-
         # Generate caption with context
-        result = optimizer.smart_caption_generation(
-            prompt=prompt,
-            engagement_target=engagement_target
-        )
+        with get_agent_pool().acquire() as optimizer:
+            result = optimizer.smart_caption_generation(
+                prompt=prompt,
+                engagement_target=engagement_target
+            )
 
         logger.info(f"Gemini caption generated for: {prompt[:50]}...")
 
@@ -224,7 +464,9 @@ def comprehensive_ai_analysis():
             "followers": 1200,
             "account_age_days": 700
         },
-        "analysis_depth": "full" // or "quick"
+        "analysis_depth": "full", // or "quick"
+        "mode": "direct", // optional: "agent" (ReAct tool calls) or "direct" (one LLM call)
+        "session_id": "abc123" // optional: keep conversation context across calls
     }
     """
     if not LANGCHAIN_AVAILABLE:
@@ -242,6 +484,12 @@ def comprehensive_ai_analysis():
         content = data['content']
         user_data = data.get('user_data', {})
         analysis_depth = data.get('analysis_depth', 'full')
+        mode = data.get('mode')
+        if mode is not None and mode not in ANALYSIS_MODES:
+            return jsonify({"error": f"Mode must be one of {list(ANALYSIS_MODES)}"}), 400
+        session_id = data.get('session_id')
+        if session_id is not None and not isinstance(session_id, str):
+            return jsonify({"error": "session_id must be a string"}), 400
 
         # Initialize LangChain agent
         google_api_key = os.getenv('GOOGLE_API_KEY')
@@ -251,15 +499,15 @@ def comprehensive_ai_analysis():
                 "status": "error"
             }), 500
 
-        agent = SimFluenceLangChainAgent(google_api_key)
-
-        if analysis_depth == 'quick':
-            # Quick optimization
-            optimizer = GeminiXGBoostOptimizer(google_api_key)
-            result = optimizer.predict_and_optimize(content, user_data)
-        else:
-            # Full comprehensive analysis
-            result = agent.comprehensive_analysis(content, user_data)
+        with get_agent_pool().acquire() as optimizer:
+            if analysis_depth == 'quick':
+                # Quick optimization
+                result = optimizer.predict_and_optimize(
+                    content, user_data, mode=mode, session_id=session_id)
+            else:
+                # Full comprehensive analysis
+                result = optimizer.agent.comprehensive_analysis(
+                    content, user_data, mode=mode, session_id=session_id)
 
         logger.info(
             f"Comprehensive AI analysis completed for: {content[:50]}...")
@@ -279,19 +527,127 @@ def comprehensive_ai_analysis():
         }), 500
 
 
+def stream_events(label, make_events):
+    """
+    Server-sent-events response for a streaming agent call
+
+    make_events receives a pooled optimizer and returns its (event, data)
+    generator, which is closed when the stream ends. The time to the first
+    event is logged with the total.
+    """
+    def generate():
+        start = time.perf_counter()
+        first_event_ms = None
+        try:
+            # Closing the events first stops the optimizer's work (e.g. when the client
+            # disconnects mid-stream) before it goes back to the pool
+            with get_agent_pool().acquire() as optimizer, closing(make_events(optimizer)) as events:
+                for event, data in events:
+                    if first_event_ms is None:
+                        first_event_ms = (time.perf_counter() - start) * 1000
+                    yield format_sse(event, data)
+        except Exception as e:
+            logger.error(f"{label} stream error: {str(e)}")
+            yield format_sse("error", {"error": f"{label} failed: {str(e)}", "status": "error"})
+            return
+        logger.info(f"{label} streamed: first event {first_event_ms or 0:.0f}ms, "
+                    f"total {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"  # keep reverse proxies from buffering the stream
+    })
+
+
+@app.route('/ai/gemini/caption/stream', methods=['POST'])
+def gemini_generate_caption_stream():
+    """
+    Streaming caption generation (server-sent events)
+
+    Same input as /ai/gemini/caption. Emits "token" events with Gemini
+    output as it is generated, then a "summary" event with the caption result.
+    """
+    if not LANGCHAIN_AVAILABLE:
+        return jsonify({
+            "error": "LangChain integration not available",
+            "status": "error"
+        }), 503
+
+    data = request.get_json()
+    if not data or 'prompt' not in data:
+        return jsonify({"error": "Prompt is required"}), 400
+    if not os.getenv('GOOGLE_API_KEY'):
+        return jsonify({
+            "error": "Google API key not configured",
+            "status": "error"
+        }), 500
+
+    prompt = data['prompt']
+    engagement_target = data.get('engagement_target', 'medium')
+
+    return stream_events("Gemini caption generation", lambda optimizer: optimizer.smart_caption_stream(
+        prompt=prompt,
+        engagement_target=engagement_target
+    ))
+
+
+@app.route('/ai/comprehensive/stream', methods=['POST'])
+def comprehensive_ai_analysis_stream():
+    """
+    Streaming comprehensive analysis (server-sent events)
+
+    Same input as /ai/comprehensive. Emits "step"/"observation" events for
+    tool calls, "token" events with Gemini output, then a "summary" event
+    with the analysis result and its timings (including first_token).
+    """
+    if not LANGCHAIN_AVAILABLE:
+        return jsonify({
+            "error": "LangChain integration not available",
+            "status": "error"
+        }), 503
+
+    data = request.get_json()
+    if not data or 'content' not in data:
+        return jsonify({"error": "Content is required"}), 400
+    mode = data.get('mode')
+    if mode is not None and mode not in ANALYSIS_MODES:
+        return jsonify({"error": f"Mode must be one of {list(ANALYSIS_MODES)}"}), 400
+    session_id = data.get('session_id')
+    if session_id is not None and not isinstance(session_id, str):
+        return jsonify({"error": "session_id must be a string"}), 400
+    if not os.getenv('GOOGLE_API_KEY'):
+        return jsonify({
+            "error": "Google API key not configured",
+            "status": "error"
+        }), 500
+
+    content = data['content']
+    user_data = data.get('user_data', {})
+
+    return stream_events("Comprehensive analysis", lambda optimizer: optimizer.agent.stream_comprehensive_analysis(
+        content, user_data, mode=mode, session_id=session_id))
+
+
 @app.route('/ai/models/status', methods=['GET'])
 def ai_models_status():
     """Get status of all AI models and integrations"""
     try:
+        llm_cache = get_llm_cache() if LANGCHAIN_AVAILABLE else None
         status = {
             "xgboost_model": {
                 "available": True,
                 "model_path": "models/likes_predictor.pkl",
-                "status": "ready"
+                "status": "ready",
+                "registry": get_model_stats(),
+                "micro_batching": get_batching_stats()
             },
+            "sentiment_engines": dict(sentiment_engines.stats(), status="ready"),
             "langchain_integration": {
                 "available": LANGCHAIN_AVAILABLE,
-                "status": "ready" if LANGCHAIN_AVAILABLE else "unavailable"
+                "status": "ready" if LANGCHAIN_AVAILABLE else "unavailable",
+                "agent_pool": get_agent_pool_stats() if LANGCHAIN_AVAILABLE else None,
+                "response_cache": llm_cache.stats() if llm_cache else None,
+                "session_memory": session_store.stats() if LANGCHAIN_AVAILABLE else None
             },
             "gemini_api": {
                 "configured": bool(os.getenv('GOOGLE_API_KEY')),
@@ -316,4 +672,6 @@ def ai_models_status():
 
 
 if __name__ == '__main__':
+    init_gemini_pool()
+    warm_sentiment_pool()
     app.run(debug=True, host='0.0.0.0', port=5001)
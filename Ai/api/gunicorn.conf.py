@@ -0,0 +1,105 @@
+"""
+Gunicorn configuration for production serving
+
+Run from the Ai/ directory:
+    gunicorn -c api/gunicorn.conf.py
+
+The app (and every model it serves) is imported once in the master via
+preload_app. gc.freeze() then moves those objects out of the garbage
+collector's reach before workers are forked, so the collector does not
+write to their pages and they stay shared copy-on-write between workers.
+"""
+
+import gc
+import os
+import multiprocessing
+import tempfile
+
+# Import the app from api/ (app.py adds src/ itself); model paths are relative to Ai/
+pythonpath = os.path.dirname(os.path.abspath(__file__))
+wsgi_app = "app:app"
+
+bind = f"{os.getenv('API_HOST', '0.0.0.0')}:{os.getenv('API_PORT', '5001')}"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+# Each worker gets its own sentiment batch pool: split the CPUs between them rather than
+# starting cpu_count processes per worker (read when the app is preloaded below)
+os.environ.setdefault("SENTIMENT_WORKERS", str(max(1, multiprocessing.cpu_count() // workers)))
+# Workers write their metrics here and /metrics merges them, so a scrape covers every worker
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR",
+                      os.path.join(tempfile.gettempdir(), f"simfluence-metrics-{bind.rsplit(':', 1)[-1]}"))
+# Agent conversation history must be visible to whichever worker serves a session's next turn
+if workers > 1:
+    os.environ.setdefault("SESSION_MEMORY_BACKEND", "disk")
+# LLM endpoints block on network I/O, so each worker also serves requests on threads
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 120))
+
+# Load models in the master and share them with the workers
+preload_app = True
+
+
+def memory_snapshot(pid="self"):
+    """RSS, shared and private memory (bytes) of a process, from /proc"""
+    snapshot = {"rss": 0, "shared": 0, "private": 0}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if not value.strip().endswith("kB"):
+                    continue
+                size = int(value.split()[0]) * 1024
+                if key == "Rss":
+                    snapshot["rss"] = size
+                elif key.startswith("Shared_"):
+                    snapshot["shared"] += size
+                elif key.startswith("Private_"):
+                    snapshot["private"] += size
+    except (OSError, ValueError):
+        # Not Linux: only the peak RSS is available
+        import resource
+        snapshot["rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return snapshot
+
+
+def _format_mb(snapshot):
+    return ", ".join(f"{key} {value / 1024 / 1024:.1f}MB" for key, value in snapshot.items())
+
+
+def on_starting(server):
+    # Counters from a previous run must not be added to this one
+    from metrics import prepare_multiprocess_dir
+    prepare_multiprocess_dir()
+
+
+def when_ready(server):
+    # Collect garbage once, then freeze everything the preload created
+    gc.collect()
+    gc.freeze()
+    if workers > 1 and os.environ.get("SESSION_MEMORY_BACKEND") == "memory":
+        server.log.warning(f"SESSION_MEMORY_BACKEND=memory with {workers} workers: turns of one "
+                           "session_id are split between workers; use the disk backend")
+    server.log.info(f"Master ready, {gc.get_freeze_count()} objects frozen ({_format_mb(memory_snapshot())})")
+
+
+def pre_fork(server, worker):
+    # Objects created in the master since the last fork are frozen as well
+    gc.freeze()
+
+
+def post_worker_init(worker):
+    # gRPC clients and process pools do not survive a fork, so each worker builds its own
+    # (the sentiment pool only when SENTIMENT_POOL_WARM is set; otherwise on first use)
+    from app import init_gemini_pool
+    from sentiment_analyzer import warm_sentiment_pool
+    from metrics import metrics
+    init_gemini_pool()
+    warm_sentiment_pool()
+    metrics.start_flusher()
+    worker.log.info(f"Worker {worker.pid} started ({_format_mb(memory_snapshot())})")
+
+
+def child_exit(server, worker):
+    # Keep the exited worker's counters in the totals; drop its gauges
+    from metrics import mark_process_dead
+    mark_process_dead(worker.pid)
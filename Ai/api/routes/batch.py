@@ -0,0 +1,58 @@
+import os
+from flask import Blueprint, request, jsonify
+from predict import predict_batch, predict_engagement_category
+from logger import logger
+
+batch_bp = Blueprint('batch', __name__)
+
+MAX_BATCH_SIZE = int(os.getenv('MAX_BATCH_SIZE', 5000))
+
+@batch_bp.route('/predict/batch', methods=['POST'])
+def predict_batch_endpoint():
+    """
+    Predict likes, comments and shares for many posts in one call
+
+    Expected input:
+    {
+        "posts": [
+            {"length": 120, "containsImage": 1, "userKarma": 4500, ...},
+            ...
+        ]
+    }
+    """
+    try:
+        data = request.get_json()
+        if not data or 'posts' not in data:
+            return jsonify({"error": "Posts are required"}), 400
+        posts = data['posts']
+        if not isinstance(posts, list) or not posts:
+            return jsonify({"error": "Posts must be a non-empty list"}), 400
+        if len(posts) > MAX_BATCH_SIZE:
+            return jsonify({"error": f"Batch too large. Maximum is {MAX_BATCH_SIZE} posts"}), 400
+        if not all(isinstance(post, dict) for post in posts):
+            return jsonify({"error": "Each post must be an object"}), 400
+
+        # Raw posts are encoded straight into one feature matrix
+        raw_predictions = predict_batch(posts, raw=True)
+
+        predictions = []
+        for raw in raw_predictions:
+            predicted_likes = max(0, int(raw['likes']))
+            predicted_comments = max(0, int(raw['comments']))
+            predicted_shares = max(0, int(raw['shares']))
+            predictions.append({
+                "predicted_likes": predicted_likes,
+                "predicted_comments": predicted_comments,
+                "predicted_shares": predicted_shares,
+                "engagement_score": int((predicted_likes + predicted_comments * 2) / 10),
+                "engagement_category": predict_engagement_category(raw['likes'])
+            })
+        logger.info(f"Batch prediction successful for {len(predictions)} posts")
+        return jsonify({
+            "predictions": predictions,
+            "count": len(predictions),
+            "status": "success"
+        })
+    except Exception as e:
+        logger.error(f"Batch prediction error: {str(e)}")
+        return jsonify({"error": f"Batch prediction failed: {str(e)}"}), 500
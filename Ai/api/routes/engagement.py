@@ -1,7 +1,6 @@
 from flask import Blueprint, request, jsonify
-from predict import predict_likes, predict_engagement_category
+from predict import predict_all, predict_engagement_category
 from logger import logger
-from utils import transform_input_features
 
 engagement_bp = Blueprint('engagement', __name__)
 
@@ -11,17 +10,18 @@ def predict_engagement():
         data = request.get_json()
         if not data:
             return jsonify({"error": "No data provided"}), 400
-        transformed_input = transform_input_features(data)
-        predicted_likes = predict_likes(transformed_input)
-        # Convert to integer
-        predicted_likes = max(0, int(float(predicted_likes)))
-        predicted_comments = max(0, int(predicted_likes * 0.1 + (predicted_likes * 0.02)))
-        engagement_category = predict_engagement_category(float(predicted_likes))  # Pass as float for category calculation
+        # Likes, comments and shares from one feature build and predict pass
+        prediction = predict_all(data, raw=True)
+        predicted_likes = max(0, int(prediction["likes"]))
+        predicted_comments = max(0, int(prediction["comments"]))
+        predicted_shares = max(0, int(prediction["shares"]))
+        engagement_category = predict_engagement_category(prediction["likes"])
         engagement_score = int((predicted_likes + predicted_comments * 2) / 10)
         logger.info(f"Prediction successful: {predicted_likes} likes, {predicted_comments} comments")
         return jsonify({
             "predicted_likes": predicted_likes,
             "predicted_comments": predicted_comments,
+            "predicted_shares": predicted_shares,
             "engagement_score": engagement_score,
             "engagement_category": engagement_category,
             "status": "success"
@@ -1,8 +1,11 @@
+import time
 from flask import Blueprint, request, jsonify
 from caption_generator import generate_caption
-from sentiment_analyzer import analyze_sentiment
+from sentiment_analyzer import analyze_text
+from predict import predict_all
+from concurrency import run_stages
 from logger import logger
-from utils import transform_input_features, generate_optimization_recommendations
+from utils import generate_optimization_recommendations
 
 optimize_bp = Blueprint('optimize', __name__)
 
@@ -16,45 +19,55 @@ def optimize_post():
         user_data = data.get('user_data', {})
         post_settings = data.get('post_settings', {})
         goals = data.get('optimization_goals', ['engagement'])
-        results = {}
+        parallel = data.get('parallel', True)
+        # Caption, sentiment and engagement are independent, so they run concurrently
+        stages = {}
         if 'caption' in goals and content:
-            caption_result = generate_caption(
+            stages['optimized_caption'] = lambda: generate_caption(
                 prompt=content,
                 platform='reddit',
                 tone='engaging'
             )
-            results['optimized_caption'] = caption_result
         if 'sentiment' in goals and content:
-            sentiment_result = analyze_sentiment(content)
-            results['sentiment_analysis'] = sentiment_result
+            stages['sentiment_analysis'] = lambda: analyze_text(content)
         if 'engagement' in goals:
-            engagement_input = {
-                "length": len(content),
-                "containsImage": 1 if post_settings.get('containsImage') else 0,
-                "userFollowers": user_data.get('userFollowers', 0),
-                "userKarma": user_data.get('userKarma', 0),
-                "accountAgeDays": user_data.get('accountAgeDays', 365),
-                "avgEngagementRate": user_data.get('avgEngagementRate', 0.05),
-                "avgLikes": user_data.get('avgLikes', 10),
-                "avgComments": user_data.get('avgComments', 2),
-                "dayOfWeek": post_settings.get('dayOfWeek', 'Friday'),
-                "postTimeOfDay": post_settings.get('postTimeOfDay', 'Evening'),
-                "topCommentSentiment": "Positive"
-            }
-            transformed_input = transform_input_features(engagement_input)
-            from predict import predict_likes
-            predicted_likes = predict_likes(transformed_input)
-            predicted_comments = max(0, int(predicted_likes * 0.1))
-            results['engagement_prediction'] = {
-                "predicted_likes": round(predicted_likes, 1),
-                "predicted_comments": predicted_comments,
-                "engagement_score": round((predicted_likes + predicted_comments * 2) / 10, 2)
-            }
+            stages['engagement_prediction'] = lambda: predict_post_engagement(
+                content, user_data, post_settings)
+        start = time.perf_counter()
+        results, timings = run_stages(stages, parallel=parallel)
+        timings['total'] = round((time.perf_counter() - start) * 1000, 2)
         results['recommendations'] = generate_optimization_recommendations(results)
         return jsonify({
             "results": results,
+            "timings_ms": timings,
+            "execution": "parallel" if parallel else "sequential",
             "status": "success"
         })
     except Exception as e:
         logger.error(f"Post optimization error: {str(e)}")
-        return jsonify({"error": f"Post optimization failed: {str(e)}"}), 500 
\ No newline at end of file
+        return jsonify({"error": f"Post optimization failed: {str(e)}"}), 500
+
+def predict_post_engagement(content, user_data, post_settings):
+    engagement_input = {
+        "length": len(content),
+        "containsImage": 1 if post_settings.get('containsImage') else 0,
+        "userFollowers": user_data.get('userFollowers', 0),
+        "userKarma": user_data.get('userKarma', 0),
+        "accountAgeDays": user_data.get('accountAgeDays', 365),
+        "avgEngagementRate": user_data.get('avgEngagementRate', 0.05),
+        "avgLikes": user_data.get('avgLikes', 10),
+        "avgComments": user_data.get('avgComments', 2),
+        "dayOfWeek": post_settings.get('dayOfWeek', 'Friday'),
+        "postTimeOfDay": post_settings.get('postTimeOfDay', 'Evening'),
+        "topCommentSentiment": "Positive"
+    }
+    # Raw inputs go straight to the encoder; one pass covers likes, comments and shares
+    prediction = predict_all(engagement_input, raw=True)
+    predicted_likes = prediction["likes"]
+    predicted_comments = max(0, int(prediction["comments"]))
+    return {
+        "predicted_likes": round(predicted_likes, 1),
+        "predicted_comments": predicted_comments,
+        "predicted_shares": max(0, int(prediction["shares"])),
+        "engagement_score": round((predicted_likes + predicted_comments * 2) / 10, 2)
+    }
@@ -1,22 +1,83 @@
+import os
 from flask import Blueprint, request, jsonify
-from sentiment_analyzer import analyze_sentiment
+from sentiment_analyzer import analyze_text, analyze_sentiment_batch, sentiment_engines, SENTIMENT_ENGINE
 from logger import logger
 
 sentiment_bp = Blueprint('sentiment', __name__)
 
+MAX_SENTIMENT_BATCH_SIZE = int(os.getenv('MAX_SENTIMENT_BATCH_SIZE', 10000))
+
+def validate_engine(engine):
+    """Error message for an unknown or unavailable engine, else None"""
+    if engine not in sentiment_engines.names():
+        return f"Unknown engine '{engine}'. Choose from {sentiment_engines.names()}"
+    if not sentiment_engines.is_available(engine):
+        return f"Sentiment engine '{engine}' is not installed"
+    return None
+
 @sentiment_bp.route('/analyze/sentiment', methods=['POST'])
 def analyze_text_sentiment():
     try:
         data = request.get_json()
         if not data or 'text' not in data:
             return jsonify({"error": "Text is required"}), 400
-        sentiment_result = analyze_sentiment(data['text'])
+        engine = data.get('engine', SENTIMENT_ENGINE)
+        engine_error = validate_engine(engine)
+        if engine_error:
+            return jsonify({"error": engine_error}), 400
+        sentiment_result = analyze_text(data['text'], engine)
         return jsonify({
             "sentiment": sentiment_result['sentiment'],
             "confidence": sentiment_result['confidence'],
             "scores": sentiment_result['scores'],
+            "engine": engine,
             "status": "success"
         })
     except Exception as e:
         logger.error(f"Sentiment analysis error: {str(e)}")
-        return jsonify({"error": f"Sentiment analysis failed: {str(e)}"}), 500 
\ No newline at end of file
+        return jsonify({"error": f"Sentiment analysis failed: {str(e)}"}), 500 
+
+@sentiment_bp.route('/analyze/sentiment/batch', methods=['POST'])
+def analyze_text_sentiment_batch():
+    """
+    Analyze the sentiment of many texts (e.g. all comments on a post)
+
+    Expected input:
+    {
+        "texts": ["Love this!", "Not for me", ...],
+        "engine": "vader" // optional: textblob (default), vader or keyword
+    }
+    """
+    try:
+        data = request.get_json()
+        if not data or 'texts' not in data:
+            return jsonify({"error": "Texts are required"}), 400
+        texts = data['texts']
+        if not isinstance(texts, list) or not texts:
+            return jsonify({"error": "Texts must be a non-empty list"}), 400
+        if len(texts) > MAX_SENTIMENT_BATCH_SIZE:
+            return jsonify({"error": f"Batch too large. Maximum is {MAX_SENTIMENT_BATCH_SIZE} texts"}), 400
+        if not all(isinstance(text, str) for text in texts):
+            return jsonify({"error": "Each text must be a string"}), 400
+        engine = data.get('engine', SENTIMENT_ENGINE)
+        engine_error = validate_engine(engine)
+        if engine_error:
+            return jsonify({"error": engine_error}), 400
+
+        batch = analyze_sentiment_batch(texts, engine=engine)
+        results = [{
+            "sentiment": result['sentiment'],
+            "confidence": result['confidence'],
+            "scores": result['scores']
+        } for result in batch['results']]
+        logger.info(f"Batch sentiment analysis successful for {len(results)} texts")
+        return jsonify({
+            "results": results,
+            "distribution": batch['distribution'],
+            "count": len(results),
+            "engine": engine,
+            "status": "success"
+        })
+    except Exception as e:
+        logger.error(f"Batch sentiment analysis error: {str(e)}")
+        return jsonify({"error": f"Batch sentiment analysis failed: {str(e)}"}), 500
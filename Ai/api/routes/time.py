@@ -5,7 +5,7 @@ import os
 # Add the src directory to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
-from time_predict import predict_optimal_time, format_time_prediction
+from time_predict import predict_optimal_time, predict_hourly_curve, format_time_prediction, get_time_slot_name
 
 time_bp = Blueprint('time', __name__)
 
@@ -76,7 +76,7 @@ def predict_time_engagement():
     {
         "subreddit": "funny",
         "content_type": "image",
-        "hours": [9, 12, 15, 18, 21]
+        "hours": [9, 12, 15, 18, 21]  // or "all" for the full 24-hour curve
     }
     """
     try:
@@ -92,16 +92,25 @@ def predict_time_engagement():
         content_type = data.get('content_type', 'text')
         hours = data.get('hours', [9, 12, 15, 18, 21])
         
-        # Get predictions for multiple hours
-        predictions = []
-        for hour in hours:
-            user_data = {'hour': hour}
-            prediction = predict_optimal_time(subreddit, content_type, user_data)
-            predictions.append({
-                "hour": hour,
-                "time_slot": prediction.get('optimal_time_slot', 'Unknown'),
-                "confidence": prediction.get('confidence', 0.5)
-            })
+        if hours == 'all':
+            hours = list(range(24))
+        if not isinstance(hours, list) or not all(isinstance(h, int) and 0 <= h < 24 for h in hours):
+            return jsonify({
+                "error": "hours must be a list of integers between 0 and 23, or \"all\"",
+                "status": "error"
+            }), 400
+        
+        # Score every requested hour in one batched pass
+        curve = predict_hourly_curve(subreddit, content_type, hours, data.get('user_data'))
+        predictions = [
+            {
+                "hour": point['hour'],
+                "time_slot": get_time_slot_name(point['hour']),
+                "optimal_hour": point['optimal_hour'],
+                "confidence": point['confidence']
+            }
+            for point in curve['hourly_predictions']
+        ]
         
         return jsonify({
             "subreddit": subreddit,
@@ -1,31 +1,20 @@
+import json
+from feature_encoder import NUMERIC_FEATURES, CONSTANT_FEATURES, CATEGORICAL_FEATURES
+from metrics import FEATURE_TRANSFORM_SECONDS
+
 def transform_input_features(data):
     """Transform user-friendly input to model-ready features"""
-    transformed = {
-        "length": data.get("length", 0),
-        "containsImage": data.get("containsImage", 0),
-        "userFollowers": data.get("userFollowers", 0),
-        "userKarma": data.get("userKarma", 0),
-        "accountAgeDays": data.get("accountAgeDays", 365),
-        "avgEngagementRate": data.get("avgEngagementRate", 0.05),
-        "avgLikes": data.get("avgLikes", 10),
-        "avgComments": data.get("avgComments", 2),
-        "shouldImprove": 0,
-    }
-    # One-hot encode day of week
-    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-    day = data.get("dayOfWeek", "Friday")
-    for d in days[:-1]:  # Drop Sunday as reference
-        transformed[f"dayOfWeek_{d}"] = 1 if day == d else 0
-    # One-hot encode time of day
-    times = ["Morning", "Afternoon", "Evening", "Night"]
-    time = data.get("postTimeOfDay", "Evening")
-    for t in times[:-1]:  # Drop Night as reference
-        transformed[f"postTimeOfDay_{t}"] = 1 if time == t else 0
-    # One-hot encode sentiment
-    sentiments = ["Negative", "Neutral", "Positive"]
-    sentiment = data.get("topCommentSentiment", "Positive")
-    for s in sentiments[1:]:  # Drop Negative as reference
-        transformed[f"topCommentSentiment_{s}"] = 1 if sentiment == s else 0
+    with FEATURE_TRANSFORM_SECONDS.time(step="transform_input_features"):
+        return _transform_input_features(data)
+
+def _transform_input_features(data):
+    transformed = {name: data.get(name, default) for name, default in NUMERIC_FEATURES.items()}
+    transformed.update(CONSTANT_FEATURES)
+    # One-hot encode day of week, time of day and sentiment (Sunday/Night/Negative columns stay 0)
+    for field, (default, categories) in CATEGORICAL_FEATURES.items():
+        value = data.get(field, default)
+        for category in categories:
+            transformed[f"{field}_{category}"] = 1 if value == category else 0
     return transformed
 
 def generate_optimization_recommendations(results):
@@ -53,4 +42,8 @@ def generate_optimization_recommendations(results):
     if 'optimized_caption' in results:
         recommendations.append(
             "Use the AI-generated caption for better performance")
-    return recommendations 
\ No newline at end of file
+    return recommendations 
+
+def format_sse(event, data):
+    """Encode one server-sent event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
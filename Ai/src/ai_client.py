@@ -1,19 +1,193 @@
 import requests
 import json
-from typing import Dict, List, Optional
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional
 import os
+import time
+
+AI_CLIENT_BATCH_WINDOW_MS = float(os.getenv("AI_CLIENT_BATCH_WINDOW_MS", 10))
+AI_CLIENT_MAX_BATCH_SIZE = int(os.getenv("AI_CLIENT_MAX_BATCH_SIZE", 64))
+
+
+def engagement_payload(user_data: Dict, post_data: Dict, content: str = "") -> Dict:
+    """Flatten user statistics and post settings into a /predict/engagement request"""
+    return {
+        "length": len(content) if content else post_data.get("length", 0),
+        "containsImage": 1 if post_data.get("containsImage", False) else 0,
+        "userFollowers": user_data.get("userFollowers", 0),
+        "userKarma": user_data.get("userKarma", 0),
+        "accountAgeDays": user_data.get("accountAgeDays", 365),
+        "avgEngagementRate": user_data.get("avgEngagementRate", 0.05),
+        "avgLikes": user_data.get("avgLikes", 10),
+        "avgComments": user_data.get("avgComments", 2),
+        "dayOfWeek": post_data.get("dayOfWeek", "Friday"),
+        "postTimeOfDay": post_data.get("postTimeOfDay", "Evening"),
+        "topCommentSentiment": post_data.get("topCommentSentiment", "Positive")
+    }
+
+
+def quick_engagement_inputs(user_karma: int, user_followers: int, has_image: bool = False):
+    """(user_data, post_data) for a prediction from minimal input"""
+
+    user_data = {
+        "userKarma": user_karma,
+        "userFollowers": user_followers,
+        "avgEngagementRate": 0.05,
+        "avgLikes": max(10, user_karma // 100),
+        "avgComments": max(2, user_karma // 500)
+    }
+
+    post_data = {
+        "containsImage": has_image,
+        "dayOfWeek": "Friday",
+        "postTimeOfDay": "Evening"
+    }
+
+    return user_data, post_data
+
+
+def split_batch_predictions(response: Dict, count: int) -> List[Dict]:
+    """Per-post results from a /predict/batch response, shaped like /predict/engagement"""
+    predictions = response.get("predictions")
+    if not isinstance(predictions, list) or len(predictions) != count:
+        raise ValueError(f"expected {count} predictions in batch response")
+    return [{**prediction, "status": "success"} for prediction in predictions]
+
+
+def batch_error(error: Exception) -> Dict:
+    return {"error": f"Prediction failed: {str(error)}", "status": "error"}
+
+
+class EngagementBatcher:
+    """
+    Coalesces single predict_engagement calls into /predict/batch requests
+
+    Calls are queued and a background thread sends them together once
+    max_batch_size are waiting or window_ms has passed since the first one.
+    Each caller gets a Future resolved with its own result. Calls queued
+    while a batch is in flight form the next batch.
+
+    If a batch request fails, its posts are sent again one at a time, so a
+    malformed post only fails its own call. retry_each decides which errors
+    are worth that (not, say, an unreachable server).
+    """
+
+    def __init__(self,
+                 send_batch: Callable[[List[Dict]], List[Dict]],
+                 window_ms: float = AI_CLIENT_BATCH_WINDOW_MS,
+                 max_batch_size: int = AI_CLIENT_MAX_BATCH_SIZE,
+                 retry_each: Callable[[Exception], bool] = lambda error: True):
+        self.send_batch = send_batch
+        self.window = window_ms / 1000
+        self.max_batch_size = max(1, max_batch_size)
+        self.retry_each = retry_each
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+        self.isolated_retries = 0
+
+    def submit(self, payload: Dict) -> Future:
+        future = Future()
+        self._ensure_thread()
+        self._queue.put((payload, future))
+        return future
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name="engagement-batcher",
+                                                    daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.window
+            stopping = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+            if stopping:
+                return
+
+    def _flush(self, batch: List):
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        try:
+            results = self.send_batch([payload for payload, _ in batch])
+        except Exception as e:
+            if len(batch) > 1 and self.retry_each(e):
+                self.isolated_retries += 1
+                results = [self._send_one(payload) for payload, _ in batch]
+            else:
+                results = [batch_error(e)] * len(batch)
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def _send_one(self, payload: Dict) -> Dict:
+        try:
+            return self.send_batch([payload])[0]
+        except Exception as e:
+            return batch_error(e)
+
+    def close(self):
+        """Send whatever is queued and stop the background thread"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                self._queue.put(None)
+                self._thread.join()
+            self._thread = None
+
+    def stats(self) -> Dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "largest_batch": self.largest_batch,
+            "isolated_retries": self.isolated_retries,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
 
 
 class SimFluenceAIClient:
     """
     Client SDK for SimFluence AI API
     Easy integration with backend services
+
+    With auto_batch=True, predict_engagement calls made around the same time
+    (e.g. from several threads) are sent to the API as one batch request.
     """
 
-    def __init__(self, base_url: str = "http://localhost:5001", api_key: Optional[str] = None):
+    def __init__(self, base_url: str = "http://localhost:5001", api_key: Optional[str] = None,
+                 auto_batch: bool = False,
+                 batch_window_ms: float = AI_CLIENT_BATCH_WINDOW_MS,
+                 max_batch_size: int = AI_CLIENT_MAX_BATCH_SIZE):
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
         self.session = requests.Session()
+        self.batcher = EngagementBatcher(
+            self._send_engagement_batch, batch_window_ms, max_batch_size,
+            retry_each=lambda error: not isinstance(error, (requests.ConnectionError, requests.Timeout))
+        ) if auto_batch else None
 
         if api_key:
             self.session.headers.update({"Authorization": f"Bearer {api_key}"})
@@ -48,19 +222,10 @@ class SimFluenceAIClient:
             Dict with predicted likes, comments, and engagement score
         """
 
-        payload = {
-            "length": len(content) if content else post_data.get("length", 0),
-            "containsImage": 1 if post_data.get("containsImage", False) else 0,
-            "userFollowers": user_data.get("userFollowers", 0),
-            "userKarma": user_data.get("userKarma", 0),
-            "accountAgeDays": user_data.get("accountAgeDays", 365),
-            "avgEngagementRate": user_data.get("avgEngagementRate", 0.05),
-            "avgLikes": user_data.get("avgLikes", 10),
-            "avgComments": user_data.get("avgComments", 2),
-            "dayOfWeek": post_data.get("dayOfWeek", "Friday"),
-            "postTimeOfDay": post_data.get("postTimeOfDay", "Evening"),
-            "topCommentSentiment": post_data.get("topCommentSentiment", "Positive")
-        }
+        payload = engagement_payload(user_data, post_data, content)
+
+        if self.batcher is not None:
+            return self.batcher.submit(payload).result()
 
         try:
             response = self.session.post(f"{self.base_url}/predict/engagement",
@@ -70,6 +235,36 @@ class SimFluenceAIClient:
         except requests.RequestException as e:
             return {"error": f"Prediction failed: {str(e)}", "status": "error"}
 
+    def predict_engagement_batch(self, posts: List[Dict]) -> Dict:
+        """
+        Predict likes, comments and shares for many posts in one request
+
+        Args:
+            posts: Request payloads as built by engagement_payload
+
+        Returns:
+            Dict with one prediction per post, in order
+        """
+        try:
+            response = self.session.post(f"{self.base_url}/predict/batch",
+                                         json={"posts": posts})
+            response.raise_for_status()
+            return response.json()
+        except requests.RequestException as e:
+            return {"error": f"Batch prediction failed: {str(e)}", "status": "error"}
+
+    def _send_engagement_batch(self, posts: List[Dict]) -> List[Dict]:
+        response = self.session.post(f"{self.base_url}/predict/batch",
+                                     json={"posts": posts})
+        response.raise_for_status()
+        return split_batch_predictions(response.json(), len(posts))
+
+    def close(self):
+        """Flush pending batched predictions and release pooled connections"""
+        if self.batcher is not None:
+            self.batcher.close()
+        self.session.close()
+
     def generate_caption(self,
                          prompt: str,
                          platform: str = "reddit",
@@ -347,10 +542,11 @@ class SimFluenceAIClient:
 class SimFluenceAI:
     """Simple wrapper for common AI operations"""
 
-    def __init__(self, ai_api_url: str = None):
+    def __init__(self, ai_api_url: str = None, auto_batch: bool = False):
         self.client = SimFluenceAIClient(
             base_url=ai_api_url or os.getenv(
-                'AI_API_URL', 'http://localhost:5001')
+                'AI_API_URL', 'http://localhost:5001'),
+            auto_batch=auto_batch
         )
 
     def quick_engagement_prediction(self,
@@ -360,20 +556,7 @@ class SimFluenceAI:
                                     has_image: bool = False) -> Dict:
         """Quick engagement prediction with minimal input"""
 
-        user_data = {
-            "userKarma": user_karma,
-            "userFollowers": user_followers,
-            "avgEngagementRate": 0.05,
-            "avgLikes": max(10, user_karma // 100),
-            "avgComments": max(2, user_karma // 500)
-        }
-
-        post_data = {
-            "containsImage": has_image,
-            "dayOfWeek": "Friday",
-            "postTimeOfDay": "Evening"
-        }
-
+        user_data, post_data = quick_engagement_inputs(user_karma, user_followers, has_image)
         return self.client.predict_engagement(user_data, post_data, content)
 
     def quick_caption_generation(self, prompt: str, platform: str = "reddit") -> str:
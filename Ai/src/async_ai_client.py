@@ -0,0 +1,414 @@
+import asyncio
+import os
+from typing import Awaitable, Dict, List, Optional
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+from ai_client import (engagement_payload, quick_engagement_inputs, split_batch_predictions,
+                       batch_error, AI_CLIENT_BATCH_WINDOW_MS, AI_CLIENT_MAX_BATCH_SIZE)
+
+AI_CLIENT_TIMEOUT = float(os.getenv("AI_CLIENT_TIMEOUT", 30))
+AI_CLIENT_MAX_CONNECTIONS = int(os.getenv("AI_CLIENT_MAX_CONNECTIONS", 100))
+AI_CLIENT_KEEPALIVE = float(os.getenv("AI_CLIENT_KEEPALIVE", 30))
+
+
+class AsyncEngagementBatcher:
+    """
+    asyncio counterpart of EngagementBatcher
+
+    Calls made within window_ms of the first pending one (or until
+    max_batch_size are pending) are sent as one /predict/batch request on the
+    running event loop, and each caller's future gets its own result. A
+    failed batch is retried as concurrent single-post requests when
+    retry_each accepts its error.
+    """
+
+    def __init__(self, send_batch, window_ms: float = AI_CLIENT_BATCH_WINDOW_MS,
+                 max_batch_size: int = AI_CLIENT_MAX_BATCH_SIZE,
+                 retry_each=lambda error: True):
+        self.send_batch = send_batch
+        self.window = window_ms / 1000
+        self.max_batch_size = max(1, max_batch_size)
+        self.retry_each = retry_each
+        self._pending = []
+        self._timer = None
+        self._in_flight = set()
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+        self.isolated_retries = 0
+
+    def submit(self, payload: Dict) -> "asyncio.Future":
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((payload, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        task = asyncio.ensure_future(self._send(batch))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _send(self, batch):
+        try:
+            results = await self.send_batch([payload for payload, _ in batch])
+        except Exception as e:
+            if len(batch) > 1 and self.retry_each(e):
+                self.isolated_retries += 1
+                results = await asyncio.gather(*(self._send_one(payload) for payload, _ in batch))
+            else:
+                results = [batch_error(e)] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _send_one(self, payload: Dict) -> Dict:
+        try:
+            return (await self.send_batch([payload]))[0]
+        except Exception as e:
+            return batch_error(e)
+
+    async def drain(self):
+        """Send anything pending and wait for in-flight batches"""
+        self._flush()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight)
+
+    def stats(self) -> Dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "largest_batch": self.largest_batch,
+            "isolated_retries": self.isolated_retries,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
+
+
+class AsyncSimFluenceAIClient:
+    """
+    asyncio client for the SimFluence AI API with the same methods as
+    SimFluenceAIClient
+
+    Every call goes through one aiohttp session whose connector keeps
+    connections alive, so concurrent and repeated calls reuse sockets.
+    Each method accepts a `timeout` (seconds) overriding the client default.
+    With auto_batch=True, concurrent predict_engagement calls are coalesced
+    into /predict/batch requests.
+
+    Use as an async context manager, or call close() when done:
+
+        async with AsyncSimFluenceAIClient() as client:
+            results = await run_concurrently({
+                "engagement": client.predict_engagement(user_data, post_data, content),
+                "sentiment": client.analyze_sentiment(content),
+            })
+    """
+
+    def __init__(self,
+                 base_url: str = "http://localhost:5001",
+                 api_key: Optional[str] = None,
+                 timeout: float = AI_CLIENT_TIMEOUT,
+                 max_connections: int = AI_CLIENT_MAX_CONNECTIONS,
+                 auto_batch: bool = False,
+                 batch_window_ms: float = AI_CLIENT_BATCH_WINDOW_MS,
+                 max_batch_size: int = AI_CLIENT_MAX_BATCH_SIZE):
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("AsyncSimFluenceAIClient requires aiohttp (pip install aiohttp)")
+
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.headers = {
+            "Content-Type": "application/json",
+            "User-Agent": "SimFluence-AI-Client/1.0"
+        }
+        if api_key:
+            self.headers["Authorization"] = f"Bearer {api_key}"
+        self._session = None
+        self.batcher = AsyncEngagementBatcher(
+            self._send_engagement_batch, batch_window_ms, max_batch_size,
+            retry_each=lambda error: not isinstance(error, (aiohttp.ClientConnectionError,
+                                                            asyncio.TimeoutError))
+        ) if auto_batch else None
+
+    @property
+    def session(self) -> "aiohttp.ClientSession":
+        """Shared session, created on first use inside the running event loop"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections,
+                                             keepalive_timeout=AI_CLIENT_KEEPALIVE)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def close(self):
+        if self.batcher is not None:
+            await self.batcher.drain()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _request(self, method: str, path: str, payload: Dict = None,
+                       timeout: float = None) -> Dict:
+        """Send one request and return the decoded JSON body (raises on failure)"""
+        # Passing timeout=None would disable the session default, so only override when given
+        options = {"timeout": aiohttp.ClientTimeout(total=timeout)} if timeout is not None else {}
+        async with self.session.request(method, f"{self.base_url}{path}",
+                                        json=payload, **options) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def _call(self, method: str, path: str, payload: Dict, failure: str,
+                    timeout: float = None) -> Dict:
+        """_request, with failures reported as an error dict like the sync client"""
+        try:
+            return await self._request(method, path, payload, timeout)
+        except asyncio.TimeoutError:
+            return {"error": f"{failure} failed: timed out", "status": "error"}
+        except aiohttp.ClientError as e:
+            return {"error": f"{failure} failed: {str(e)}", "status": "error"}
+
+    async def health_check(self, timeout: float = None) -> Dict:
+        """Check if the AI API is healthy"""
+        try:
+            return await self._request("GET", "/health", timeout=timeout)
+        except asyncio.TimeoutError:
+            return {"status": "unhealthy", "error": "timed out"}
+        except aiohttp.ClientError as e:
+            return {"status": "unhealthy", "error": str(e)}
+
+    async def predict_engagement(self,
+                                 user_data: Dict,
+                                 post_data: Dict,
+                                 content: str = "",
+                                 timeout: float = None) -> Dict:
+        """Predict engagement for a post"""
+        payload = engagement_payload(user_data, post_data, content)
+        if self.batcher is not None:
+            future = self.batcher.submit(payload)
+            try:
+                # shield: a caller giving up must not cancel the shared batch
+                return await asyncio.wait_for(asyncio.shield(future), timeout)
+            except asyncio.TimeoutError:
+                return {"error": "Prediction failed: timed out", "status": "error"}
+        return await self._call("POST", "/predict/engagement", payload, "Prediction", timeout)
+
+    async def predict_engagement_batch(self, posts: List[Dict], timeout: float = None) -> Dict:
+        """Predict likes, comments and shares for many posts in one request"""
+        return await self._call("POST", "/predict/batch", {"posts": posts},
+                                "Batch prediction", timeout)
+
+    async def _send_engagement_batch(self, posts: List[Dict]) -> List[Dict]:
+        response = await self._request("POST", "/predict/batch", {"posts": posts})
+        return split_batch_predictions(response, len(posts))
+
+    async def generate_caption(self,
+                               prompt: str,
+                               platform: str = "reddit",
+                               tone: str = "casual",
+                               length: str = "medium",
+                               include_hashtags: bool = False,
+                               target_audience: str = "general",
+                               timeout: float = None) -> Dict:
+        """Generate AI-powered caption for social media post"""
+        payload = {
+            "prompt": prompt,
+            "platform": platform,
+            "tone": tone,
+            "length": length,
+            "include_hashtags": include_hashtags,
+            "target_audience": target_audience
+        }
+        return await self._call("POST", "/generate/caption", payload,
+                                "Caption generation", timeout)
+
+    async def analyze_sentiment(self, text: str, timeout: float = None) -> Dict:
+        """Analyze sentiment of text content"""
+        return await self._call("POST", "/analyze/sentiment", {"text": text},
+                                "Sentiment analysis", timeout)
+
+    async def optimize_post(self,
+                            content: str,
+                            user_data: Dict,
+                            post_settings: Dict,
+                            optimization_goals: List[str] = None,
+                            timeout: float = None) -> Dict:
+        """Complete post optimization using all AI services"""
+        if optimization_goals is None:
+            optimization_goals = ["engagement", "caption", "sentiment"]
+
+        payload = {
+            "content": content,
+            "user_data": user_data,
+            "post_settings": post_settings,
+            "optimization_goals": optimization_goals
+        }
+        return await self._call("POST", "/optimize/post", payload,
+                                "Post optimization", timeout)
+
+    async def gemini_optimize_content(self,
+                                      content: str,
+                                      user_profile: Dict,
+                                      optimization_goals: List[str] = None,
+                                      timeout: float = None) -> Dict:
+        """Advanced content optimization using Gemini + XGBoost"""
+        if optimization_goals is None:
+            optimization_goals = ["engagement", "authenticity", "discussion"]
+
+        payload = {
+            "content": content,
+            "user_profile": user_profile,
+            "optimization_goals": optimization_goals
+        }
+        return await self._call("POST", "/ai/gemini/optimize", payload,
+                                "Gemini optimization", timeout)
+
+    async def gemini_generate_caption(self,
+                                      prompt: str,
+                                      platform: str = "reddit",
+                                      engagement_target: str = "medium",
+                                      context: Dict = None,
+                                      timeout: float = None) -> Dict:
+        """Advanced caption generation using Gemini with context"""
+        payload = {
+            "prompt": prompt,
+            "platform": platform,
+            "engagement_target": engagement_target,
+            "context": context or {}
+        }
+        return await self._call("POST", "/ai/gemini/caption", payload,
+                                "Gemini caption generation", timeout)
+
+    async def predict_optimal_time(self,
+                                   subreddit: str,
+                                   content_type: str = "text",
+                                   user_data: Dict = None,
+                                   timeout: float = None) -> Dict:
+        """Predict optimal posting time for a given subreddit and content type"""
+        payload = {
+            "subreddit": subreddit,
+            "content_type": content_type,
+            "user_data": user_data or {}
+        }
+        return await self._call("POST", "/predict/optimal-time", payload,
+                                "Time prediction", timeout)
+
+    async def predict_time_engagement(self,
+                                      subreddit: str,
+                                      content_type: str = "text",
+                                      hours: List[int] = None,
+                                      timeout: float = None) -> Dict:
+        """Predict engagement for different posting times"""
+        if hours is None:
+            hours = [9, 12, 15, 18, 21]
+
+        payload = {
+            "subreddit": subreddit,
+            "content_type": content_type,
+            "hours": hours
+        }
+        return await self._call("POST", "/predict/time-engagement", payload,
+                                "Time engagement prediction", timeout)
+
+    async def get_time_prediction_status(self, timeout: float = None) -> Dict:
+        """Check status of time prediction models"""
+        return await self._call("GET", "/time/status", None, "Status check", timeout)
+
+    async def comprehensive_ai_analysis(self,
+                                        content: str,
+                                        user_data: Dict,
+                                        analysis_depth: str = "full",
+                                        timeout: float = None) -> Dict:
+        """Complete AI analysis using LangChain agent with multiple tools"""
+        payload = {
+            "content": content,
+            "user_data": user_data,
+            "analysis_depth": analysis_depth
+        }
+        return await self._call("POST", "/ai/comprehensive", payload,
+                                "Comprehensive analysis", timeout)
+
+    async def get_ai_models_status(self, timeout: float = None) -> Dict:
+        """Get status of all AI models and integrations"""
+        return await self._call("GET", "/ai/models/status", None, "Status check", timeout)
+
+
+async def run_concurrently(calls: Dict[str, Awaitable]) -> Dict:
+    """
+    Await independent calls at the same time
+
+    Args:
+        calls: Name -> awaitable (e.g. an un-awaited client method call)
+
+    Returns:
+        Results keyed by name in the given order. The client methods report
+        failures as error dicts, so one failed call does not cancel the others.
+    """
+    results = await asyncio.gather(*calls.values())
+    return dict(zip(calls.keys(), results))
+
+
+async def integrate_with_backend_service_async(content: str, user_data: Dict,
+                                               client: AsyncSimFluenceAIClient = None) -> Dict:
+    """
+    integrate_with_backend_service with the engagement, caption and sentiment
+    calls in flight together, so it takes one round trip instead of three
+    """
+    owns_client = client is None
+    if owns_client:
+        client = AsyncSimFluenceAIClient(os.getenv('AI_API_URL', 'http://localhost:5001'))
+
+    user, post = quick_engagement_inputs(
+        user_karma=user_data.get("karma", 1000),
+        user_followers=user_data.get("followers", 100),
+        has_image=user_data.get("has_image", False)
+    )
+
+    try:
+        results = await run_concurrently({
+            "engagement": client.predict_engagement(user, post, content),
+            "caption": client.generate_caption(content, platform="reddit"),
+            "sentiment": client.analyze_sentiment(content),
+        })
+    finally:
+        if owns_client:
+            await client.close()
+
+    engagement = results["engagement"]
+    caption = results["caption"]
+    sentiment = results["sentiment"]
+
+    return {
+        "original_content": content,
+        "optimized_caption": caption.get("caption", content) if caption.get("status") == "success" else content,
+        "predicted_engagement": engagement,
+        "sentiment_analysis": sentiment.get("sentiment", "neutral") if sentiment.get("status") == "success" else "neutral",
+        "ai_confidence": engagement.get("engagement_score", 0)
+    }
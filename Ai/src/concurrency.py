@@ -0,0 +1,67 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Tuple
+
+MAX_WORKERS = int(os.getenv("STAGE_EXECUTOR_WORKERS", 8))
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Shared, bounded thread pool for fanning out independent request stages
+
+    Created lazily (and re-created after a fork) because threads do not
+    survive into gunicorn workers forked from a preloaded master.
+    """
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        with _executor_lock:
+            if _executor is None or _executor_pid != os.getpid():
+                _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS,
+                                               thread_name_prefix="stage")
+                _executor_pid = os.getpid()
+    return _executor
+
+
+def _timed(func: Callable) -> Tuple:
+    start = time.perf_counter()
+    result = func()
+    return result, round((time.perf_counter() - start) * 1000, 2)
+
+
+def run_stages(stages: Dict[str, Callable], parallel: bool = True) -> Tuple[Dict, Dict]:
+    """
+    Run independent stages and collect their results and timings
+
+    Args:
+        stages: Stage name -> zero-argument callable
+        parallel: Dispatch the stages to the shared executor and join them;
+            otherwise run them one after another
+
+    Returns:
+        (results, timings_ms), both keyed by stage name in the given order.
+        The first stage exception is re-raised after all stages finished.
+    """
+    results, timings = {}, {}
+
+    if not parallel or len(stages) <= 1:
+        for name, func in stages.items():
+            results[name], timings[name] = _timed(func)
+        return results, timings
+
+    executor = get_executor()
+    futures = {name: executor.submit(_timed, func) for name, func in stages.items()}
+    error = None
+    for name, future in futures.items():
+        try:
+            results[name], timings[name] = future.result()
+        except Exception as e:
+            error = error or e
+    if error is not None:
+        raise error
+    return results, timings
@@ -0,0 +1,107 @@
+import threading
+from typing import Dict, List
+
+import numpy as np
+
+# Raw engagement inputs and the defaults used when a field is missing
+NUMERIC_FEATURES = {
+    "length": 0,
+    "containsImage": 0,
+    "userFollowers": 0,
+    "userFollowing": 0,
+    "userKarma": 0,
+    "accountAgeDays": 365,
+    "avgEngagementRate": 0.05,
+    "avgLikes": 10,
+    "avgComments": 2,
+}
+
+# Always 0 at inference time
+CONSTANT_FEATURES = {
+    "shouldImprove": 0,
+}
+
+# Categorical inputs: (default value, categories that get a one-hot column)
+# Sunday, Night and Negative are never set: their model columns are left at 0
+# for every input, as the baseline transform_input_features did (the saved
+# models do have those columns)
+CATEGORICAL_FEATURES = {
+    "dayOfWeek": ("Friday", ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]),
+    "postTimeOfDay": ("Evening", ["Morning", "Afternoon", "Evening"]),
+    "topCommentSentiment": ("Positive", ["Neutral", "Positive"]),
+}
+
+
+class FeatureEncoder:
+    """
+    Compiled encoder from engagement inputs to a model-ready float32 matrix
+    Column positions are resolved once from the saved feature column list
+    """
+
+    def __init__(self, feature_columns: List[str]):
+        self.feature_columns = list(feature_columns)
+        self.column_index = {name: i for i, name in enumerate(self.feature_columns)}
+
+        self.numeric = [
+            (self.column_index[name], name, default)
+            for name, default in {**NUMERIC_FEATURES, **CONSTANT_FEATURES}.items()
+            if name in self.column_index
+        ]
+
+        self.categorical = []
+        for field, (default, categories) in CATEGORICAL_FEATURES.items():
+            targets = [
+                (self.column_index[f"{field}_{value}"], value)
+                for value in categories
+                if f"{field}_{value}" in self.column_index
+            ]
+            if targets:
+                self.categorical.append((field, default, targets))
+
+    def encode(self, rows: List[Dict]) -> np.ndarray:
+        """
+        Encode raw user-facing inputs (as accepted by transform_input_features)
+        """
+        matrix = np.zeros((len(rows), len(self.feature_columns)), dtype=np.float32)
+        if not rows:
+            return matrix
+
+        for idx, name, default in self.numeric:
+            if name in CONSTANT_FEATURES:
+                matrix[:, idx] = default
+            else:
+                matrix[:, idx] = [row.get(name, default) for row in rows]
+
+        for field, default, targets in self.categorical:
+            values = np.array([row.get(field, default) for row in rows], dtype=object)
+            for idx, value in targets:
+                matrix[:, idx] = values == value
+
+        return matrix
+
+    def encode_transformed(self, rows: List[Dict]) -> np.ndarray:
+        """
+        Encode already-transformed feature dicts (keys are feature column names)
+        Unknown keys are ignored and missing columns stay 0
+        """
+        matrix = np.zeros((len(rows), len(self.feature_columns)), dtype=np.float32)
+        for i, row in enumerate(rows):
+            for name, value in row.items():
+                idx = self.column_index.get(name)
+                if idx is not None:
+                    matrix[i, idx] = value
+        return matrix
+
+
+_encoders = {}
+_encoders_lock = threading.Lock()
+
+
+def get_encoder(feature_columns: List[str]) -> FeatureEncoder:
+    """Return the shared encoder for a feature column layout"""
+    key = tuple(feature_columns)
+    encoder = _encoders.get(key)
+    if encoder is None:
+        with _encoders_lock:
+            encoder = _encoders.setdefault(key, FeatureEncoder(feature_columns))
+    return encoder
@@ -1,28 +1,198 @@
 import os
 import sys
-from typing import Dict, List, Any, Optional
+import queue
+import threading
+import time
+from contextlib import closing, contextmanager
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 import json
 from datetime import datetime
 
 # LangChain imports
-from langchain_core.prompts import ChatPromptTemplate, SystemMessagePromptTemplate, HumanMessagePromptTemplate
+from langchain_core.prompts import ChatPromptTemplate, SystemMessagePromptTemplate, HumanMessagePromptTemplate, PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser, PydanticOutputParser
 from pydantic import BaseModel, Field
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.chains import LLMChain
 from langchain.agents import Tool, AgentExecutor, create_react_agent
-from langchain.memory import ConversationBufferMemory
 from langchain_core.tools import tool
+from langchain_core.callbacks import BaseCallbackHandler
 
 # Add src to path for local imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+from llm_cache import LLMResponseCache, get_llm_cache
+from concurrency import run_stages
+from session_memory import SessionMemoryStore, session_store
+from metrics import LLM_CALL_SECONDS
+
 try:
-    from predict import predict_likes
-    from sentiment_analyzer import analyze_sentiment
+    from predict import predict_likes, predict_likes_batch
+    from sentiment_analyzer import analyze_text
 except ImportError:
     print("Warning: Could not import local modules. Make sure src/ modules are available.")
 
+GEMINI_MODEL = "gemini-2.0-flash"
+AGENT_POOL_SIZE = int(os.getenv("GEMINI_AGENT_POOL_SIZE", 4))
+AGENT_POOL_TIMEOUT = float(os.getenv("GEMINI_AGENT_POOL_TIMEOUT", 30))
+# "agent": ReAct agent that calls the tools itself (several LLM round trips)
+# "direct": run the tools up front and make a single LLM call
+ANALYSIS_MODES = ("agent", "direct")
+DEFAULT_ANALYSIS_MODE = os.getenv("GEMINI_ANALYSIS_MODE", "agent")
+
+# Bundled copy of the hwchase17/react hub prompt, so building an agent needs no network call,
+# with a slot for the (bounded) session history
+REACT_PROMPT = PromptTemplate.from_template("""Answer the following questions as best you can. You have access to the following tools:
+
+{tools}
+
+Use the following format:
+
+Question: the input question you must answer
+Thought: you should always think about what to do
+Action: the action to take, should be one of [{tool_names}]
+Action Input: the input to the action
+Observation: the result of the action
+... (this Thought/Action/Action Input/Observation can repeat N times)
+Thought: I now know the final answer
+Final Answer: the final answer to the original input question
+
+Begin!
+
+{chat_history}Question: {input}
+Thought:{agent_scratchpad}""")
+
+
+CAPTION_SYSTEM_TEMPLATE = """You are an expert social media caption writer for {platform}. 
+                Create engaging, authentic captions that drive maximum engagement.
+                
+                Platform Guidelines:
+                - Reddit: Focus on discussion, community value, authenticity
+                - Avoid overly promotional language
+                - Encourage comments and interaction
+                
+                Context: {context}
+                """
+CAPTION_HUMAN_TEMPLATE = "Create an engaging {platform} caption for: {prompt}"
+CAPTION_PROMPT = ChatPromptTemplate.from_messages([
+    SystemMessagePromptTemplate.from_template(CAPTION_SYSTEM_TEMPLATE),
+    HumanMessagePromptTemplate.from_template(CAPTION_HUMAN_TEMPLATE)
+])
+
+# Agent-mode comprehensive analysis: the agent gathers the data through its tools
+ANALYSIS_PROMPT = """
+        Perform a comprehensive social media content analysis using all available tools.
+        
+        Content: "{content}"
+        User Profile: {profile}
+        
+        Steps to follow:
+        1. Predict engagement metrics for the current content
+        2. Analyze sentiment and emotional tone
+        3. Get optimal posting time recommendations
+        4. Generate an improved version of the content
+        5. Predict engagement for the improved version
+        6. Provide a detailed comparison and recommendations
+        
+        Return a structured analysis with clear insights and actionable recommendations.
+        """
+
+# Direct-mode comprehensive analysis: the tool results are already in the prompt
+DIRECT_ANALYSIS_TASK = """Perform a comprehensive social media content analysis:
+1. Interpret the engagement metrics for the current content
+2. Interpret the sentiment and emotional tone
+3. Recommend when to post, given the current time
+4. Generate an improved version of the content
+5. Estimate engagement for the improved version relative to the current prediction
+6. Provide a detailed comparison and recommendations
+
+Return a structured analysis with clear insights and actionable recommendations."""
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+class StreamCancelled(Exception):
+    """Raised inside a streaming run once nobody is reading its events"""
+
+
+class StreamEventHandler(BaseCallbackHandler):
+    """
+    Forwards LLM tokens and agent tool calls from a running chain to a queue
+
+    Once `cancelled` is set, the next callback raises StreamCancelled, which
+    stops the run before it makes another LLM or tool call.
+    """
+
+    # Let StreamCancelled propagate instead of being logged and ignored
+    raise_error = True
+
+    def __init__(self, events: queue.Queue, cancelled: threading.Event = None):
+        self.events = events
+        self.cancelled = cancelled or threading.Event()
+
+    def _check_cancelled(self):
+        if self.cancelled.is_set():
+            raise StreamCancelled("Stream closed by the client")
+
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        self._check_cancelled()
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        self._check_cancelled()
+
+    def on_tool_start(self, serialized, input_str, **kwargs):
+        self._check_cancelled()
+
+    def on_llm_new_token(self, token: str, **kwargs):
+        self._check_cancelled()
+        if token:
+            self.events.put(("token", {"text": token}))
+
+    def on_agent_action(self, action, **kwargs):
+        self._check_cancelled()
+        self.events.put(("step", {"tool": action.tool, "tool_input": action.tool_input}))
+
+    def on_tool_end(self, output, **kwargs):
+        self.events.put(("observation", {"observation": str(output)}))
+
+
+class LLMMetricsHandler(BaseCallbackHandler):
+    """Times every call of the model it is attached to into the LLM call histogram"""
+
+    def __init__(self, model: str):
+        self.model = model
+        self._started = {}
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._started[run_id] = time.perf_counter()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._started[run_id] = time.perf_counter()
+
+    def _observe(self, run_id, outcome: str):
+        start = self._started.pop(run_id, None)
+        if start is not None:
+            LLM_CALL_SECONDS.observe(time.perf_counter() - start, model=self.model, outcome=outcome)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._observe(run_id, "success")
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._observe(run_id, "error")
+
+
+def create_gemini_llm(google_api_key: str) -> ChatGoogleGenerativeAI:
+    """Create the Gemini chat model used by the agents"""
+    return ChatGoogleGenerativeAI(
+        model=GEMINI_MODEL,
+        google_api_key=google_api_key,
+        temperature=0.7,
+        convert_system_message_to_human=True,
+        callbacks=[LLMMetricsHandler(GEMINI_MODEL)]
+    )
+
 # Pydantic models for structured output
 
 
@@ -55,31 +225,74 @@ class SentimentAnalysis(BaseModel):
     suggestions: List[str] = Field(description="Suggestions for improvement")
 
 
+def engagement_prediction(data: Dict, raw: bool = False) -> Dict:
+    """Likes prediction plus derived comments/category, as returned by the engagement tool"""
+    prediction = float(predict_likes_batch([data], raw=True)[0] if raw else predict_likes(data))
+
+    # Categorize engagement
+    if prediction < 10:
+        category = "low"
+    elif prediction < 50:
+        category = "medium"
+    elif prediction < 200:
+        category = "high"
+    else:
+        category = "viral"
+
+    return {
+        "predicted_likes": round(prediction, 1),
+        "predicted_comments": max(1, int(prediction * 0.1)),
+        "engagement_category": category,
+        "confidence_score": 0.85
+    }
+
+
+def current_time_context() -> Dict:
+    """Current date and time, as returned by the time tool"""
+    now = datetime.now()
+    return {
+        "current_time": now.isoformat(),
+        "day_of_week": now.strftime("%A"),
+        "hour": now.hour,
+        "optimal_posting_time": "evening" if 18 <= now.hour <= 21 else "morning" if 6 <= now.hour <= 9 else "off-peak"
+    }
+
+
+def profile_to_post(content: str, user_profile: Dict) -> Dict:
+    """Raw engagement-model input for a piece of content and a user profile"""
+    post = {"length": len(content)}
+    for profile_key, feature in (("karma", "userKarma"), ("followers", "userFollowers"),
+                                 ("following", "userFollowing"),
+                                 ("account_age_days", "accountAgeDays"),
+                                 ("avg_engagement_rate", "avgEngagementRate"),
+                                 ("avg_likes", "avgLikes"), ("avg_comments", "avgComments")):
+        if profile_key in user_profile:
+            post[feature] = user_profile[profile_key]
+    return post
+
+
 class SimFluenceLangChainAgent:
     """
     LangChain agent that combines custom ML model with Gemini AI
     """
 
-    def __init__(self, google_api_key: str = None):
+    def __init__(self, google_api_key: str = None, llm: ChatGoogleGenerativeAI = None,
+                 cache: LLMResponseCache = None, sessions: SessionMemoryStore = None):
         # Initialize Gemini
         self.google_api_key = google_api_key or os.getenv('GOOGLE_API_KEY')
         if not self.google_api_key:
             raise ValueError(
                 "Google API key is required. Set GOOGLE_API_KEY environment variable.")
 
-        # Initialize Gemini model
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash",
-            google_api_key=self.google_api_key,
-            temperature=0.7,
-            convert_system_message_to_human=True
-        )
+        # Initialize Gemini model (agents in a pool share one client)
+        self.llm = llm or create_gemini_llm(self.google_api_key)
 
-        # Initialize memory for conversation context
-        self.memory = ConversationBufferMemory(
-            memory_key="chat_history",
-            return_messages=True
-        )
+        # Responses for identical prompts and inputs are served from cache
+        self.cache = cache if cache is not None else get_llm_cache()
+
+        # Conversation context lives in per-session memories with a token budget,
+        # so a long-lived agent's prompts do not grow with every request
+        self.sessions = sessions if sessions is not None else session_store
 
         # Create tools
         self.tools = self._create_tools()
@@ -97,25 +310,7 @@ class SimFluenceLangChainAgent:
             Input should be JSON string with user and post data.
             """
             try:
-                data = json.loads(input_data)
-                prediction = predict_likes(data)
-
-                # Categorize engagement
-                if prediction < 10:
-                    category = "low"
-                elif prediction < 50:
-                    category = "medium"
-                elif prediction < 200:
-                    category = "high"
-                else:
-                    category = "viral"
-
-                return json.dumps({
-                    "predicted_likes": round(prediction, 1),
-                    "predicted_comments": max(1, int(prediction * 0.1)),
-                    "engagement_category": category,
-                    "confidence_score": 0.85
-                })
+                return json.dumps(engagement_prediction(json.loads(input_data)))
             except Exception as e:
                 return f"Error in engagement prediction: {str(e)}"
 
@@ -125,7 +320,7 @@ class SimFluenceLangChainAgent:
             Analyze sentiment of text content using multiple techniques.
             """
             try:
-                result = analyze_sentiment(text)
+                result = analyze_text(text)
                 return json.dumps(result)
             except Exception as e:
                 return f"Error in sentiment analysis: {str(e)}"
@@ -133,13 +328,7 @@ class SimFluenceLangChainAgent:
         @tool
         def get_current_time_tool() -> str:
             """Get current date and time for posting recommendations."""
-            now = datetime.now()
-            return json.dumps({
-                "current_time": now.isoformat(),
-                "day_of_week": now.strftime("%A"),
-                "hour": now.hour,
-                "optimal_posting_time": "evening" if 18 <= now.hour <= 21 else "morning" if 6 <= now.hour <= 9 else "off-peak"
-            })
+            return json.dumps(current_time_context())
 
         return [
             predict_engagement_tool,
@@ -149,31 +338,113 @@ class SimFluenceLangChainAgent:
 
     def _create_agent(self):
         """Create the LangChain agent with tools"""
-        from langchain.agents import create_react_agent
-        from langchain import hub
-
-        # Get the prompt template
-        prompt = hub.pull("hwchase17/react")
-
-        # Create agent
         agent = create_react_agent(
             llm=self.llm,
             tools=self.tools,
-            prompt=prompt
+            prompt=REACT_PROMPT
         )
 
         return AgentExecutor(
             agent=agent,
             tools=self.tools,
-            memory=self.memory,
             verbose=True,
             handle_parsing_errors=True
         )
 
-    def optimize_content_with_gemini(self, content: str, user_profile: Dict, optimization_goals: List[str]) -> Dict:
+    def _cached(self, name: str, template: str, inputs: Dict, compute) -> Dict:
+        """Serve a successful earlier response for the same template and inputs"""
+        if self.cache is None:
+            return compute()
+        return self.cache.get_or_compute(
+            f"{GEMINI_MODEL}:{name}", template, inputs, compute,
+            should_cache=lambda result: result.get("status") == "success")
+
+    def _history_block(self, session_id: Optional[str]) -> str:
+        """Session history as a prompt section ("" without a session)"""
+        history = self.sessions.get_history(session_id)
+        return f"Previous conversation:\n{history}\n\n" if history else ""
+
+    def _remember(self, session_id: Optional[str], request: str, result: Dict, output_key: str):
+        """Record a successful exchange in the session's memory"""
+        if session_id and result.get("status") == "success":
+            self.sessions.add_turn(session_id, request, str(result.get(output_key, "")))
+
+    def _direct_analysis(self, task: str, content: str, user_profile: Dict, extra: str = "",
+                         history: str = "") -> Dict:
+        """
+        Run every tool up front (in parallel), then make a single Gemini call
+
+        Returns the LLM output, the tool calls in agent-step form and the
+        per-stage timings in milliseconds.
+        """
+        for event, data in self._direct_analysis_events(task, content, user_profile, extra, history):
+            if event == "final":
+                return data
+
+    def _direct_analysis_events(self, task: str, content: str, user_profile: Dict, extra: str = "",
+                                history: str = "") -> Iterator[Tuple[str, Dict]]:
+        """
+        Event stream behind _direct_analysis: a "step" per tool result, a
+        "token" per Gemini chunk, then "final" with the _direct_analysis result
+        """
+        start = time.perf_counter()
+        tool_inputs = {
+            "predict_engagement_tool": profile_to_post(content, user_profile),
+            "analyze_sentiment_tool": content,
+            "get_current_time_tool": None,
+        }
+        results, timings = run_stages({
+            "predict_engagement_tool": lambda: engagement_prediction(
+                tool_inputs["predict_engagement_tool"], raw=True),
+            "analyze_sentiment_tool": lambda: analyze_text(content),
+            "get_current_time_tool": current_time_context,
+        })
+        timings["tools"] = _elapsed_ms(start)
+
+        steps = [{"tool": name, "tool_input": tool_inputs[name], "observation": results[name]}
+                 for name in tool_inputs]
+        for step in steps:
+            yield "step", step
+
+        prompt = f"""You are an expert social media content optimizer for Reddit.
+The following data comes from a trained engagement model and local analysis tools.
+Base your answer on it instead of guessing these numbers.
+
+{history}Content: "{content}"
+User Profile: {json.dumps(user_profile)}
+{extra}
+Engagement prediction for the current content: {json.dumps(results["predict_engagement_tool"])}
+Sentiment analysis: {json.dumps(results["analyze_sentiment_tool"], default=str)}
+Current time: {json.dumps(results["get_current_time_tool"])}
+
+{task}"""
+
+        llm_start = time.perf_counter()
+        chunks = []
+        for chunk in self.llm.stream(prompt):
+            if chunk.content:
+                chunks.append(chunk.content)
+                yield "token", {"text": chunk.content}
+        timings["llm"] = _elapsed_ms(llm_start)
+        timings["total"] = _elapsed_ms(start)
+
+        yield "final", {"output": "".join(chunks), "steps": steps, "timings_ms": timings}
+
+    def optimize_content_with_gemini(self, content: str, user_profile: Dict, optimization_goals: List[str],
+                                     mode: str = None, session_id: str = None) -> Dict:
         """
         Use Gemini + custom model to optimize social media content
+
+        mode "direct" computes the tool results up front and makes one Gemini
+        call instead of letting the ReAct agent call the tools. With a
+        session_id, earlier exchanges of that session are part of the prompt.
         """
+        mode = mode or DEFAULT_ANALYSIS_MODE
+        history = self._history_block(session_id)
+        if mode == "direct":
+            result = self._optimize_direct(content, user_profile, optimization_goals, history)
+            self._remember(session_id, f"Optimize: {content}", result, "optimization_result")
+            return result
 
         # Create system prompt for content optimization
         system_prompt = """You are an expert social media content optimizer for Reddit. 
@@ -212,110 +483,203 @@ class SimFluenceLangChainAgent:
         formatted_human = human_prompt.format(content=content)
 
         # Execute the agent
-        try:
-            result = self.agent.invoke({
-                "input": f"System: {formatted_system}\n\nHuman: {formatted_human}"
-            })
+        def run_agent():
+            try:
+                start = time.perf_counter()
+                result = self.agent.invoke({
+                    "input": f"System: {formatted_system}\n\nHuman: {formatted_human}",
+                    "chat_history": history
+                })
 
-            return {
-                "status": "success",
-                "optimization_result": result["output"],
-                "agent_steps": result.get("intermediate_steps", [])
-            }
-        except Exception as e:
-            return {
-                "status": "error",
-                "error": str(e),
-                "fallback_optimization": self._fallback_optimization(content, user_profile)
-            }
+                return {
+                    "status": "success",
+                    "optimization_result": result["output"],
+                    "agent_steps": result.get("intermediate_steps", []),
+                    "mode": "agent",
+                    "timings_ms": {"total": _elapsed_ms(start)}
+                }
+            except Exception as e:
+                return {
+                    "status": "error",
+                    "error": str(e),
+                    "fallback_optimization": self._fallback_optimization(content, user_profile)
+                }
+
+        result = self._cached(
+            "optimize", system_prompt + human_prompt,
+            {"content": content, "profile": user_profile, "goals": optimization_goals,
+             "history": history},
+            run_agent)
+        self._remember(session_id, f"Optimize: {content}", result, "optimization_result")
+        return result
+
+    def _optimize_direct(self, content: str, user_profile: Dict, optimization_goals: List[str],
+                         history: str = "") -> Dict:
+        task = """Please optimize this content for maximum Reddit engagement:
+1. Summarize the baseline engagement prediction and the sentiment and emotional impact
+2. Generate an optimized version
+3. Estimate how the optimized version should perform relative to the baseline
+4. Provide specific improvement recommendations
+
+Return your analysis and optimized content with clear before/after comparisons."""
+
+        def run_direct():
+            try:
+                result = self._direct_analysis(
+                    task, content, user_profile,
+                    extra=f"Optimization Goals: {', '.join(optimization_goals)}\n",
+                    history=history)
+                return {
+                    "status": "success",
+                    "optimization_result": result["output"],
+                    "agent_steps": result["steps"],
+                    "mode": "direct",
+                    "timings_ms": result["timings_ms"]
+                }
+            except Exception as e:
+                return {
+                    "status": "error",
+                    "error": str(e),
+                    "fallback_optimization": self._fallback_optimization(content, user_profile)
+                }
+
+        return self._cached(
+            "optimize_direct", task,
+            {"content": content, "profile": user_profile, "goals": optimization_goals,
+             "history": history},
+            run_direct)
 
     def generate_caption_with_context(self, prompt: str, platform: str = "reddit", context: Dict = None) -> Dict:
         """
         Generate caption using Gemini with context from custom model
         """
 
-        # Create prompt template
-        caption_prompt = ChatPromptTemplate.from_messages([
-            SystemMessagePromptTemplate.from_template(
-                """You are an expert social media caption writer for {platform}. 
-                Create engaging, authentic captions that drive maximum engagement.
-                
-                Platform Guidelines:
-                - Reddit: Focus on discussion, community value, authenticity
-                - Avoid overly promotional language
-                - Encourage comments and interaction
-                
-                Context: {context}
-                """
-            ),
-            HumanMessagePromptTemplate.from_template(
-                "Create an engaging {platform} caption for: {prompt}"
-            )
-        ])
-
         # Create chain
         chain = LLMChain(
             llm=self.llm,
-            prompt=caption_prompt,
+            prompt=CAPTION_PROMPT,
             output_parser=PydanticOutputParser(
                 pydantic_object=ContentOptimization)
         )
 
-        try:
-            result = chain.run(
-                platform=platform,
-                prompt=prompt,
-                context=json.dumps(context or {})
-            )
+        def run_chain():
+            try:
+                result = chain.run(
+                    platform=platform,
+                    prompt=prompt,
+                    context=json.dumps(context or {})
+                )
 
-            return {
+                return {
+                    "status": "success",
+                    "caption": result.optimized_caption,
+                    "improvements": result.key_improvements,
+                    "hashtags": result.hashtags,
+                    "posting_tips": result.posting_recommendations
+                }
+            except Exception as e:
+                return {
+                    "status": "error",
+                    "error": str(e),
+                    "fallback_caption": f"Sharing some thoughts about {prompt}. What do you think?"
+                }
+
+        return self._cached(
+            "caption", CAPTION_SYSTEM_TEMPLATE + CAPTION_HUMAN_TEMPLATE,
+            {"platform": platform, "prompt": prompt, "context": context or {}},
+            run_chain)
+
+    def stream_caption_with_context(self, prompt: str, platform: str = "reddit",
+                                    context: Dict = None) -> Iterator[Tuple[str, Dict]]:
+        """
+        Streaming variant of generate_caption_with_context
+
+        Yields ("token", {"text"}) events as Gemini produces them, then a
+        ("summary", ...) event with the generate_caption_with_context response
+        plus timings. A cached response is sent as the summary right away.
+        """
+        start = time.perf_counter()
+        template = CAPTION_SYSTEM_TEMPLATE + CAPTION_HUMAN_TEMPLATE
+        inputs = {"platform": platform, "prompt": prompt, "context": context or {}}
+        namespace = f"{GEMINI_MODEL}:caption"
+
+        cached = self.cache.get(namespace, template, inputs) if self.cache else None
+        if cached is not None:
+            yield "summary", dict(cached, cached=True,
+                                  timings_ms={"total": _elapsed_ms(start)})
+            return
+
+        first_token_ms = None
+        chunks = []
+        try:
+            for chunk in (CAPTION_PROMPT | self.llm).stream({
+                "platform": platform,
+                "prompt": prompt,
+                "context": json.dumps(context or {})
+            }):
+                if chunk.content:
+                    if first_token_ms is None:
+                        first_token_ms = _elapsed_ms(start)
+                    chunks.append(chunk.content)
+                    yield "token", {"text": chunk.content}
+
+            parsed = PydanticOutputParser(
+                pydantic_object=ContentOptimization).parse("".join(chunks))
+            result = {
                 "status": "success",
-                "caption": result.optimized_caption,
-                "improvements": result.key_improvements,
-                "hashtags": result.hashtags,
-                "posting_tips": result.posting_recommendations
+                "caption": parsed.optimized_caption,
+                "improvements": parsed.key_improvements,
+                "hashtags": parsed.hashtags,
+                "posting_tips": parsed.posting_recommendations
             }
+            if self.cache:
+                self.cache.set(namespace, template, inputs, result)
         except Exception as e:
-            return {
+            result = {
                 "status": "error",
                 "error": str(e),
                 "fallback_caption": f"Sharing some thoughts about {prompt}. What do you think?"
             }
 
-    def comprehensive_analysis(self, content: str, user_profile: Dict) -> Dict:
+        yield "summary", dict(result, timings_ms={"first_token": first_token_ms,
+                                                  "total": _elapsed_ms(start)})
+
+    def comprehensive_analysis(self, content: str, user_profile: Dict, mode: str = None,
+                               session_id: str = None) -> Dict:
         """
         Perform comprehensive analysis combining all AI capabilities
-        """
 
-        analysis_prompt = """
-        Perform a comprehensive social media content analysis using all available tools.
-        
-        Content: "{content}"
-        User Profile: {profile}
-        
-        Steps to follow:
-        1. Predict engagement metrics for the current content
-        2. Analyze sentiment and emotional tone
-        3. Get optimal posting time recommendations
-        4. Generate an improved version of the content
-        5. Predict engagement for the improved version
-        6. Provide a detailed comparison and recommendations
-        
-        Return a structured analysis with clear insights and actionable recommendations.
+        mode "direct" computes the tool results up front and makes one Gemini
+        call instead of letting the ReAct agent call the tools. With a
+        session_id, earlier exchanges of that session are part of the prompt.
         """
+        mode = mode or DEFAULT_ANALYSIS_MODE
+        history = self._history_block(session_id)
+        if mode == "direct":
+            result = self._comprehensive_direct(content, user_profile, history)
+        else:
+            result = self._comprehensive_agent(content, user_profile, history)
+        self._remember(session_id, f"Analyze: {content}", result, "comprehensive_analysis")
+        return result
+
+    def _comprehensive_agent(self, content: str, user_profile: Dict, history: str = "") -> Dict:
 
         try:
+            start = time.perf_counter()
             result = self.agent.invoke({
-                "input": analysis_prompt.format(
+                "input": ANALYSIS_PROMPT.format(
                     content=content,
                     profile=json.dumps(user_profile)
-                )
+                ),
+                "chat_history": history
             })
 
             return {
                 "status": "success",
                 "comprehensive_analysis": result["output"],
-                "agent_reasoning": result.get("intermediate_steps", [])
+                "agent_reasoning": result.get("intermediate_steps", []),
+                "mode": "agent",
+                "timings_ms": {"total": _elapsed_ms(start)}
             }
         except Exception as e:
             return {
@@ -323,6 +687,112 @@ class SimFluenceLangChainAgent:
                 "error": str(e)
             }
 
+    def _comprehensive_direct(self, content: str, user_profile: Dict, history: str = "") -> Dict:
+        try:
+            result = self._direct_analysis(DIRECT_ANALYSIS_TASK, content, user_profile, history=history)
+            return {
+                "status": "success",
+                "comprehensive_analysis": result["output"],
+                "agent_reasoning": result["steps"],
+                "mode": "direct",
+                "timings_ms": result["timings_ms"]
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "error": str(e)
+            }
+
+    def stream_comprehensive_analysis(self, content: str, user_profile: Dict, mode: str = None,
+                                      session_id: str = None) -> Iterator[Tuple[str, Dict]]:
+        """
+        Streaming variant of comprehensive_analysis
+
+        Yields ("step", {"tool", "tool_input"}) and ("observation", ...) events
+        for tool calls, ("token", {"text"}) events for Gemini output, and a
+        final ("summary", ...) event with the comprehensive_analysis response.
+        Its timings include the time to the first token.
+        """
+        mode = mode or DEFAULT_ANALYSIS_MODE
+        history = self._history_block(session_id)
+        start = time.perf_counter()
+        first_token_ms = None
+        final = None
+
+        try:
+            if mode == "direct":
+                events = self._direct_analysis_events(
+                    DIRECT_ANALYSIS_TASK, content, user_profile, history=history)
+            else:
+                events = self._agent_events({
+                    "input": ANALYSIS_PROMPT.format(content=content, profile=json.dumps(user_profile)),
+                    "chat_history": history
+                })
+            with closing(events):
+                for event, data in events:
+                    if event == "final":
+                        final = data
+                        continue
+                    if event == "token" and first_token_ms is None:
+                        first_token_ms = _elapsed_ms(start)
+                    yield event, data
+
+            result = {
+                "status": "success",
+                "comprehensive_analysis": final["output"],
+                "agent_reasoning": final["steps"],
+                "mode": mode,
+                "timings_ms": dict(final.get("timings_ms", {}),
+                                   first_token=first_token_ms, total=_elapsed_ms(start))
+            }
+        except Exception as e:
+            result = {
+                "status": "error",
+                "error": str(e)
+            }
+
+        self._remember(session_id, f"Analyze: {content}", result, "comprehensive_analysis")
+        yield "summary", result
+
+    def _agent_events(self, inputs: Dict) -> Iterator[Tuple[str, Dict]]:
+        """
+        Run the ReAct agent on a background thread and yield its tokens and
+        tool calls as they happen, then a ("final", ...) event
+
+        Closing the generator early (the client disconnected) cancels the
+        agent at its next callback and waits for the thread to finish, so the
+        agent is idle again before its optimizer returns to the pool.
+        """
+        events = queue.Queue()
+        cancelled = threading.Event()
+        outcome = {}
+
+        def run():
+            try:
+                outcome["result"] = self.agent.invoke(
+                    inputs, config={"callbacks": [StreamEventHandler(events, cancelled)]})
+            except Exception as e:
+                outcome["error"] = e
+            finally:
+                events.put(None)
+
+        worker = threading.Thread(target=run, name="agent-stream", daemon=True)
+        worker.start()
+        try:
+            while True:
+                item = events.get()
+                if item is None:
+                    break
+                yield item
+        finally:
+            cancelled.set()
+            worker.join()
+
+        if "error" in outcome:
+            raise outcome["error"]
+        yield "final", {"output": outcome["result"]["output"],
+                        "steps": outcome["result"].get("intermediate_steps", [])}
+
     def _fallback_optimization(self, content: str, user_profile: Dict) -> Dict:
         """Fallback optimization if agent fails"""
         return {
@@ -339,10 +809,11 @@ class GeminiXGBoostOptimizer:
     Simple wrapper combining XGBoost predictions with Gemini optimization
     """
 
-    def __init__(self, google_api_key: str = None):
-        self.agent = SimFluenceLangChainAgent(google_api_key)
+    def __init__(self, google_api_key: str = None, agent: SimFluenceLangChainAgent = None):
+        self.agent = agent or SimFluenceLangChainAgent(google_api_key)
 
-    def quick_optimize(self, content: str, user_karma: int = 1000, user_followers: int = 100) -> Dict:
+    def quick_optimize(self, content: str, user_karma: int = 1000, user_followers: int = 100,
+                       mode: str = None, session_id: str = None) -> Dict:
         """Quick content optimization with minimal input"""
 
         user_profile = {
@@ -355,7 +826,9 @@ class GeminiXGBoostOptimizer:
         return self.agent.optimize_content_with_gemini(
             content=content,
             user_profile=user_profile,
-            optimization_goals=["engagement", "authenticity", "discussion"]
+            optimization_goals=["engagement", "authenticity", "discussion"],
+            mode=mode,
+            session_id=session_id
         )
 
     def smart_caption_generation(self, prompt: str, engagement_target: str = "medium") -> Dict:
@@ -373,10 +846,94 @@ class GeminiXGBoostOptimizer:
             context=context
         )
 
-    def predict_and_optimize(self, content: str, user_data: Dict) -> Dict:
+    def smart_caption_stream(self, prompt: str, engagement_target: str = "medium") -> Iterator[Tuple[str, Dict]]:
+        """Streaming variant of smart_caption_generation"""
+
+        context = {
+            "engagement_target": engagement_target,
+            "platform_best_practices": "reddit_discussion_focused",
+            "optimization_level": "high"
+        }
+
+        return self.agent.stream_caption_with_context(
+            prompt=prompt,
+            platform="reddit",
+            context=context
+        )
+
+    def predict_and_optimize(self, content: str, user_data: Dict, mode: str = None,
+                             session_id: str = None) -> Dict:
         """Complete pipeline: predict current performance, then optimize"""
 
-        return self.agent.comprehensive_analysis(content, user_data)
+        return self.agent.comprehensive_analysis(content, user_data, mode=mode, session_id=session_id)
+
+
+class AgentPool:
+    """
+    Fixed set of long-lived optimizers sharing one Gemini client
+
+    The Gemini client is safe to share. A request checks an optimizer out
+    for its duration, which also bounds concurrent Gemini calls per worker;
+    conversation history is kept per session, not per agent.
+    """
+
+    def __init__(self, google_api_key: str = None, size: int = AGENT_POOL_SIZE):
+        self.google_api_key = google_api_key or os.getenv('GOOGLE_API_KEY')
+        if not self.google_api_key:
+            raise ValueError(
+                "Google API key is required. Set GOOGLE_API_KEY environment variable.")
+
+        self.size = max(1, size)
+        self.llm = create_gemini_llm(self.google_api_key)
+        self._idle = queue.Queue()
+        for _ in range(self.size):
+            agent = SimFluenceLangChainAgent(self.google_api_key, llm=self.llm)
+            self._idle.put(GeminiXGBoostOptimizer(agent=agent))
+
+    @contextmanager
+    def acquire(self, timeout: float = AGENT_POOL_TIMEOUT):
+        """Check out an optimizer, waiting up to `timeout` seconds for a free one"""
+        try:
+            optimizer = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"No Gemini agent became available within {timeout}s")
+        try:
+            yield optimizer
+        finally:
+            self._idle.put(optimizer)
+
+    def stats(self) -> Dict:
+        idle = self._idle.qsize()
+        return {"size": self.size, "idle": idle, "in_use": self.size - idle}
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_agent_pool() -> AgentPool:
+    """
+    Process-wide agent pool, created on first use
+
+    Re-created after a fork: the Gemini client's gRPC channel must not be
+    shared between gunicorn workers.
+    """
+    global _pool, _pool_pid
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                _pool = AgentPool()
+                _pool_pid = os.getpid()
+    return _pool
+
+
+def get_agent_pool_stats() -> Optional[Dict]:
+    """Pool occupancy, or None if this process has not created it yet"""
+    if _pool is None or _pool_pid != os.getpid():
+        return None
+    return _pool.stats()
 
 # Example usage functions
 
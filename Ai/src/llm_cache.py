@@ -0,0 +1,235 @@
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "memory")  # memory, disk or none
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", 3600))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 1024))
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", os.path.join("data", "cache", "llm"))
+
+
+class MemoryBackend:
+    """In-process LRU store of (expires_at, value) entries"""
+
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.max_entries = max(1, max_entries)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            # Callers get their own copy, so they cannot mutate the cached value
+            return copy.deepcopy(entry[1])
+
+    def set(self, key: str, value, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskBackend:
+    """
+    One JSON file per entry, so the cache survives restarts and is shared by
+    every gunicorn worker. Writes go through a temp file and os.replace.
+    """
+
+    PRUNE_EVERY = 100
+
+    def __init__(self, directory: str = LLM_CACHE_DIR, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max(1, max_entries)
+        self._writes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("expires_at", 0) <= time.time():
+            self._remove(path)
+            return None
+        # Touch the file so pruning evicts the least recently used entries
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get("value")
+
+    def set(self, key: str, value, ttl: float):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"expires_at": time.time() + ttl, "value": value}, f, default=str)
+        os.replace(tmp_path, path)
+
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(self):
+        """Drop expired entries, then the least recently used beyond max_entries"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+
+        now = time.time()
+        live = []
+        for mtime, path in entries:
+            try:
+                with open(path) as f:
+                    expired = json.load(f).get("expires_at", 0) <= now
+            except (OSError, ValueError):
+                expired = True
+            if expired:
+                self._remove(path)
+            else:
+                live.append((mtime, path))
+
+        live.sort()
+        for _, path in live[:max(0, len(live) - self.max_entries)]:
+            self._remove(path)
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                self._remove(os.path.join(self.directory, name))
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def __len__(self):
+        return sum(1 for name in os.listdir(self.directory) if name.endswith(".json"))
+
+
+class LLMResponseCache:
+    """
+    Response cache for LLM calls keyed on the prompt template and its inputs
+
+    Templates are whitespace-normalized and inputs serialized with sorted
+    keys, so re-indenting a prompt or reordering a context dict still hits.
+    """
+
+    def __init__(self, backend=None, ttl: float = LLM_CACHE_TTL):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(namespace: str, template: str, inputs: Dict) -> str:
+        normalized_template = " ".join(template.split())
+        normalized_inputs = {
+            name: value.strip() if isinstance(value, str) else value
+            for name, value in inputs.items()
+        }
+        payload = json.dumps([namespace, normalized_template, normalized_inputs],
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, namespace: str, template: str, inputs: Dict):
+        value = self.backend.get(self.make_key(namespace, template, inputs))
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, namespace: str, template: str, inputs: Dict, value):
+        self.backend.set(self.make_key(namespace, template, inputs), value, self.ttl)
+
+    def get_or_compute(self, namespace: str, template: str, inputs: Dict,
+                       compute: Callable[[], Any],
+                       should_cache: Callable[[Any], bool] = lambda value: True):
+        """
+        Return the cached response, or call `compute` and cache its result
+        when `should_cache` accepts it (e.g. only successful responses)
+        """
+        cached = self.get(namespace, template, inputs)
+        if cached is not None:
+            return cached
+        value = compute()
+        if value is not None and should_cache(value):
+            self.set(namespace, template, inputs, value)
+        return value
+
+    def clear(self):
+        self.backend.clear()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "ttl_seconds": self.ttl,
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+def create_llm_cache(backend: str = LLM_CACHE_BACKEND) -> Optional[LLMResponseCache]:
+    """Build the cache selected by LLM_CACHE_BACKEND, or None when disabled"""
+    if backend == "none":
+        return None
+    if backend == "disk":
+        return LLMResponseCache(DiskBackend())
+    if backend == "memory":
+        return LLMResponseCache(MemoryBackend())
+    raise ValueError(f"Unknown LLM cache backend '{backend}' (expected memory, disk or none)")
+
+
+_cache = None
+_cache_created = False
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Process-wide response cache, created on first use"""
+    global _cache, _cache_created
+    if not _cache_created:
+        with _cache_lock:
+            if not _cache_created:
+                _cache = create_llm_cache()
+                _cache_created = True
+    return _cache
@@ -0,0 +1,347 @@
+import json
+import math
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Latency buckets (seconds) from sub-millisecond model predicts up to slow LLM calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+                   0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Shared directory for per-worker value files; unset means single-process metrics
+METRICS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
+# How often each worker writes its values there (seconds)
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", 5))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: Tuple) -> Dict:
+        return dict(zip(self.labelnames, key))
+
+    def family(self) -> Dict:
+        """Current values as a family: name, type, help and (sample name, labels, value) samples"""
+        with self._lock:
+            items = sorted(self._values.items())
+        samples = []
+        for key, value in items:
+            samples.extend(self._samples(key, value))
+        return {"name": self.name, "type": self.kind, "help": self.documentation, "samples": samples}
+
+    def render(self) -> List[str]:
+        return render_family(self.family())
+
+    def _samples(self, key: Tuple, value) -> List:
+        return [(self.name, self._labels(key), value)]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry["counts"][i] += 1
+                    break
+            entry["sum"] += value
+            entry["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the with-block (also when it raises)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self, key: Tuple, entry) -> List:
+        labels = self._labels(key)
+        samples = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, entry["counts"]):
+            cumulative += count
+            samples.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+        samples.append((f"{self.name}_bucket", {**labels, "le": "+Inf"}, entry["count"]))
+        samples.append((f"{self.name}_sum", labels, entry["sum"]))
+        samples.append((f"{self.name}_count", labels, entry["count"]))
+        return samples
+
+
+def render_family(family: Dict) -> List[str]:
+    lines = [f"# HELP {family['name']} {family['help']}", f"# TYPE {family['name']} {family['type']}"]
+    for sample_name, labels, value in family["samples"]:
+        lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+    return lines
+
+
+def merge_families(snapshots: List[Tuple[str, List[Dict]]]) -> List[Dict]:
+    """
+    Combine per-process families into one set
+
+    Counters and histograms are summed across processes. Gauges describe a
+    single process, so each keeps its samples under a pid label.
+
+    Args:
+        snapshots: (pid, families) per process
+    """
+    merged: Dict[str, Dict] = {}
+    for pid, families in snapshots:
+        for family in families:
+            target = merged.setdefault(family["name"], {
+                "name": family["name"], "type": family["type"], "help": family["help"], "values": {}})
+            for sample_name, labels, value in family["samples"]:
+                if family["type"] == "gauge":
+                    labels = {**labels, "pid": pid}
+                key = (sample_name, tuple(labels.items()))
+                target["values"][key] = target["values"].get(key, 0) + value
+    return [
+        {"name": family["name"], "type": family["type"], "help": family["help"],
+         "samples": [(sample_name, dict(labels), value)
+                     for (sample_name, labels), value in family["values"].items()]}
+        for family in merged.values()
+    ]
+
+
+class MetricsRegistry:
+    """
+    Process-wide metrics rendered in the Prometheus text exposition format
+
+    Counters, gauges and histograms are updated as requests run. Values
+    that already live elsewhere (cache hit counts, pool occupancy) are read
+    at scrape time by collectors: callables yielding
+    (name, type, help, [(labels, value), ...]).
+
+    With a multiprocess directory (PROMETHEUS_MULTIPROC_DIR, set by the
+    gunicorn config) every worker writes its values to a per-pid file there,
+    periodically and whenever it serves a scrape, and render() merges the
+    files of all workers, so a scrape reports the whole server whichever
+    worker answers it. Values of exited workers are folded into an archive
+    file (see mark_process_dead) so counters never go backwards.
+    """
+
+    def __init__(self, multiprocess_dir: str = None):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable]] = []
+        self._lock = threading.Lock()
+        self.multiprocess_dir = multiprocess_dir
+        self._flusher_pid = None
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable]):
+        self._collectors.append(collector)
+
+    def collect(self) -> List[Dict]:
+        """Families of this process: registered metrics, then collector output"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        families = [metric.family() for metric in metrics]
+
+        for collector in self._collectors:
+            try:
+                collected = list(collector())
+            except Exception as e:
+                print(f"⚠️ Metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+                continue
+            for name, kind, documentation, samples in collected:
+                families.append({"name": name, "type": kind, "help": documentation,
+                                 "samples": [(name, labels, value) for labels, value in samples]})
+        return families
+
+    def render(self) -> str:
+        if self.multiprocess_dir:
+            self.write_snapshot()
+            families = merge_families(self._read_snapshots())
+        else:
+            families = self.collect()
+        lines = []
+        for family in families:
+            lines.extend(render_family(family))
+        return "\n".join(lines) + "\n"
+
+    # Multiprocess mode
+
+    def _snapshot_path(self, pid) -> str:
+        return os.path.join(self.multiprocess_dir, f"metrics_{pid}.json")
+
+    def write_snapshot(self):
+        """Write this process's current values to its file in the multiprocess directory"""
+        os.makedirs(self.multiprocess_dir, exist_ok=True)
+        _write_json(self._snapshot_path(os.getpid()), self.collect())
+
+    def _read_snapshots(self) -> List[Tuple[str, List[Dict]]]:
+        snapshots = []
+        for name in sorted(os.listdir(self.multiprocess_dir)):
+            match = re.fullmatch(r"metrics_(\w+)\.json", name)
+            if not match:
+                continue
+            try:
+                with open(os.path.join(self.multiprocess_dir, name)) as f:
+                    snapshots.append((match.group(1), json.load(f)))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    def start_flusher(self, interval: float = METRICS_FLUSH_INTERVAL):
+        """Write snapshots every `interval` seconds from a daemon thread (once per process)"""
+        if not self.multiprocess_dir or self._flusher_pid == os.getpid():
+            return
+        self._flusher_pid = os.getpid()
+
+        def flush():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.write_snapshot()
+                except OSError as e:
+                    print(f"⚠️ Could not write metrics snapshot: {e}")
+
+        threading.Thread(target=flush, name="metrics-flusher", daemon=True).start()
+
+
+def _write_json(path: str, value):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(value, f)
+    os.replace(tmp_path, path)
+
+
+def prepare_multiprocess_dir(directory: str = None):
+    """Create an empty multiprocess directory (call in the server master before workers start)"""
+    directory = directory or METRICS_MULTIPROC_DIR
+    if not directory:
+        return
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        if name.endswith(".json") or name.endswith(".tmp"):
+            os.remove(os.path.join(directory, name))
+
+
+def mark_process_dead(pid: int, directory: str = None):
+    """
+    Fold an exited worker's counters and histograms into the archive
+    snapshot and drop its file (its gauges no longer describe a live process).
+    Called from gunicorn's child_exit hook in the master.
+    """
+    directory = directory or METRICS_MULTIPROC_DIR
+    if not directory:
+        return
+    path = os.path.join(directory, f"metrics_{pid}.json")
+    archive_path = os.path.join(directory, "metrics_archive.json")
+    try:
+        with open(path) as f:
+            families = json.load(f)
+    except (OSError, ValueError):
+        return
+    try:
+        with open(archive_path) as f:
+            archived = json.load(f)
+    except (OSError, ValueError):
+        archived = []
+
+    kept = [family for family in families if family["type"] != "gauge"]
+    _write_json(archive_path, merge_families([("archive", archived), ("dead", kept)]))
+    os.remove(path)
+
+
+# Shared by the API and the modules it instruments
+metrics = MetricsRegistry(METRICS_MULTIPROC_DIR)
+
+MODEL_PREDICT_SECONDS = metrics.histogram(
+    "simfluence_model_predict_duration_seconds",
+    "Time spent in model.predict, per model", ["model"])
+FEATURE_TRANSFORM_SECONDS = metrics.histogram(
+    "simfluence_feature_transform_duration_seconds",
+    "Time spent turning request inputs into model features, per step", ["step"])
+LLM_CALL_SECONDS = metrics.histogram(
+    "simfluence_llm_call_duration_seconds",
+    "Duration of LLM calls, per model and outcome", ["model", "outcome"])
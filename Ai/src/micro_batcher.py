@@ -0,0 +1,144 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Sequence
+
+PREDICT_BATCH_SIZE = int(os.getenv("PREDICT_BATCH_SIZE", 32))
+PREDICT_BATCH_WAIT_MS = float(os.getenv("PREDICT_BATCH_WAIT_MS", 2))
+
+
+class MicroBatcher:
+    """
+    Dynamic batching for single-row model predictions
+
+    Concurrent request threads submit one input each and block on a Future.
+    A background thread collects them and runs one batched predict when
+    max_batch_size are queued or max_wait_ms has passed since the first
+    one arrived, then hands every caller its own row of the output. If the
+    batched predict raises, its rows are retried one at a time so a
+    malformed input only fails its own request.
+
+    A batch size of 1 or a wait of 0 disables batching: calls then predict
+    directly on the caller's thread.
+    """
+
+    def __init__(self, name: str,
+                 predict_batch: Callable[[List], Sequence],
+                 max_batch_size: int = PREDICT_BATCH_SIZE,
+                 max_wait_ms: float = PREDICT_BATCH_WAIT_MS):
+        self.name = name
+        self.predict_batch = predict_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._queue = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._reset_stats()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_batch_size > 1 and self.max_wait > 0
+
+    def _reset_stats(self):
+        self.batches = 0
+        self.items = 0
+        self.errors = 0
+        self.isolated_retries = 0
+        self.flushes = {"full": 0, "deadline": 0}
+        self.batch_sizes: Dict[int, int] = {}
+        self.queue_wait_seconds = 0.0
+        self.predict_seconds = 0.0
+
+    def predict(self, item) -> Any:
+        """Predict one input, sharing a batched predict with concurrent callers"""
+        if not self.enabled:
+            return self.predict_batch([item])[0]
+        future = Future()
+        self._get_queue().put((item, future, time.perf_counter()))
+        return future.result()
+
+    def _get_queue(self) -> queue.Queue:
+        # The collector thread does not survive a fork, so each process starts its own
+        if self._queue is None or self._pid != os.getpid():
+            with self._lock:
+                if self._queue is None or self._pid != os.getpid():
+                    self._queue = queue.Queue()
+                    self._pid = os.getpid()
+                    threading.Thread(target=self._run, args=(self._queue,),
+                                     name=f"{self.name}-batcher", daemon=True).start()
+        return self._queue
+
+    def _run(self, pending: queue.Queue):
+        while True:
+            first = pending.get()
+            batch = [first]
+            deadline = first[2] + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(pending.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._flush(batch, "full" if len(batch) >= self.max_batch_size else "deadline")
+
+    def _flush(self, batch: List, reason: str):
+        start = time.perf_counter()
+        try:
+            outputs = self.predict_batch([item for item, _, _ in batch])
+        except Exception as e:
+            with self._stats_lock:
+                self.errors += 1
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+            else:
+                self._predict_one_by_one(batch)
+            return
+        predict_seconds = time.perf_counter() - start
+
+        for (_, future, _), output in zip(batch, outputs):
+            future.set_result(output)
+
+        with self._stats_lock:
+            self.batches += 1
+            self.items += len(batch)
+            self.flushes[reason] += 1
+            self.batch_sizes[len(batch)] = self.batch_sizes.get(len(batch), 0) + 1
+            self.queue_wait_seconds += sum(start - queued_at for _, _, queued_at in batch)
+            self.predict_seconds += predict_seconds
+
+    def _predict_one_by_one(self, batch: List):
+        """
+        Retry a failed batch row by row, so one malformed input only fails
+        its own request instead of every request it was batched with
+        """
+        with self._stats_lock:
+            self.isolated_retries += 1
+        for item, future, _ in batch:
+            try:
+                future.set_result(self.predict_batch([item])[0])
+            except Exception as e:
+                future.set_exception(e)
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            return {
+                "enabled": self.enabled,
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "batches": self.batches,
+                "items": self.items,
+                "errors": self.errors,
+                "isolated_retries": self.isolated_retries,
+                "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+                "flushes": dict(self.flushes),
+                "batch_sizes": dict(sorted(self.batch_sizes.items())),
+                "queue_wait_seconds_total": self.queue_wait_seconds,
+                "predict_seconds_total": self.predict_seconds,
+                "avg_queue_wait_ms": round(self.queue_wait_seconds / self.items * 1000, 3) if self.items else 0.0,
+                "avg_predict_ms": round(self.predict_seconds / self.batches * 1000, 3) if self.batches else 0.0,
+            }
@@ -0,0 +1,147 @@
+import os
+import pickle
+import threading
+import time
+from typing import Dict, List, Optional
+
+import joblib
+
+MODELS_DIR = os.getenv("MODELS_DIR", "models")
+
+
+class ModelRegistry:
+    """
+    Process-wide registry for serialized predictors
+    Each artifact is deserialized once (at startup or on first use) and then
+    served from memory behind a thread-safe accessor
+    """
+
+    def __init__(self, models_dir: str = MODELS_DIR):
+        self.models_dir = models_dir
+        self._paths = {}
+        self._entries = {}
+        # Whether each artifact is on disk, checked once rather than per prediction
+        self._on_disk = {}
+        self._lock = threading.Lock()
+        self._load_locks = {}
+
+    def register(self, name: str, filename: str):
+        """Register an artifact under a short name without loading it"""
+        with self._lock:
+            self._paths[name] = os.path.join(self.models_dir, filename)
+            self._on_disk.pop(name, None)
+            self._load_locks.setdefault(name, threading.Lock())
+
+    def get(self, name: str) -> Dict:
+        """
+        Return the loaded payload for a registered model, loading it on first use
+        """
+        entry = self._entries.get(name)
+        if entry is not None:
+            return entry["payload"]
+
+        if name not in self._paths:
+            raise KeyError(f"Model '{name}' is not registered")
+
+        # Only one thread deserializes a given artifact; the rest wait for it
+        with self._load_locks[name]:
+            entry = self._entries.get(name)
+            if entry is None:
+                entry = self._load(name)
+                self._entries[name] = entry
+        return entry["payload"]
+
+    def _load(self, name: str) -> Dict:
+        path = self._paths[name]
+        print(f"📦 Loading {name} model from {path}...")
+        start = time.perf_counter()
+        payload = joblib.load(path)
+        load_seconds = time.perf_counter() - start
+
+        return {
+            "payload": payload,
+            "path": path,
+            "loaded_at": time.time(),
+            "load_time_ms": round(load_seconds * 1000, 2),
+            "file_size_bytes": os.path.getsize(path),
+            "memory_bytes": estimate_memory_bytes(payload),
+        }
+
+    def preload(self, names: Optional[List[str]] = None) -> Dict:
+        """Load every registered model (or the given subset) up front"""
+        errors = {}
+        for name in names or list(self._paths):
+            try:
+                self.get(name)
+            except Exception as e:
+                errors[name] = str(e)
+        return errors
+
+    def evict(self, name: str = None):
+        """Drop one (or every) loaded model so the next access reloads it"""
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+                self._on_disk.clear()
+            else:
+                self._entries.pop(name, None)
+                self._on_disk.pop(name, None)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._entries
+
+    def exists(self, name: str) -> bool:
+        """
+        Whether a registered model is loaded or its artifact is on disk
+
+        The disk check runs once per name and is cached until evict(), so an
+        artifact written later (e.g. by retraining) is seen after an evict.
+        """
+        if name in self._entries:
+            return True
+        if name not in self._paths:
+            return False
+        on_disk = self._on_disk.get(name)
+        if on_disk is None:
+            on_disk = os.path.exists(self._paths[name])
+            self._on_disk[name] = on_disk
+        return on_disk
+
+    def stats(self) -> Dict:
+        """Load time and memory footprint for every registered model"""
+        stats = {}
+        for name, path in self._paths.items():
+            entry = self._entries.get(name)
+            if entry is None:
+                stats[name] = {"loaded": False, "path": path}
+                continue
+            stats[name] = {
+                "loaded": True,
+                "path": entry["path"],
+                "loaded_at": entry["loaded_at"],
+                "load_time_ms": entry["load_time_ms"],
+                "file_size_bytes": entry["file_size_bytes"],
+                "memory_bytes": entry["memory_bytes"],
+            }
+        return stats
+
+
+def estimate_memory_bytes(payload) -> int:
+    """Approximate in-memory size of a loaded model payload"""
+    model = payload.get("model") if isinstance(payload, dict) else payload
+
+    # XGBoost keeps its trees in native memory, so measure the raw booster
+    if hasattr(model, "get_booster"):
+        try:
+            return len(model.get_booster().save_raw())
+        except Exception:
+            pass
+
+    try:
+        return len(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+
+# Shared instance used by predict.py and the API
+registry = ModelRegistry()
@@ -1,64 +1,135 @@
-import joblib
-import pandas as pd
-import os
-
-MODEL_PATH = os.path.join("models", "likes_predictor.pkl")
+import numpy as np
+from model_registry import registry
+from feature_encoder import get_encoder
+from micro_batcher import MicroBatcher
+from metrics import MODEL_PREDICT_SECONDS, FEATURE_TRANSFORM_SECONDS
+
+# Engagement predictors are deserialized once per process and shared
+registry.register("likes", "likes_predictor.pkl")
+registry.register("comments", "comments_predictor.pkl")
+registry.register("shares", "shares_predictor.pkl")
+# Optional bundled likes/comments/shares model (train_model.py --multi-output)
+registry.register("engagement", "engagement_predictor.pkl")
 
 def load_model():
-    print("📦 Loading model...")
-    model_data = joblib.load(MODEL_PATH)
+    model_data = registry.get("likes")
     return model_data["model"], model_data["features"]
 
 def predict_likes(new_input: dict):
-    model, feature_columns = load_model()
-
-    # Create dataframe with expected feature columns
-    input_df = pd.DataFrame([new_input])
-
-    # Ensure all feature columns exist
-    for col in feature_columns:
-        if col not in input_df.columns:
-            input_df[col] = 0  # fill missing with 0
-
-    input_df = input_df[feature_columns]  # reorder to match training
-
-    # Predict
-    prediction = model.predict(input_df)
-    return prediction[0]
+    return likes_batcher.predict(new_input)
 
 def predict_comments(new_input: dict):
-    model, feature_columns = load_comments_model()
-
-    # Create dataframe with expected feature columns
-    input_df = pd.DataFrame([new_input])
-
-    # Ensure all feature columns exist
-    for col in feature_columns:
-        if col not in input_df.columns:
-            input_df[col] = 0  # fill missing with 0
-
-    input_df = input_df[feature_columns]  # reorder to match training
-
-    # Predict
-    prediction = model.predict(input_df)
-    return prediction[0]
+    return comments_batcher.predict(new_input)
 
 def predict_shares(new_input: dict):
-    model, feature_columns = load_shares_model()
-
-    # Create dataframe with expected feature columns
-    input_df = pd.DataFrame([new_input])
+    return shares_batcher.predict(new_input)
+
+def build_feature_matrix(inputs: list, feature_columns: list, raw: bool = False) -> np.ndarray:
+    """
+    Build a float32 feature matrix in training column order
+
+    Args:
+        inputs: Transformed feature dicts, or raw user-facing inputs if raw=True
+        feature_columns: Saved feature column list of the model
+        raw: Encode raw inputs directly (skips transform_input_features)
+    """
+    encoder = get_encoder(feature_columns)
+    if raw:
+        with FEATURE_TRANSFORM_SECONDS.time(step="encode_raw"):
+            return encoder.encode(inputs)
+    with FEATURE_TRANSFORM_SECONDS.time(step="encode_transformed"):
+        return encoder.encode_transformed(inputs)
+
+def run_model(name: str, model, matrix: np.ndarray):
+    """model.predict, timed into the per-model predict histogram"""
+    with MODEL_PREDICT_SECONDS.time(model=name):
+        return model.predict(matrix)
+
+def predict_likes_batch(inputs: list, raw: bool = False):
+    model, feature_columns = load_model()
+    return run_model("likes", model, build_feature_matrix(inputs, feature_columns, raw))
 
-    # Ensure all feature columns exist
-    for col in feature_columns:
-        if col not in input_df.columns:
-            input_df[col] = 0  # fill missing with 0
+def predict_comments_batch(inputs: list, raw: bool = False):
+    model, feature_columns = load_comments_model()
+    return run_model("comments", model, build_feature_matrix(inputs, feature_columns, raw))
 
-    input_df = input_df[feature_columns]  # reorder to match training
+def predict_shares_batch(inputs: list, raw: bool = False):
+    model, feature_columns = load_shares_model()
+    return run_model("shares", model, build_feature_matrix(inputs, feature_columns, raw))
+
+def predict_batch(inputs: list, raw: bool = False) -> list:
+    """
+    Predict likes, comments and shares for many inputs at once
+
+    Uses the bundled multi-output model when it has been trained; otherwise
+    builds the feature matrix once per distinct feature layout and runs
+    each single-target model a single time over the whole batch.
+
+    Args:
+        inputs: Transformed feature dicts, or raw user-facing inputs if raw=True
+        raw: Encode raw inputs directly with the compiled feature encoder
+
+    Returns:
+        List of dicts (one per input, in order) with raw float predictions
+    """
+    if not inputs:
+        return []
+
+    if has_engagement_model():
+        # One feature build and one predict call for all three targets
+        model, feature_columns, targets = load_engagement_model()
+        output = run_model("engagement", model, build_feature_matrix(inputs, feature_columns, raw))
+        return [
+            {target: float(row[j]) for j, target in enumerate(targets)}
+            for row in output
+        ]
+
+    models = {
+        "likes": load_model(),
+        "comments": load_comments_model(),
+        "shares": load_shares_model(),
+    }
 
-    # Predict
-    prediction = model.predict(input_df)
-    return prediction[0]
+    matrices = {}
+    predictions = {}
+    for target, (model, feature_columns) in models.items():
+        key = tuple(feature_columns)
+        if key not in matrices:
+            matrices[key] = build_feature_matrix(inputs, feature_columns, raw)
+        predictions[target] = run_model(target, model, matrices[key])
+
+    return [
+        {
+            "likes": float(predictions["likes"][i]),
+            "comments": float(predictions["comments"][i]),
+            "shares": float(predictions["shares"][i]),
+        }
+        for i in range(len(inputs))
+    ]
+
+# Concurrent single-row predictions (transformed feature dicts) share one
+# matrix predict; see PREDICT_BATCH_SIZE and PREDICT_BATCH_WAIT_MS
+likes_batcher = MicroBatcher("likes", predict_likes_batch)
+comments_batcher = MicroBatcher("comments", predict_comments_batch)
+shares_batcher = MicroBatcher("shares", predict_shares_batch)
+# Raw inputs for all three targets, as served by /predict/engagement and /optimize/post
+engagement_batcher = MicroBatcher("engagement", lambda inputs: predict_batch(inputs, raw=True))
+
+def get_batching_stats():
+    """Batch sizes, flush reasons and queue wait of each micro-batcher"""
+    return {batcher.name: batcher.stats()
+            for batcher in (likes_batcher, comments_batcher, shares_batcher, engagement_batcher)}
+
+def predict_all(new_input: dict, raw: bool = False) -> dict:
+    """
+    Predict likes, comments and shares for a single input in one pass
+
+    Raw inputs are micro-batched with concurrent requests: one feature
+    build and one predict per model (or one for the bundled model) per batch.
+    """
+    if raw:
+        return engagement_batcher.predict(new_input)
+    return predict_batch([new_input], raw)[0]
 
 def predict_engagement_category(predicted_likes):
     if predicted_likes < 10:
@@ -71,15 +142,32 @@ def predict_engagement_category(predicted_likes):
         return "viral"
 
 def load_comments_model():
-    print("📦 Loading comments model...")
-    model_data = joblib.load(os.path.join("models", "comments_predictor.pkl"))
+    model_data = registry.get("comments")
     return model_data["model"], model_data["features"]
 
 def load_shares_model():
-    print("📦 Loading shares model...")
-    model_data = joblib.load(os.path.join("models", "shares_predictor.pkl"))
+    model_data = registry.get("shares")
     return model_data["model"], model_data["features"]
 
+def load_engagement_model():
+    model_data = registry.get("engagement")
+    return model_data["model"], model_data["features"], model_data["targets"]
+
+def has_engagement_model() -> bool:
+    """Whether the bundled multi-output engagement model is available"""
+    return registry.exists("engagement")
+
+def preload_models():
+    """Load all engagement predictors up front (call once at startup)"""
+    names = ["likes", "comments", "shares"]
+    if has_engagement_model():
+        names.append("engagement")
+    return registry.preload(names)
+
+def get_model_stats():
+    """Load time and memory footprint of each engagement predictor"""
+    return registry.stats()
+
 if __name__ == "__main__":
     # 🧪 Example input (must match feature format used in training)
     example_input = {
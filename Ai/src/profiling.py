@@ -0,0 +1,252 @@
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Dict, List, Tuple
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() in ("1", "true", "yes")
+PROFILE_SAMPLE_PERCENT = float(os.getenv("PROFILE_SAMPLE_PERCENT", 0))
+PROFILE_HEADER = os.getenv("PROFILE_HEADER", "X-Profile")
+# When set, the header must carry this value to trigger a profile
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILER = os.getenv("PROFILER", "sampling")  # sampling or tracing
+PROFILE_FORMAT = os.getenv("PROFILE_FORMAT", "speedscope")  # speedscope or collapsed
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", 1))
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join("data", "profiles"))
+
+PROFILERS = ("sampling", "tracing")
+PROFILE_FORMATS = ("speedscope", "collapsed")
+
+# A frame is (function, file, first line); a stack runs from the outermost frame inwards
+Frame = Tuple[str, str, int]
+Stack = Tuple[Frame, ...]
+
+
+def _frame_key(code) -> Frame:
+    return (code.co_qualname if hasattr(code, "co_qualname") else code.co_name,
+            code.co_filename, code.co_firstlineno)
+
+
+def _thread_frame(name: str) -> Frame:
+    """Root of every stack: the thread it was recorded on"""
+    return (f"thread {name}", "<thread>", 0)
+
+
+def _frame_chain(frame) -> List[Frame]:
+    """Keys of a frame and its callers, outermost first"""
+    chain = []
+    while frame is not None:
+        chain.append(_frame_key(frame.f_code))
+        frame = frame.f_back
+    return list(reversed(chain))
+
+
+# Modules whose frames mean a thread is blocked waiting for work
+_WAIT_MODULES = (os.sep + "threading.py", os.sep + "queue.py")
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler for a request and the threads working for it
+
+    A background thread captures the stacks of every thread each interval,
+    so work handed to the stage executor or a micro-batcher shows up next
+    to the request thread's own frames (each stack starts with its thread's
+    name). Other threads are skipped while they sit idle in a queue or lock
+    wait; threads serving concurrent requests are included. The profiled
+    threads run untouched, so overhead stays low and roughly constant
+    however many calls the request makes. Each stack is weighted by the wall
+    time (microseconds) since the previous sample.
+    """
+
+    def __init__(self, thread_id: int = None, interval_ms: float = PROFILE_INTERVAL_MS,
+                 all_threads: bool = True):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = max(0.0001, interval_ms / 1000)
+        self.all_threads = all_threads
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            now = time.perf_counter()
+            if self.thread_id not in frames:
+                return
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in frames.items():
+                if thread_id == own_id or (thread_id != self.thread_id and not self.all_threads):
+                    continue
+                if thread_id != self.thread_id and frame.f_code.co_filename.endswith(_WAIT_MODULES):
+                    continue
+                stack = [_thread_frame(names.get(thread_id, str(thread_id)))] + _frame_chain(frame)
+                self.stacks[tuple(stack)] += (now - last) * 1e6
+            last = now
+
+    def stop(self) -> Dict[Stack, float]:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return dict(self.stacks)
+
+
+class TracingProfiler:
+    """
+    Deterministic profiler (sys.setprofile) for a request and its worker threads
+
+    Every Python and C call is recorded, so stacks and self times are exact,
+    at the price of slowing the profiled request down noticeably. Time spent
+    in the profiler's own callback is left out of the weights. Each thread
+    keeps its own stack, rooted at the thread's name.
+
+    On Python 3.12+ the profile function is installed on every running
+    thread, so existing executor and micro-batcher threads are traced. On
+    older versions only the calling thread and threads started during the
+    profile are traced.
+    """
+
+    def __init__(self, all_threads: bool = True):
+        self.all_threads = all_threads
+        self.stacks: Counter = Counter()
+        self._threads: Dict[int, Dict] = {}
+        self._active = False
+
+    def start(self):
+        self._active = True
+        if self.all_threads and hasattr(threading, "setprofile_all_threads"):
+            threading.setprofile_all_threads(self._trace)
+        else:
+            if self.all_threads:
+                threading.setprofile(self._trace)
+            sys.setprofile(self._trace)
+
+    def _trace(self, frame, event, arg):
+        now = time.perf_counter()
+        if not self._active:
+            # A thread started while profiling keeps the hook after stop()
+            sys.setprofile(None)
+            return
+        state = self._threads.get(threading.get_ident())
+        if state is None:
+            # First event on this thread: frames already running form the root of its stacks
+            root = [_thread_frame(threading.current_thread().name)]
+            state = {"stack": root + _frame_chain(frame if event != "call" else frame.f_back),
+                     "stacks": Counter(), "last": now}
+            self._threads[threading.get_ident()] = state
+            if event in ("c_return", "c_exception"):
+                # The C function was called before profiling started; nothing to pop
+                state["last"] = time.perf_counter()
+                return
+
+        stack = state["stack"]
+        if len(stack) > 1:
+            state["stacks"][tuple(stack)] += (now - state["last"]) * 1e6
+        if event == "call":
+            stack.append(_frame_key(frame.f_code))
+        elif event == "c_call":
+            stack.append((getattr(arg, "__qualname__", getattr(arg, "__name__", str(arg))),
+                          "<built-in>", 0))
+        elif event in ("return", "c_return", "c_exception") and len(stack) > 1:
+            stack.pop()
+        state["last"] = time.perf_counter()
+
+    def stop(self) -> Dict[Stack, float]:
+        self._active = False
+        if self.all_threads and hasattr(threading, "setprofile_all_threads"):
+            threading.setprofile_all_threads(None)
+        else:
+            threading.setprofile(None)
+            sys.setprofile(None)
+        for state in list(self._threads.values()):
+            self.stacks.update(state["stacks"])
+        return dict(self.stacks)
+
+
+def create_profiler(kind: str = PROFILER, interval_ms: float = PROFILE_INTERVAL_MS):
+    if kind == "sampling":
+        return SamplingProfiler(interval_ms=interval_ms)
+    if kind == "tracing":
+        return TracingProfiler()
+    raise ValueError(f"Unknown profiler '{kind}' (expected one of {', '.join(PROFILERS)})")
+
+
+def _frame_label(frame: Frame) -> str:
+    name, filename, line = frame
+    if filename in ("<built-in>", "<thread>"):
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def to_collapsed(stacks: Dict[Stack, float]) -> str:
+    """Brendan Gregg's collapsed format: 'outer;inner;leaf <microseconds>' per line"""
+    lines = []
+    for stack, weight in sorted(stacks.items()):
+        value = int(round(weight))
+        if value > 0:
+            lines.append(";".join(_frame_label(frame).replace(";", ":") for frame in stack) + f" {value}")
+    return "\n".join(lines) + "\n"
+
+
+def to_speedscope(stacks: Dict[Stack, float], name: str) -> Dict:
+    """A sampled profile in speedscope's file format (https://www.speedscope.app)"""
+    frame_index: Dict[Frame, int] = {}
+    frames, samples, weights = [], [], []
+    for stack, weight in stacks.items():
+        if weight <= 0:
+            continue
+        indices = []
+        for frame in stack:
+            if frame not in frame_index:
+                frame_index[frame] = len(frames)
+                function, filename, line = frame
+                frames.append({"name": function, "file": filename, "line": line})
+            indices.append(frame_index[frame])
+        samples.append(indices)
+        weights.append(round(weight, 3))
+
+    total = round(sum(weights), 3)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "exporter": "simfluence-profiling",
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "sampled",
+            "name": name,
+            "unit": "microseconds",
+            "startValue": 0,
+            "endValue": total,
+            "samples": samples,
+            "weights": weights,
+        }],
+    }
+
+
+def profile_filename(method: str, path: str, fmt: str = PROFILE_FORMAT) -> str:
+    """Unique, filesystem-safe name for one request's profile"""
+    route = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_") or "root"
+    extension = "speedscope.json" if fmt == "speedscope" else "collapsed.txt"
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{uuid.uuid4().hex[:8]}-{method}-{route}.{extension}"
+
+
+def write_profile(stacks: Dict[Stack, float], path: str, name: str, fmt: str = PROFILE_FORMAT):
+    """Write stacks as a speedscope or collapsed-stack file (via a temp file)"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        if fmt == "speedscope":
+            json.dump(to_speedscope(stacks, name), f)
+        else:
+            f.write(to_collapsed(stacks))
+    os.replace(tmp_path, path)
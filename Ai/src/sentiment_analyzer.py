@@ -1,8 +1,128 @@
 from textblob import TextBlob
+import copy
+import hashlib
+import math
+import multiprocessing
+import os
 import re
-from typing import Dict, List
+import string
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional
 import numpy as np
 
+# Batch analysis: TextBlob is pure Python, so large batches are spread over processes
+SENTIMENT_WORKERS = int(os.getenv("SENTIMENT_WORKERS", os.cpu_count() or 1))
+# Start the pool's processes at boot instead of on the first large batch (off by default:
+# every server worker would otherwise spawn a pool even if batches are never requested)
+SENTIMENT_POOL_WARM = os.getenv("SENTIMENT_POOL_WARM", "false").lower() in ("1", "true", "yes")
+# Smaller batches are analyzed in-process; shipping them to workers costs more than it saves
+SENTIMENT_PARALLEL_MIN = int(os.getenv("SENTIMENT_PARALLEL_MIN", 64))
+# spawn: workers must not inherit the threads and locks of a serving process
+SENTIMENT_POOL_START_METHOD = os.getenv("SENTIMENT_POOL_START_METHOD", "spawn")
+
+# Engine used when a caller does not pick one: textblob, vader or keyword
+SENTIMENT_ENGINE = os.getenv("SENTIMENT_ENGINE", "textblob")
+# Results kept per process, keyed on engine + text hash
+SENTIMENT_CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", 10000))
+
+# Keyword lexicons: lexicon -> category -> keywords (in reporting order)
+SENTIMENT_KEYWORDS = {
+    "positive": [
+        "amazing", "awesome", "great", "love", "best", "excellent", "fantastic",
+        "wonderful", "perfect", "incredible", "outstanding", "brilliant", "good",
+        "happy", "excited", "thrilled", "delighted", "pleased", "satisfied",
+        "recommend", "impressed", "quality", "beautiful", "helpful", "useful"
+    ],
+    "negative": [
+        "terrible", "awful", "hate", "worst", "bad", "horrible", "disappointing",
+        "frustrated", "angry", "sad", "upset", "annoyed", "disgusted", "poor",
+        "useless", "waste", "broken", "problem", "issue", "fail", "wrong",
+        "difficult", "hard", "struggle", "concerned", "worried", "disappointed"
+    ],
+    "neutral": [
+        "okay", "fine", "average", "normal", "standard", "regular", "typical",
+        "basic", "simple", "plain", "ordinary", "common", "usual", "so-so"
+    ]
+}
+
+FALLBACK_KEYWORDS = {
+    "positive": ["good", "great", "love", "amazing", "awesome", "best", "excellent"],
+    "negative": ["bad", "hate", "terrible", "awful", "worst", "horrible", "disappointing"]
+}
+
+EMOTION_KEYWORDS = {
+    "joy": ["happy", "excited", "thrilled", "delighted", "cheerful", "ecstatic"],
+    "anger": ["angry", "furious", "mad", "irritated", "annoyed", "frustrated"],
+    "sadness": ["sad", "depressed", "upset", "disappointed", "gloomy", "melancholy"],
+    "fear": ["scared", "afraid", "worried", "anxious", "nervous", "terrified"],
+    "surprise": ["surprised", "amazed", "shocked", "astonished", "stunned"],
+    "disgust": ["disgusted", "revolted", "repulsed", "sick", "nauseated"]
+}
+
+
+# Punctuation that separates words; hyphens are kept so "so-so" stays one word
+WORD_SEPARATORS = str.maketrans({char: " " for char in
+                                 string.punctuation.replace("-", "") + "\u2018\u2019\u201c\u201d\u2026\u2014\u2013\u00ab\u00bb"})
+
+
+class KeywordMatcher:
+    """
+    Every keyword lexicon compiled into one word -> (lexicon, category) index
+
+    A text is tokenized once and its distinct words intersected with the
+    index, so the cost per text depends on its length rather than on the
+    size of the lexicons, and keywords only match whole words.
+    """
+
+    def __init__(self, lexicons: Dict[str, Dict[str, List[str]]]):
+        self.lexicons = lexicons
+        # keyword -> [(lexicon, category, position in category list)]
+        self._targets = {}
+        for lexicon, categories in lexicons.items():
+            for category, keywords in categories.items():
+                for rank, keyword in enumerate(keywords):
+                    self._targets.setdefault(keyword, []).append((lexicon, category, rank))
+        self._keywords = frozenset(self._targets)
+
+    @staticmethod
+    def words(text: str) -> set:
+        """Distinct lowercase words of a text"""
+        words = set(text.lower().translate(WORD_SEPARATORS).split())
+        if "-" in text:
+            # Parts of hyphenated compounds count as words too ("bad-tempered" -> "bad")
+            for word in [w for w in words if "-" in w]:
+                words.update(part for part in word.split("-") if part)
+        return words
+
+    def match(self, text: str) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Distinct keywords found in the text, per lexicon and category,
+        in the order they are listed in the lexicon
+        """
+        hits = {lexicon: {category: [] for category in categories}
+                for lexicon, categories in self.lexicons.items()}
+        touched = set()
+        for word in self.words(text) & self._keywords:
+            for lexicon, category, rank in self._targets[word]:
+                hits[lexicon][category].append(rank)
+                touched.add((lexicon, category))
+
+        # Ranks back to keywords, in lexicon order
+        for lexicon, category in touched:
+            keywords = self.lexicons[lexicon][category]
+            hits[lexicon][category] = [keywords[rank] for rank in sorted(hits[lexicon][category])]
+        return hits
+
+
+keyword_matcher = KeywordMatcher({
+    "sentiment": SENTIMENT_KEYWORDS,
+    "fallback": FALLBACK_KEYWORDS,
+    "emotion": EMOTION_KEYWORDS
+})
+
 
 def analyze_sentiment(text: str) -> Dict:
     """
@@ -59,37 +179,152 @@ def analyze_sentiment(text: str) -> Dict:
         return analyze_sentiment_fallback(text)
 
 
-def analyze_sentiment_keywords(text: str) -> Dict:
-    """Enhanced sentiment analysis using keyword detection"""
+def _warm_up_worker():
+    analyze_sentiment("Warm up the sentiment lexicons")
 
-    # Positive keywords
-    positive_keywords = [
-        "amazing", "awesome", "great", "love", "best", "excellent", "fantastic",
-        "wonderful", "perfect", "incredible", "outstanding", "brilliant", "good",
-        "happy", "excited", "thrilled", "delighted", "pleased", "satisfied",
-        "recommend", "impressed", "quality", "beautiful", "helpful", "useful"
-    ]
 
-    # Negative keywords
-    negative_keywords = [
-        "terrible", "awful", "hate", "worst", "bad", "horrible", "disappointing",
-        "frustrated", "angry", "sad", "upset", "annoyed", "disgusted", "poor",
-        "useless", "waste", "broken", "problem", "issue", "fail", "wrong",
-        "difficult", "hard", "struggle", "concerned", "worried", "disappointed"
-    ]
+def _analyze_chunk(texts: List[str], engine: str = None) -> List[Dict]:
+    analyzer = sentiment_engines.get(engine)
+    return [analyzer.analyze(text) for text in texts]
 
-    # Neutral keywords
-    neutral_keywords = [
-        "okay", "fine", "average", "normal", "standard", "regular", "typical",
-        "basic", "simple", "plain", "ordinary", "common", "usual", "so-so"
-    ]
 
-    text_lower = text.lower()
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_sentiment_pool() -> ProcessPoolExecutor:
+    """
+    Process pool for batch sentiment analysis, created on first use
+    (and re-created in each forked server worker)
+    """
+    global _pool, _pool_pid
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                _pool = ProcessPoolExecutor(
+                    max_workers=SENTIMENT_WORKERS,
+                    mp_context=multiprocessing.get_context(SENTIMENT_POOL_START_METHOD),
+                    initializer=_warm_up_worker
+                )
+                _pool_pid = os.getpid()
+    return _pool
+
+
+def warm_sentiment_pool():
+    """
+    Start the batch workers ahead of the first request when SENTIMENT_POOL_WARM
+    is set; otherwise the pool is only created by the first large batch
+    """
+    if SENTIMENT_POOL_WARM and SENTIMENT_WORKERS > 1:
+        pool = get_sentiment_pool()
+        for _ in range(SENTIMENT_WORKERS):
+            pool.submit(_warm_up_worker)
+
+
+def _reset_sentiment_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def analyze_sentiment_batch(texts: List[str], parallel: bool = None, chunk_size: int = None,
+                            engine: str = None) -> Dict:
+    """
+    Analyze the sentiment of many texts
+
+    Args:
+        texts: Texts to analyze
+        parallel: Spread the texts over the process pool; by default only
+            batches of at least SENTIMENT_PARALLEL_MIN uncached texts are
+        chunk_size: Texts per pool task (default: ~4 chunks per worker)
+        engine: Sentiment engine name (default SENTIMENT_ENGINE)
+
+    Returns:
+        Dict with per-text results (in input order) and their distribution
+    """
+    engine = engine or SENTIMENT_ENGINE
+    sentiment_engines.get(engine)  # fail fast on unknown or unavailable engines
+
+    # Each distinct text is looked up once; cached ones are answered here
+    positions = {}
+    for index, text in enumerate(texts):
+        positions.setdefault(text, []).append(index)
+
+    results = [None] * len(texts)
+    unique_texts = []
+    for text, indices in positions.items():
+        cached = sentiment_engines.lookup(text, engine)
+        if cached is None:
+            unique_texts.append(text)
+            continue
+        for index in indices:
+            results[index] = cached
+
+    if parallel is None:
+        parallel = SENTIMENT_WORKERS > 1 and len(unique_texts) >= SENTIMENT_PARALLEL_MIN
+
+    computed = None
+    if parallel and unique_texts:
+        chunk_size = chunk_size or max(1, math.ceil(len(unique_texts) / (SENTIMENT_WORKERS * 4)))
+        chunks = [unique_texts[i:i + chunk_size] for i in range(0, len(unique_texts), chunk_size)]
+        try:
+            # map keeps the chunks in input order
+            computed = [result for chunk in get_sentiment_pool().map(
+                            _analyze_chunk, chunks, [engine] * len(chunks))
+                        for result in chunk]
+        except BrokenProcessPool as e:
+            print(f"Sentiment worker pool failed, analyzing in-process: {str(e)}")
+            _reset_sentiment_pool()
+
+    if computed is None:
+        computed = _analyze_chunk(unique_texts, engine)
+
+    for text, result in zip(unique_texts, computed):
+        sentiment_engines.store(text, engine, result)
+        for index in positions[text]:
+            results[index] = result
+
+    return {
+        "results": results,
+        "distribution": sentiment_distribution(results)
+    }
+
+
+def sentiment_distribution(results: List[Dict]) -> Dict:
+    """Aggregate sentiment counts, shares and averages over analysis results"""
+    counts = {"positive": 0, "negative": 0, "neutral": 0}
+    for result in results:
+        counts[result["sentiment"]] = counts.get(result["sentiment"], 0) + 1
+
+    total = len(results)
+    if total == 0:
+        return {"total": 0, "counts": counts, "percentages": {k: 0 for k in counts},
+                "average_polarity": 0, "average_confidence": 0, "dominant_sentiment": "neutral"}
+
+    return {
+        "total": total,
+        "counts": counts,
+        "percentages": {k: round(v / total * 100, 1) for k, v in counts.items()},
+        # VADER reports a compound score instead of a polarity
+        "average_polarity": round(sum(r["scores"].get("polarity", r["scores"].get("compound", 0))
+                                      for r in results) / total, 3),
+        "average_confidence": round(sum(r["confidence"] for r in results) / total, 3),
+        "dominant_sentiment": max(counts.items(), key=lambda x: x[1])[0]
+    }
+
+
+def analyze_sentiment_keywords(text: str) -> Dict:
+    """Enhanced sentiment analysis using keyword detection"""
+
+    hits = keyword_matcher.match(text)["sentiment"]
 
     # Count keyword occurrences
-    positive_count = sum(1 for word in positive_keywords if word in text_lower)
-    negative_count = sum(1 for word in negative_keywords if word in text_lower)
-    neutral_count = sum(1 for word in neutral_keywords if word in text_lower)
+    positive_count = len(hits["positive"])
+    negative_count = len(hits["negative"])
+    neutral_count = len(hits["neutral"])
 
     total_sentiment_words = positive_count + negative_count + neutral_count
 
@@ -106,17 +341,9 @@ def analyze_sentiment_keywords(text: str) -> Dict:
     negative_score = negative_count / total_sentiment_words
     neutral_score = neutral_count / total_sentiment_words
 
-    # Find detected keywords
-    detected_keywords = []
-    for word in positive_keywords:
-        if word in text_lower:
-            detected_keywords.append({"word": word, "sentiment": "positive"})
-    for word in negative_keywords:
-        if word in text_lower:
-            detected_keywords.append({"word": word, "sentiment": "negative"})
-    for word in neutral_keywords:
-        if word in text_lower:
-            detected_keywords.append({"word": word, "sentiment": "neutral"})
+    # Detected keywords, grouped by sentiment
+    detected_keywords = [{"word": word, "sentiment": sentiment}
+                         for sentiment, words in hits.items() for word in words]
 
     return {
         "positive": round(positive_score, 2),
@@ -148,15 +375,10 @@ def combine_sentiment_scores(textblob_sentiment: str, keyword_scores: Dict, pola
 def analyze_sentiment_fallback(text: str) -> Dict:
     """Fallback sentiment analysis using basic rules"""
 
-    positive_words = ["good", "great", "love",
-                      "amazing", "awesome", "best", "excellent"]
-    negative_words = ["bad", "hate", "terrible",
-                      "awful", "worst", "horrible", "disappointing"]
-
-    text_lower = text.lower()
+    hits = keyword_matcher.match(text)["fallback"]
 
-    positive_count = sum(1 for word in positive_words if word in text_lower)
-    negative_count = sum(1 for word in negative_words if word in text_lower)
+    positive_count = len(hits["positive"])
+    negative_count = len(hits["negative"])
 
     if positive_count > negative_count:
         sentiment = "positive"
@@ -189,21 +411,8 @@ def analyze_emotion(text: str) -> Dict:
     Returns: Dict with emotion categories and scores
     """
 
-    emotion_keywords = {
-        "joy": ["happy", "excited", "thrilled", "delighted", "cheerful", "ecstatic"],
-        "anger": ["angry", "furious", "mad", "irritated", "annoyed", "frustrated"],
-        "sadness": ["sad", "depressed", "upset", "disappointed", "gloomy", "melancholy"],
-        "fear": ["scared", "afraid", "worried", "anxious", "nervous", "terrified"],
-        "surprise": ["surprised", "amazed", "shocked", "astonished", "stunned"],
-        "disgust": ["disgusted", "revolted", "repulsed", "sick", "nauseated"]
-    }
-
-    text_lower = text.lower()
-    emotion_scores = {}
-
-    for emotion, keywords in emotion_keywords.items():
-        count = sum(1 for word in keywords if word in text_lower)
-        emotion_scores[emotion] = count
+    hits = keyword_matcher.match(text)["emotion"]
+    emotion_scores = {emotion: len(words) for emotion, words in hits.items()}
 
     # Normalize scores
     total_emotions = sum(emotion_scores.values())
@@ -211,7 +420,7 @@ def analyze_emotion(text: str) -> Dict:
         emotion_scores = {k: round(v / total_emotions, 2)
                           for k, v in emotion_scores.items()}
     else:
-        emotion_scores = {k: 0 for k in emotion_keywords.keys()}
+        emotion_scores = {k: 0 for k in EMOTION_KEYWORDS}
 
     # Find dominant emotion
     dominant_emotion = max(emotion_scores.items(), key=lambda x: x[1])
@@ -259,10 +468,28 @@ def analyze_sentiment_vader(text: str) -> Dict:
     Requires: pip install vaderSentiment
     """
     try:
+        return sentiment_engines.get("vader").analyze(text)
+    except ImportError:
+        # Fallback to TextBlob if VADER not available
+        return analyze_sentiment(text)
+
+
+class TextBlobEngine:
+    """TextBlob polarity combined with keyword detection (analyze_sentiment)"""
+
+    def analyze(self, text: str) -> Dict:
+        return analyze_sentiment(text)
+
+
+class VaderEngine:
+    """VADER with one analyzer (and lexicon) loaded for the life of the process"""
+
+    def __init__(self):
         from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        self.analyzer = SentimentIntensityAnalyzer()
 
-        analyzer = SentimentIntensityAnalyzer()
-        scores = analyzer.polarity_scores(text)
+    def analyze(self, text: str) -> Dict:
+        scores = self.analyzer.polarity_scores(text)
 
         # Determine overall sentiment
         if scores['compound'] >= 0.05:
@@ -283,6 +510,131 @@ def analyze_sentiment_vader(text: str) -> Dict:
             }
         }
 
-    except ImportError:
-        # Fallback to TextBlob if VADER not available
-        return analyze_sentiment(text)
+
+class KeywordEngine:
+    """Lexicon keywords only: the cheapest engine, no TextBlob parsing"""
+
+    def analyze(self, text: str) -> Dict:
+        scores = analyze_sentiment_keywords(text)
+        return {
+            "sentiment": combine_sentiment_scores("neutral", scores, 0.0),
+            "confidence": max(scores["positive"], scores["negative"], scores["neutral"]),
+            "scores": {
+                "positive_score": scores["positive"],
+                "negative_score": scores["negative"],
+                "neutral_score": scores["neutral"]
+            },
+            "keywords": scores["keywords"]
+        }
+
+
+class SentimentEngineRegistry:
+    """
+    Named, long-lived sentiment engines plus an LRU cache of their results
+
+    Engines are built once on first use. Results are keyed on the engine
+    name and a hash of the text, so repeated texts are scored once per
+    process; callers get their own copy of a cached result.
+    """
+
+    def __init__(self, cache_size: int = SENTIMENT_CACHE_SIZE):
+        self._factories = {}
+        self._engines = {}
+        self._lock = threading.Lock()
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def register(self, name: str, factory: Callable):
+        self._factories[name] = factory
+
+    def names(self) -> List[str]:
+        return list(self._factories)
+
+    def get(self, name: str = None):
+        """Engine by name (default SENTIMENT_ENGINE); ImportError if its package is missing"""
+        name = name or SENTIMENT_ENGINE
+        engine = self._engines.get(name)
+        if engine is not None:
+            return engine
+        if name not in self._factories:
+            raise KeyError(f"Unknown sentiment engine '{name}'. Available: {self.names()}")
+        with self._lock:
+            if name not in self._engines:
+                self._engines[name] = self._factories[name]()
+            return self._engines[name]
+
+    def is_available(self, name: str) -> bool:
+        try:
+            self.get(name)
+            return True
+        except (KeyError, ImportError):
+            return False
+
+    @staticmethod
+    def _key(text: str, engine: str) -> tuple:
+        return engine, hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def lookup(self, text: str, engine: str = None) -> Optional[Dict]:
+        """Cached result for a text, or None"""
+        key = self._key(text, engine or SENTIMENT_ENGINE)
+        with self._cache_lock:
+            result = self._cache.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._cache.move_to_end(key)
+        return copy.deepcopy(result)
+
+    def store(self, text: str, engine: str, result: Dict):
+        if self.cache_size <= 0:
+            return
+        key = self._key(text, engine or SENTIMENT_ENGINE)
+        result = copy.deepcopy(result)
+        with self._cache_lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def analyze(self, text: str, engine: str = None) -> Dict:
+        """Score a text with the chosen engine, serving repeats from the cache"""
+        engine = engine or SENTIMENT_ENGINE
+        analyzer = self.get(engine)
+        result = self.lookup(text, engine)
+        if result is None:
+            result = analyzer.analyze(text)
+            self.store(text, engine, result)
+        return result
+
+    def clear_cache(self):
+        with self._cache_lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "default_engine": SENTIMENT_ENGINE,
+            "engines": {name: {"loaded": name in self._engines} for name in self._factories},
+            "cache_entries": len(self._cache),
+            "cache_size": self.cache_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
+
+
+sentiment_engines = SentimentEngineRegistry()
+sentiment_engines.register("textblob", TextBlobEngine)
+sentiment_engines.register("vader", VaderEngine)
+sentiment_engines.register("keyword", KeywordEngine)
+
+
+def analyze_text(text: str, engine: str = None) -> Dict:
+    """Sentiment of a text with the chosen engine (cached)"""
+    return sentiment_engines.analyze(text, engine)
@@ -0,0 +1,307 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: per-session writes are not locked across processes
+    fcntl = None
+
+SESSION_MEMORY_TOKENS = int(os.getenv("SESSION_MEMORY_TOKENS", 2000))
+SESSION_IDLE_TTL = float(os.getenv("SESSION_IDLE_TTL", 1800))
+SESSION_MAX_COUNT = int(os.getenv("SESSION_MAX_COUNT", 1000))
+# memory keeps sessions in this process; disk shares them between gunicorn workers
+SESSION_MEMORY_BACKEND = os.getenv("SESSION_MEMORY_BACKEND", "memory")
+SESSION_MEMORY_DIR = os.getenv("SESSION_MEMORY_DIR", os.path.join("data", "cache", "sessions"))
+
+# Each dropped turn is kept as one line of at most this many characters
+SUMMARY_LINE_CHARS = 160
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) without a tokenizer round trip"""
+    return len(text) // 4 + 1
+
+
+class SessionMemory:
+    """
+    Conversation history for one session, bounded by a token budget
+
+    Recent turns are kept verbatim. When they exceed the budget the oldest
+    turns move into a running summary of short one-line digests, which is
+    itself capped at a quarter of the budget.
+    """
+
+    def __init__(self, max_tokens: int = SESSION_MEMORY_TOKENS):
+        self.max_tokens = max_tokens
+        self.turns: List[Dict] = []
+        self.summary: List[str] = []
+        self.last_used = time.time()
+
+    def add_turn(self, user_text: str, ai_text: str):
+        turn = {"human": user_text, "ai": ai_text,
+                "tokens": estimate_tokens(user_text) + estimate_tokens(ai_text)}
+        self.turns.append(turn)
+        self._truncate()
+
+    def _truncate(self):
+        summary_budget = self.max_tokens // 4
+        turn_budget = self.max_tokens - summary_budget
+
+        while self.turns and sum(t["tokens"] for t in self.turns) > turn_budget:
+            dropped = self.turns.pop(0)
+            self.summary.append(self._digest(dropped))
+
+        while self.summary and sum(estimate_tokens(line) for line in self.summary) > summary_budget:
+            self.summary.pop(0)
+
+    @staticmethod
+    def _digest(turn: Dict) -> str:
+        def clip(text, limit):
+            text = " ".join(text.split())
+            return text if len(text) <= limit else text[:limit - 3] + "..."
+        half = SUMMARY_LINE_CHARS // 2
+        return f"- User asked: {clip(turn['human'], half)} | AI: {clip(turn['ai'], half)}"
+
+    def render(self) -> str:
+        """History as prompt text (empty for a new session)"""
+        parts = []
+        if self.summary:
+            parts.append("Summary of earlier conversation:\n" + "\n".join(self.summary))
+        for turn in self.turns:
+            parts.append(f"Human: {turn['human']}\nAI: {turn['ai']}")
+        return "\n\n".join(parts)
+
+    def token_count(self) -> int:
+        return (sum(t["tokens"] for t in self.turns)
+                + sum(estimate_tokens(line) for line in self.summary))
+
+    def to_dict(self) -> Dict:
+        return {"turns": self.turns, "summary": self.summary, "last_used": self.last_used}
+
+    @classmethod
+    def from_dict(cls, data: Dict, max_tokens: int = SESSION_MEMORY_TOKENS) -> "SessionMemory":
+        memory = cls(max_tokens)
+        memory.turns = data.get("turns", [])
+        memory.summary = data.get("summary", [])
+        memory.last_used = data.get("last_used", memory.last_used)
+        return memory
+
+
+class SessionMemoryStore:
+    """
+    Per-session memories keyed by a client-supplied session id
+
+    Sessions idle for longer than idle_ttl are evicted, and the least
+    recently used are dropped beyond max_sessions.
+
+    Sessions live in this process only: under several gunicorn workers a
+    session's turns are split between them. Use DiskSessionStore there.
+    """
+
+    def __init__(self, max_tokens: int = SESSION_MEMORY_TOKENS,
+                 idle_ttl: float = SESSION_IDLE_TTL,
+                 max_sessions: int = SESSION_MAX_COUNT):
+        self.max_tokens = max_tokens
+        self.idle_ttl = idle_ttl
+        self.max_sessions = max(1, max_sessions)
+        self._sessions: "OrderedDict[str, SessionMemory]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+    def _evict_idle(self, now: float):
+        while self._sessions:
+            session_id, memory = next(iter(self._sessions.items()))
+            if now - memory.last_used <= self.idle_ttl:
+                break
+            del self._sessions[session_id]
+            self.evicted += 1
+
+    def _touch(self, session_id: str, create: bool) -> Optional[SessionMemory]:
+        now = time.time()
+        self._evict_idle(now)
+        memory = self._sessions.get(session_id)
+        if memory is None:
+            if not create:
+                return None
+            memory = SessionMemory(self.max_tokens)
+            self._sessions[session_id] = memory
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+        memory.last_used = now
+        self._sessions.move_to_end(session_id)
+        return memory
+
+    def get_history(self, session_id: Optional[str]) -> str:
+        """Rendered history for a session ("" when there is none)"""
+        if not session_id:
+            return ""
+        with self._lock:
+            memory = self._touch(session_id, create=False)
+            return memory.render() if memory else ""
+
+    def add_turn(self, session_id: Optional[str], user_text: str, ai_text: str):
+        if not session_id:
+            return
+        with self._lock:
+            self._touch(session_id, create=True).add_turn(user_text, ai_text)
+
+    def clear(self, session_id: str = None):
+        with self._lock:
+            if session_id is None:
+                self._sessions.clear()
+            else:
+                self._sessions.pop(session_id, None)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self._evict_idle(time.time())
+            tokens = [memory.token_count() for memory in self._sessions.values()]
+        return {
+            "backend": "memory",
+            "sessions": len(tokens),
+            "max_tokens_per_session": self.max_tokens,
+            "largest_session_tokens": max(tokens, default=0),
+            "total_tokens": sum(tokens),
+            "evicted": self.evicted,
+        }
+
+
+class DiskSessionStore:
+    """
+    Session memories kept as one JSON file per session, so every gunicorn
+    worker sees the same history and applies the same idle TTL and cap
+
+    Updates to a session hold an exclusive lock on its lock file, so turns
+    from concurrent requests in different workers are not lost. Files are
+    replaced atomically (temp file + os.replace), so readers never lock.
+    A session's idle time counts from its last recorded turn.
+    """
+
+    PRUNE_EVERY = 50
+
+    def __init__(self, directory: str = SESSION_MEMORY_DIR,
+                 max_tokens: int = SESSION_MEMORY_TOKENS,
+                 idle_ttl: float = SESSION_IDLE_TTL,
+                 max_sessions: int = SESSION_MAX_COUNT):
+        self.directory = directory
+        self.max_tokens = max_tokens
+        self.idle_ttl = idle_ttl
+        self.max_sessions = max(1, max_sessions)
+        self.evicted = 0
+        self._writes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, session_id: str) -> str:
+        key = hashlib.sha256(session_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read(self, path: str) -> Optional[SessionMemory]:
+        try:
+            with open(path) as f:
+                memory = SessionMemory.from_dict(json.load(f), self.max_tokens)
+        except (OSError, ValueError):
+            return None
+        if time.time() - memory.last_used > self.idle_ttl:
+            self._remove(path)
+            self.evicted += 1
+            return None
+        return memory
+
+    def _write(self, path: str, memory: SessionMemory):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(memory.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    @contextmanager
+    def _locked(self, path: str):
+        with open(f"{path}.lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get_history(self, session_id: Optional[str]) -> str:
+        """Rendered history for a session ("" when there is none)"""
+        if not session_id:
+            return ""
+        memory = self._read(self._path(session_id))
+        return memory.render() if memory else ""
+
+    def add_turn(self, session_id: Optional[str], user_text: str, ai_text: str):
+        if not session_id:
+            return
+        path = self._path(session_id)
+        with self._locked(path):
+            memory = self._read(path) or SessionMemory(self.max_tokens)
+            memory.add_turn(user_text, ai_text)
+            memory.last_used = time.time()
+            self._write(path, memory)
+
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            self.prune()
+
+    def _session_files(self) -> List[str]:
+        return [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                if name.endswith(".json")]
+
+    def prune(self):
+        """Drop idle sessions, then the least recently used beyond max_sessions"""
+        live = []
+        for path in self._session_files():
+            memory = self._read(path)
+            if memory is not None:
+                live.append((memory.last_used, path))
+        live.sort()
+        for _, path in live[:max(0, len(live) - self.max_sessions)]:
+            self._remove(path)
+            self.evicted += 1
+
+    def clear(self, session_id: str = None):
+        paths = self._session_files() if session_id is None else [self._path(session_id)]
+        for path in paths:
+            self._remove(path)
+
+    def _remove(self, path: str):
+        for target in (path, f"{path}.lock"):
+            try:
+                os.remove(target)
+            except OSError:
+                pass
+
+    def stats(self) -> Dict:
+        self.prune()
+        memories = [memory for memory in map(self._read, self._session_files()) if memory is not None]
+        tokens = [memory.token_count() for memory in memories]
+        return {
+            "backend": "disk",
+            "sessions": len(tokens),
+            "max_tokens_per_session": self.max_tokens,
+            "largest_session_tokens": max(tokens, default=0),
+            "total_tokens": sum(tokens),
+            "evicted": self.evicted,
+        }
+
+
+def create_session_store(backend: str = SESSION_MEMORY_BACKEND):
+    """Build the session store selected by SESSION_MEMORY_BACKEND"""
+    if backend == "disk":
+        return DiskSessionStore()
+    if backend != "memory":
+        print(f"⚠️ Unknown SESSION_MEMORY_BACKEND '{backend}', keeping sessions in memory")
+    return SessionMemoryStore()
+
+
+# Shared by every agent in the process (and, with the disk backend, every worker)
+session_store = create_session_store()
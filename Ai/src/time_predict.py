@@ -1,17 +1,71 @@
-import joblib
 import os
-from time_prediction import TimePredictionEngine
+import threading
+import time
+from time_prediction import TimePredictionEngine, LOOKUP_TABLE_FILENAME
 
-def load_time_prediction_model():
-    """Load the time prediction model"""
+MODELS_DIR = os.getenv("MODELS_DIR", "models")
+# How often (seconds) the cached engine checks its artifacts for changes
+RELOAD_CHECK_INTERVAL = float(os.getenv("TIME_MODEL_RELOAD_CHECK_INTERVAL", 10))
+
+_engine = None
+_engine_signature = None
+_last_check = None
+_engine_lock = threading.Lock()
+
+def _artifact_signature(models_dir: str = MODELS_DIR) -> tuple:
+    """Name, size and mtime of every time prediction artifact"""
+    if not os.path.isdir(models_dir):
+        return ()
+    signature = []
+    for filename in sorted(os.listdir(models_dir)):
+        is_model = filename.startswith('time_prediction_') and filename.endswith('.pkl')
+        if is_model or filename == LOOKUP_TABLE_FILENAME:
+            stat = os.stat(os.path.join(models_dir, filename))
+            signature.append((filename, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+def _build_engine(models_dir: str = MODELS_DIR):
     try:
         engine = TimePredictionEngine()
-        engine.load_models()
+        engine.load_models(models_dir)
         return engine
     except Exception as e:
         print(f"Warning: Could not load time prediction model: {e}")
         return None
 
+def load_time_prediction_model(force_reload: bool = False):
+    """
+    Return the process-wide time prediction engine
+
+    The engine is loaded once and reused across requests. Its artifacts are
+    re-checked at most every RELOAD_CHECK_INTERVAL seconds and the engine is
+    rebuilt only when a model file was added, removed or rewritten.
+    """
+    global _engine, _engine_signature, _last_check
+
+    now = time.monotonic()
+    if not force_reload and _last_check is not None and now - _last_check < RELOAD_CHECK_INTERVAL:
+        return _engine
+
+    with _engine_lock:
+        now = time.monotonic()
+        if not force_reload and _last_check is not None and now - _last_check < RELOAD_CHECK_INTERVAL:
+            return _engine
+
+        signature = _artifact_signature()
+        if force_reload or _engine is None or signature != _engine_signature:
+            engine = _build_engine()
+            if engine is not None:
+                _engine = engine
+                _engine_signature = signature
+                print(f"✅ Time prediction engine loaded ({len(signature)} artifacts)")
+        _last_check = now
+        return _engine
+
+def reload_time_prediction_model():
+    """Force the cached engine to be rebuilt from disk"""
+    return load_time_prediction_model(force_reload=True)
+
 def predict_optimal_time(subreddit: str, content_type: str = "text", user_data: dict = None):
     """
     Predict optimal posting time for a given subreddit and content type
@@ -45,6 +99,41 @@ def predict_optimal_time(subreddit: str, content_type: str = "text", user_data:
             "error": str(e)
         }
 
+def predict_hourly_curve(subreddit: str, content_type: str = "text", hours: list = None, user_data: dict = None):
+    """
+    Score a set of posting hours (all 24 by default) in one batched pass
+    
+    Returns:
+        Dict with one entry per hour (optimal hour and confidence)
+    """
+    if hours is None:
+        hours = list(range(24))
+    
+    try:
+        engine = load_time_prediction_model()
+        if not engine or not engine.global_model:
+            return {
+                "hourly_predictions": [
+                    {"hour": hour, "optimal_hour": 12, "confidence": 0.5} for hour in hours
+                ],
+                "status": "fallback"
+            }
+        
+        return {
+            "hourly_predictions": engine.predict_hourly_curve(subreddit, content_type, hours, user_data),
+            "status": "success"
+        }
+        
+    except Exception as e:
+        print(f"Error in hourly time prediction: {e}")
+        return {
+            "hourly_predictions": [
+                {"hour": hour, "optimal_hour": 12, "confidence": 0.5} for hour in hours
+            ],
+            "status": "error",
+            "error": str(e)
+        }
+
 def get_time_slot_name(hour: int) -> str:
     """Convert hour to time slot name"""
     if 0 <= hour < 6:
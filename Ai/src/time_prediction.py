@@ -1,15 +1,122 @@
 import pandas as pd
 import numpy as np
 import os
+import json
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
+from concurrent.futures import ProcessPoolExecutor
 import joblib
 from xgboost import XGBRegressor, XGBClassifier
 from sklearn.model_selection import TimeSeriesSplit
 from sklearn.metrics import mean_squared_error, accuracy_score
+from metrics import MODEL_PREDICT_SECONDS
 import warnings
 warnings.filterwarnings('ignore')
 
+CONTENT_TYPES = ['text', 'image', 'video', 'link']
+LOOKUP_TABLE_FILENAME = 'time_lookup.npz'
+LOOKUP_MODEL_KEYS = ['global', 'subreddit', 'content_type', 'ensemble']
+
+# Columnar cache of the consolidated, feature-engineered timeline frame
+DATA_CACHE_DIR = os.getenv('TIME_DATA_CACHE_DIR', os.path.join('data', 'cache'))
+DATA_CACHE_VERSION = 1
+try:
+    import pyarrow  # noqa: F401
+    DATA_CACHE_FORMAT = 'parquet'
+except ImportError:
+    # Parquet needs pyarrow; fall back to pandas' binary pickle format
+    DATA_CACHE_FORMAT = 'pickle'
+
+# Parallel training defaults: 1 worker keeps training sequential
+TRAIN_WORKERS = int(os.getenv('TIME_TRAIN_WORKERS', 1))
+TRAIN_MODEL_THREADS = int(os.getenv('TIME_TRAIN_MODEL_THREADS', 0))
+
+
+# Explicit timestamp formats tried per source file, most common first
+TIMESTAMP_FORMATS = [
+    '%Y-%m-%d %H:%M:%S',
+    '%m/%d/%Y %H:%M',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%m/%d/%Y %H:%M:%S',
+    '%Y-%m-%d',
+]
+TIMESTAMP_SAMPLE_SIZE = 50
+
+
+def _detect_timestamp_format(sample: pd.Series) -> Optional[str]:
+    """
+    Pick the explicit format that parses the most values of a small sample
+    """
+    sample = sample.dropna().astype(str)
+    if sample.empty:
+        return None
+    best_format, best_count = None, 0
+    for fmt in TIMESTAMP_FORMATS:
+        count = pd.to_datetime(sample, format=fmt, errors='coerce').notna().sum()
+        if count > best_count:
+            best_format, best_count = fmt, count
+            if count == len(sample):
+                break
+    return best_format
+
+
+def parse_timestamps(values: pd.Series, groups: pd.Series = None) -> Tuple[pd.Series, Dict]:
+    """
+    Parse timestamps with a vectorized explicit-format fast path
+    
+    The dominant format is detected per group (source file) from a small
+    sample; rows sharing a format are parsed in one vectorized call and only
+    rows that format cannot parse go through the slow mixed parser.
+    
+    Returns:
+        Parsed datetimes (NaT when invalid) and counts per path
+    """
+    group_positions = (groups.groupby(groups, sort=False).indices.values()
+                       if groups is not None else [np.arange(len(values))])
+    
+    # Bucket rows by their group's detected format
+    buckets = {}
+    for positions in group_positions:
+        fmt = _detect_timestamp_format(values.iloc[positions[:TIMESTAMP_SAMPLE_SIZE]])
+        if fmt is not None:
+            buckets.setdefault(fmt, []).append(positions)
+    
+    parsed = np.full(len(values), np.datetime64('NaT'), dtype='datetime64[ns]')
+    for fmt, position_list in buckets.items():
+        positions = np.concatenate(position_list)
+        parsed[positions] = pd.to_datetime(
+            values.iloc[positions].astype(str), format=fmt, errors='coerce'
+        ).to_numpy(dtype='datetime64[ns]')
+    parsed = pd.Series(parsed, index=values.index)
+    fast = int(parsed.notna().sum())
+    
+    leftover = parsed.isna() & values.notna()
+    if leftover.any():
+        slow_parsed = pd.to_datetime(values[leftover], errors='coerce', format='mixed')
+        if getattr(slow_parsed.dt, 'tz', None) is not None:
+            slow_parsed = slow_parsed.dt.tz_convert(None)
+        parsed[leftover] = slow_parsed
+    total_parsed = int(parsed.notna().sum())
+    
+    return parsed, {
+        'fast': fast,
+        'slow': total_parsed - fast,
+        'invalid': len(values) - total_parsed
+    }
+
+
+def _fit_specialized_model(task: Tuple) -> Tuple:
+    """
+    Fit one subreddit or content-type model (runs in a worker process)
+    """
+    key, X_part, y_part, n_threads = task
+    model = XGBRegressor(n_estimators=50, max_depth=4, random_state=42,
+                         n_jobs=n_threads or None)
+    model.fit(X_part, y_part)
+    return key, model
+
 class TimePredictionEngine:
     """
     Advanced time prediction engine for optimal posting times
@@ -23,10 +130,18 @@ class TimePredictionEngine:
         self.subreddit_models = {}
         self.content_type_models = {}
         self.global_model = None
+        self.lookup_table = None
         
-    def load_and_consolidate_data(self) -> pd.DataFrame:
+    def _timeline_files(self) -> List[str]:
+        """Subreddit CSV filenames in the timeline directory"""
+        return sorted(
+            filename for filename in os.listdir(self.data_path)
+            if filename.endswith('.csv') and filename != '50_subreddits_list.csv'
+        )
+    
+    def load_and_consolidate_data(self, filenames: List[str] = None) -> pd.DataFrame:
         """
-        Load and consolidate all timeline CSV files
+        Load and consolidate all timeline CSV files (or only the given ones)
         """
         print("📊 Loading and consolidating timeline data...")
         
@@ -37,20 +152,22 @@ class TimePredictionEngine:
             print(f"❌ Timeline directory not found: {timeline_dir}")
             return pd.DataFrame()
         
+        if filenames is None:
+            filenames = self._timeline_files()
+        
         # Load each subreddit CSV file
-        for filename in os.listdir(timeline_dir):
-            if filename.endswith('.csv') and filename != '50_subreddits_list.csv':
-                subreddit_name = filename.replace('.csv', '')
-                file_path = os.path.join(timeline_dir, filename)
-                
-                try:
-                    df = pd.read_csv(file_path, low_memory=False)
-                    df['subreddit'] = subreddit_name
-                    all_data.append(df)
-                    print(f"✅ Loaded {subreddit_name}: {len(df)} posts")
-                except Exception as e:
-                    print(f"❌ Error loading {filename}: {str(e)}")
-                    print(f"   ⚠️  Skipping corrupted file: {filename}")
+        for filename in filenames:
+            subreddit_name = filename.replace('.csv', '')
+            file_path = os.path.join(timeline_dir, filename)
+            
+            try:
+                df = pd.read_csv(file_path, low_memory=False)
+                df['subreddit'] = subreddit_name
+                all_data.append(df)
+                print(f"✅ Loaded {subreddit_name}: {len(df)} posts")
+            except Exception as e:
+                print(f"❌ Error loading {filename}: {str(e)}")
+                print(f"   ⚠️  Skipping corrupted file: {filename}")
         
         if not all_data:
             print("❌ No data files found!")
@@ -62,6 +179,97 @@ class TimePredictionEngine:
         
         return consolidated_df
     
+    def load_engineered_data(self, cache_dir: str = DATA_CACHE_DIR, use_cache: bool = True) -> pd.DataFrame:
+        """
+        Load the consolidated, feature-engineered timeline frame through a columnar cache
+        
+        The cache is keyed by each CSV's size and mtime. Unchanged subreddits
+        are read back from one binary file; only new or modified CSVs are
+        parsed and engineered again, and removed CSVs are dropped.
+        """
+        start = time.perf_counter()
+        
+        if not os.path.exists(self.data_path):
+            print(f"❌ Timeline directory not found: {self.data_path}")
+            return pd.DataFrame()
+        
+        current = {}
+        for filename in self._timeline_files():
+            stat = os.stat(os.path.join(self.data_path, filename))
+            current[filename] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        
+        cache_ext = 'parquet' if DATA_CACHE_FORMAT == 'parquet' else 'pkl'
+        cache_path = os.path.join(cache_dir, f'timeline_features.{cache_ext}')
+        manifest_path = os.path.join(cache_dir, 'timeline_manifest.json')
+        
+        cached_df = None
+        cached_files = {}
+        if use_cache and os.path.exists(cache_path) and os.path.exists(manifest_path):
+            try:
+                with open(manifest_path) as f:
+                    manifest = json.load(f)
+                if manifest.get('version') == DATA_CACHE_VERSION and manifest.get('format') == DATA_CACHE_FORMAT:
+                    cached_files = manifest.get('files', {})
+                    cached_df = self._read_data_cache(cache_path)
+            except Exception as e:
+                print(f"⚠️  Ignoring unreadable timeline cache: {e}")
+                cached_df, cached_files = None, {}
+        
+        hits = [f for f, key in current.items() if cached_df is not None and cached_files.get(f) == key]
+        misses = [f for f in current if f not in hits]
+        removed = [f for f in cached_files if f not in current]
+        
+        frames = []
+        if hits:
+            keep = {f.replace('.csv', '') for f in hits}
+            frames.append(cached_df[cached_df['subreddit'].isin(keep)])
+        if misses:
+            fresh_df = self.load_and_consolidate_data(misses)
+            if not fresh_df.empty:
+                frames.append(self.engineer_time_features(fresh_df))
+        
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        
+        if use_cache and (misses or removed) and not df.empty:
+            self._write_data_cache(df, cache_dir, cache_path, manifest_path, current)
+        
+        elapsed = time.perf_counter() - start
+        self.data_cache_stats = {
+            'hits': len(hits),
+            'misses': len(misses),
+            'removed': len(removed),
+            'rows': len(df),
+            'load_seconds': round(elapsed, 3)
+        }
+        status = 'hit' if not misses and not removed else 'miss' if not hits else 'partial'
+        print(f"🗄️  Timeline cache {status}: {len(hits)} cached, {len(misses)} re-ingested, "
+              f"{len(removed)} removed - {len(df)} rows in {elapsed:.2f}s")
+        return df
+    
+    def _read_data_cache(self, cache_path: str) -> pd.DataFrame:
+        if DATA_CACHE_FORMAT == 'parquet':
+            return pd.read_parquet(cache_path)
+        return pd.read_pickle(cache_path)
+    
+    def _write_data_cache(self, df: pd.DataFrame, cache_dir: str, cache_path: str,
+                          manifest_path: str, files: Dict):
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f'{cache_path}.tmp'
+            if DATA_CACHE_FORMAT == 'parquet':
+                # Raw CSV columns can mix types (e.g. is_bot); store those as strings
+                df = df.copy()
+                for col in df.columns[df.dtypes == object]:
+                    df[col] = df[col].map(lambda v: v if v is None or isinstance(v, str) or v != v else str(v))
+                df.to_parquet(tmp_path, index=False)
+            else:
+                df.to_pickle(tmp_path)
+            os.replace(tmp_path, cache_path)
+            with open(manifest_path, 'w') as f:
+                json.dump({'version': DATA_CACHE_VERSION, 'format': DATA_CACHE_FORMAT, 'files': files}, f, indent=2)
+        except Exception as e:
+            print(f"⚠️  Could not write timeline cache: {e}")
+    
     def engineer_time_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Engineer comprehensive time-based features
@@ -72,12 +280,11 @@ class TimePredictionEngine:
         print("   📅 Converting timestamps...")
         original_count = len(df)
         
-        # Try different date formats and handle errors
-        df['created_datetime'] = pd.to_datetime(
-            df['created_utc'], 
-            errors='coerce',  # Convert errors to NaT
-            format='mixed'    # Try to infer format for each row
-        )
+        # Parse each source file with its dominant format, mixed parser only for leftovers
+        groups = df['subreddit'] if 'subreddit' in df.columns else None
+        df['created_datetime'], parse_counts = parse_timestamps(df['created_utc'], groups)
+        print(f"   📅 Parsed {parse_counts['fast']} timestamps with explicit formats, "
+              f"{parse_counts['slow']} with the mixed parser, {parse_counts['invalid']} invalid")
         
         # Remove rows with invalid timestamps
         invalid_timestamps = df['created_datetime'].isna().sum()
@@ -108,9 +315,10 @@ class TimePredictionEngine:
                                 labels=['Night', 'Morning', 'Afternoon', 'Evening'])
         
         # Content features
-        df['title_length'] = df['title'].str.len()
+        # Cast to string dtype so an all-empty column (e.g. one subreddit's body) still works
+        df['title_length'] = df['title'].astype('string').str.len().astype(float)
         df['has_body'] = df['body'].notna().astype(int)
-        df['body_length'] = df['body'].str.len().fillna(0)
+        df['body_length'] = df['body'].astype('string').str.len().astype(float).fillna(0)
         
         # Post type features
         df['is_image'] = (df['post_type'] == 'image').astype(int)
@@ -198,9 +406,18 @@ class TimePredictionEngine:
         print(f"✅ Prepared {len(feature_columns)} features")
         return X, feature_columns
     
-    def train_time_prediction_models(self, df: pd.DataFrame) -> Dict:
+    def train_time_prediction_models(self,
+                                     df: pd.DataFrame,
+                                     n_workers: int = None,
+                                     model_threads: int = None) -> Dict:
         """
         Train multiple specialized time prediction models
+        
+        Args:
+            df: Feature-engineered frame with targets
+            n_workers: Processes used for subreddit/content-type models
+                (1 = sequential, 0 = one per core)
+            model_threads: XGBoost threads per model (0 = cores / workers)
         """
         print("🤖 Training time prediction models...")
         
@@ -233,35 +450,29 @@ class TimePredictionEngine:
         mse = mean_squared_error(y_hour, y_pred)
         print(f"✅ Global model trained - MSE: {mse:.2f}")
         
+        # Partition the frame once instead of re-filtering it per model
+        subreddit_tasks = []
+        for subreddit, positions in df.groupby('subreddit', sort=False).indices.items():
+            if len(positions) > 100:  # Only train if enough data
+                subreddit_tasks.append((subreddit, X.iloc[positions], y_hour.iloc[positions]))
+        
+        content_tasks = []
+        for post_type, positions in df.groupby('post_type', sort=False).indices.items():
+            content_type = f'is_{post_type}'
+            if content_type in ['is_image', 'is_video', 'is_text', 'is_link'] and len(positions) > 100:
+                content_tasks.append((content_type, X.iloc[positions], y_hour.iloc[positions]))
+        
         # Train subreddit-specific models
         print("📊 Training subreddit-specific models...")
-        subreddit_models = {}
-        
-        for subreddit in df['subreddit'].unique():
-            subreddit_data = df[df['subreddit'] == subreddit]
-            if len(subreddit_data) > 100:  # Only train if enough data
-                X_sub = X[df['subreddit'] == subreddit]
-                y_sub = y_hour[df['subreddit'] == subreddit]
-                
-                model = XGBRegressor(n_estimators=50, max_depth=4, random_state=42)
-                model.fit(X_sub, y_sub)
-                subreddit_models[subreddit] = model
-                print(f"✅ Trained model for r/{subreddit}")
+        subreddit_models = self._fit_specialized_models(subreddit_tasks, n_workers, model_threads)
+        for subreddit in subreddit_models:
+            print(f"✅ Trained model for r/{subreddit}")
         
         # Train content-type models
         print("📊 Training content-type models...")
-        content_models = {}
-        
-        for content_type in ['is_image', 'is_video', 'is_text', 'is_link']:
-            content_data = df[df[content_type] == 1]
-            if len(content_data) > 100:
-                X_content = X[df[content_type] == 1]
-                y_content = y_hour[df[content_type] == 1]
-                
-                model = XGBRegressor(n_estimators=50, max_depth=4, random_state=42)
-                model.fit(X_content, y_content)
-                content_models[content_type] = model
-                print(f"✅ Trained model for {content_type}")
+        content_models = self._fit_specialized_models(content_tasks, n_workers, model_threads)
+        for content_type in content_models:
+            print(f"✅ Trained model for {content_type}")
         
         # Store models
         self.global_model = global_model
@@ -277,6 +488,32 @@ class TimePredictionEngine:
             'feature_columns': feature_columns
         }
     
+    def _fit_specialized_models(self, tasks: List[Tuple], n_workers: int = None,
+                                model_threads: int = None) -> Dict:
+        """
+        Fit one small model per (key, X, y) task, optionally across a process pool
+        """
+        if n_workers is None:
+            n_workers = TRAIN_WORKERS
+        if model_threads is None:
+            model_threads = TRAIN_MODEL_THREADS
+        
+        cpu_count = os.cpu_count() or 1
+        if n_workers <= 0:
+            n_workers = cpu_count
+        n_workers = max(1, min(n_workers, len(tasks)))
+        # Split cores between workers so XGBoost threads don't oversubscribe
+        if model_threads <= 0:
+            model_threads = max(1, cpu_count // n_workers)
+        
+        jobs = [(key, X_part, y_part, model_threads) for key, X_part, y_part in tasks]
+        if n_workers == 1:
+            return dict(_fit_specialized_model(job) for job in jobs)
+        
+        print(f"   ⚡ Training {len(jobs)} models on {n_workers} workers x {model_threads} threads")
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            return dict(executor.map(_fit_specialized_model, jobs))
+    
     def predict_optimal_time(self, 
                            subreddit: str,
                            content_type: str = 'text',
@@ -287,6 +524,12 @@ class TimePredictionEngine:
         if not self.global_model:
             return {"error": "Models not trained yet"}
         
+        # Without custom user data the answer is precomputed
+        if not user_data:
+            cached = self.lookup_optimal_time(subreddit, content_type)
+            if cached:
+                return cached
+        
         # Prepare input features
         input_features = self._prepare_prediction_input(subreddit, content_type, user_data)
         
@@ -295,29 +538,25 @@ class TimePredictionEngine:
         
         # Global model prediction
         if self.global_model:
-            global_pred = self.global_model.predict([input_features])[0]
+            with MODEL_PREDICT_SECONDS.time(model='time_global'):
+                global_pred = self.global_model.predict([input_features])[0]
             predictions['global'] = round(global_pred) % 24
         
         # Subreddit-specific prediction
         if subreddit in self.subreddit_models:
-            subreddit_pred = self.subreddit_models[subreddit].predict([input_features])[0]
+            with MODEL_PREDICT_SECONDS.time(model='time_subreddit'):
+                subreddit_pred = self.subreddit_models[subreddit].predict([input_features])[0]
             predictions['subreddit'] = round(subreddit_pred) % 24
         
         # Content-type prediction
         content_key = f'is_{content_type}'
         if content_key in self.content_type_models:
-            content_pred = self.content_type_models[content_key].predict([input_features])[0]
+            with MODEL_PREDICT_SECONDS.time(model='time_content_type'):
+                content_pred = self.content_type_models[content_key].predict([input_features])[0]
             predictions['content_type'] = round(content_pred) % 24
         
-        # Ensemble prediction (weighted average)
-        if len(predictions) > 1:
-            weights = {'global': 0.3, 'subreddit': 0.5, 'content_type': 0.2}
-            ensemble_pred = sum(predictions[key] * weights.get(key, 0.3) 
-                              for key in predictions.keys())
-            predictions['ensemble'] = round(ensemble_pred) % 24
-        
-        # Get confidence scores
-        confidence = self._calculate_confidence(predictions)
+        # Ensemble prediction and confidence scores
+        predictions, confidence = self._combine_predictions(predictions)
         
         return {
             'optimal_hour': predictions.get('ensemble', predictions.get('global', 12)),
@@ -328,6 +567,186 @@ class TimePredictionEngine:
             'status': 'success'
         }
     
+    def predict_hourly_curve(self,
+                             subreddit: str,
+                             content_type: str = 'text',
+                             hours: List[int] = None,
+                             user_data: Dict = None) -> List[Dict]:
+        """
+        Score several posting hours at once (all 24 by default)
+        
+        Builds one input row per hour and runs a single batched predict per
+        model instead of one predict per hour and model.
+        """
+        if not self.global_model:
+            return []
+        
+        if hours is None:
+            hours = list(range(24))
+        
+        if not user_data:
+            cached = self.lookup_hourly_curve(subreddit, content_type, hours)
+            if cached:
+                return cached
+        
+        base_input = self._prepare_prediction_input(subreddit, content_type, user_data)
+        X = np.tile(np.asarray(base_input, dtype=np.float32), (len(hours), 1))
+        if 'hour' in self.feature_columns:
+            X[:, self.feature_columns.index('hour')] = hours
+        
+        # One predict call per model over every requested hour
+        with MODEL_PREDICT_SECONDS.time(model='time_global'):
+            model_outputs = {'global': self.global_model.predict(X)}
+        if subreddit in self.subreddit_models:
+            with MODEL_PREDICT_SECONDS.time(model='time_subreddit'):
+                model_outputs['subreddit'] = self.subreddit_models[subreddit].predict(X)
+        content_key = f'is_{content_type}'
+        if content_key in self.content_type_models:
+            with MODEL_PREDICT_SECONDS.time(model='time_content_type'):
+                model_outputs['content_type'] = self.content_type_models[content_key].predict(X)
+        
+        curve = []
+        for i, hour in enumerate(hours):
+            predictions = {key: round(output[i]) % 24 for key, output in model_outputs.items()}
+            predictions, confidence = self._combine_predictions(predictions)
+            curve.append({
+                'hour': hour,
+                'optimal_hour': predictions.get('ensemble', predictions.get('global', 12)),
+                'predictions': predictions,
+                'confidence': confidence
+            })
+        return curve
+    
+    def build_lookup_table(self) -> Dict[str, np.ndarray]:
+        """
+        Precompute ensemble answers for every known subreddit x content type x hour
+        
+        The answer for a request without user data is the hour-0 row, since
+        the hour feature is 0 when no user data is supplied.
+        """
+        # Always score with the live models, never a previously loaded table
+        self.lookup_table = None
+        
+        subreddits = sorted(set(self.subreddit_models) | {
+            col[len('subreddit_'):] for col in self.feature_columns if col.startswith('subreddit_')
+        })
+        hours = list(range(24))
+        shape = (len(subreddits), len(CONTENT_TYPES), len(hours))
+        
+        model_hours = np.full(shape + (len(LOOKUP_MODEL_KEYS),), -1, dtype=np.int8)
+        optimal_hour = np.zeros(shape, dtype=np.int8)
+        confidence = np.zeros(shape, dtype=np.float32)
+        
+        for i, subreddit in enumerate(subreddits):
+            for j, content_type in enumerate(CONTENT_TYPES):
+                curve = self.predict_hourly_curve(subreddit, content_type, hours)
+                for k, point in enumerate(curve):
+                    optimal_hour[i, j, k] = point['optimal_hour']
+                    confidence[i, j, k] = point['confidence']
+                    for m, key in enumerate(LOOKUP_MODEL_KEYS):
+                        if key in point['predictions']:
+                            model_hours[i, j, k, m] = point['predictions'][key]
+        
+        print(f"✅ Built time lookup table for {len(subreddits)} subreddits x {len(CONTENT_TYPES)} content types")
+        return {
+            'subreddits': np.array(subreddits),
+            'content_types': np.array(CONTENT_TYPES),
+            'model_keys': np.array(LOOKUP_MODEL_KEYS),
+            'feature_columns': np.array(self.feature_columns),
+            'model_hours': model_hours,
+            'optimal_hour': optimal_hour,
+            'confidence': confidence
+        }
+    
+    def save_lookup_table(self, save_path: str = "models", table: Dict = None):
+        """
+        Build (if needed) and save the lookup table as a compressed array artifact
+        """
+        if table is None:
+            table = self.build_lookup_table()
+        if not os.path.exists(save_path):
+            os.makedirs(save_path)
+        np.savez_compressed(os.path.join(save_path, LOOKUP_TABLE_FILENAME), **table)
+        self._set_lookup_table(table)
+        print(f"✅ Lookup table saved to {save_path}")
+    
+    def _set_lookup_table(self, table: Dict):
+        self.lookup_table = {
+            **table,
+            'subreddit_index': {name: i for i, name in enumerate(table['subreddits'].tolist())},
+            'content_index': {name: j for j, name in enumerate(table['content_types'].tolist())},
+            'model_keys': table['model_keys'].tolist()
+        }
+    
+    def _lookup_indices(self, subreddit: str, content_type: str) -> Optional[Tuple[int, int]]:
+        if self.lookup_table is None:
+            return None
+        i = self.lookup_table['subreddit_index'].get(subreddit)
+        j = self.lookup_table['content_index'].get(content_type)
+        if i is None or j is None:
+            return None
+        return i, j
+    
+    def _lookup_point(self, i: int, j: int, k: int) -> Tuple[Dict, float, int]:
+        table = self.lookup_table
+        predictions = {
+            key: int(table['model_hours'][i, j, k, m])
+            for m, key in enumerate(table['model_keys'])
+            if table['model_hours'][i, j, k, m] >= 0
+        }
+        confidence = round(float(table['confidence'][i, j, k]), 2)
+        return predictions, confidence, int(table['optimal_hour'][i, j, k])
+    
+    def lookup_optimal_time(self, subreddit: str, content_type: str = 'text') -> Optional[Dict]:
+        """
+        Serve a precomputed optimal-time answer, or None if not in the table
+        """
+        indices = self._lookup_indices(subreddit, content_type)
+        if indices is None:
+            return None
+        predictions, confidence, optimal_hour = self._lookup_point(*indices, 0)
+        return {
+            'optimal_hour': optimal_hour,
+            'predictions': predictions,
+            'confidence': confidence,
+            'subreddit': subreddit,
+            'content_type': content_type,
+            'status': 'success'
+        }
+    
+    def lookup_hourly_curve(self, subreddit: str, content_type: str, hours: List[int]) -> Optional[List[Dict]]:
+        """
+        Serve a precomputed hourly curve, or None if not in the table
+        """
+        indices = self._lookup_indices(subreddit, content_type)
+        if indices is None:
+            return None
+        curve = []
+        for hour in hours:
+            predictions, confidence, optimal_hour = self._lookup_point(*indices, hour)
+            curve.append({
+                'hour': hour,
+                'optimal_hour': optimal_hour,
+                'predictions': predictions,
+                'confidence': confidence
+            })
+        return curve
+    
+    def _combine_predictions(self, predictions: Dict) -> Tuple[Dict, float]:
+        """
+        Add the weighted ensemble to per-model predictions and score their agreement
+        """
+        # Ensemble prediction (weighted average)
+        if len(predictions) > 1:
+            weights = {'global': 0.3, 'subreddit': 0.5, 'content_type': 0.2}
+            ensemble_pred = sum(predictions[key] * weights.get(key, 0.3) 
+                              for key in predictions.keys())
+            predictions['ensemble'] = round(ensemble_pred) % 24
+        
+        # Get confidence scores
+        confidence = self._calculate_confidence(predictions)
+        return predictions, confidence
+    
     def _prepare_prediction_input(self, subreddit: str, content_type: str, user_data: Dict) -> List:
         """
         Prepare input features for prediction
@@ -416,35 +835,51 @@ class TimePredictionEngine:
                     self.subreddit_models[subreddit] = model_data['model']
         
         print(f"✅ Loaded {len(self.subreddit_models)} subreddit models")
+        
+        # Load the precomputed lookup table if it was built from these models
+        lookup_path = os.path.join(load_path, LOOKUP_TABLE_FILENAME)
+        if os.path.exists(lookup_path) and self.global_model:
+            with np.load(lookup_path) as data:
+                table = {key: data[key] for key in data.files}
+            if (table['feature_columns'].tolist() == self.feature_columns and
+                    set(self.subreddit_models) <= set(table['subreddits'].tolist())):
+                self._set_lookup_table(table)
+                print(f"✅ Loaded time lookup table ({len(table['subreddits'])} subreddits)")
+            else:
+                print("⚠️  Time lookup table does not match the loaded models, using live inference")
 
 
-def train_time_prediction_system():
+def train_time_prediction_system(n_workers: int = None, model_threads: int = None):
     """
     Main function to train the complete time prediction system
+    
+    Args:
+        n_workers: Processes for per-subreddit/content-type training (0 = all cores)
+        model_threads: XGBoost threads per model (0 = cores / workers)
     """
     print("🚀 Starting Time Prediction System Training...")
     
     # Initialize engine
     engine = TimePredictionEngine()
     
-    # Load and consolidate data
-    df = engine.load_and_consolidate_data()
+    # Load consolidated, feature-engineered data (cached between runs)
+    df = engine.load_engineered_data()
     if df.empty:
         print("❌ No data available for training")
         return None
     
-    # Engineer features
-    df = engine.engineer_time_features(df)
-    
     # Create targets
     df = engine.create_optimal_time_targets(df)
     
     # Train models
-    models = engine.train_time_prediction_models(df)
+    models = engine.train_time_prediction_models(df, n_workers, model_threads)
     
     # Save models
     engine.save_models()
     
+    # Precompute answers for every subreddit x content type x hour
+    engine.save_lookup_table()
+    
     print("🎉 Time Prediction System Training Complete!")
     return engine
 
@@ -1,4 +1,5 @@
 import os
+import argparse
 import joblib
 from xgboost import XGBRegressor
 from sklearn.metrics import mean_squared_error
@@ -8,6 +9,12 @@ from sklearn.model_selection import train_test_split
 # Constants
 DATA_PATH = os.path.join("..", "data", "simfluence_reddit_training.csv")
 MODEL_SAVE_PATH = os.path.join("..", "models", "likes_predictor.pkl")
+MULTI_OUTPUT_SAVE_PATH = os.path.join("..", "models", "engagement_predictor.pkl")
+ENGAGEMENT_TARGETS = {
+    "likes": "receivedLikes",
+    "comments": "receivedComments",
+    "shares": "receivedShares",
+}
 
 def train_and_save_model():
     print("📦 Loading and preprocessing data...")
@@ -76,5 +83,45 @@ def train_and_save_model():
         "features": feature_columns
     }, os.path.join("..", "models", "shares_predictor.pkl"))
 
+def train_multi_output_model():
+    """
+    Train one multi-target XGBoost model that predicts likes, comments and
+    shares together, so inference needs a single load and a single predict
+    """
+    print("📦 Loading and preprocessing data...")
+    df, feature_columns = load_and_preprocess_data(DATA_PATH)
+
+    X = df[feature_columns]
+    y = df[list(ENGAGEMENT_TARGETS.values())]
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42
+    )
+
+    print("⚙️ Training multi-output XGBoost regression model...")
+    model = XGBRegressor()
+    model.fit(X_train, y_train)
+
+    print("🧪 Evaluating multi-output model...")
+    y_pred = model.predict(X_test)
+    for i, (target, column) in enumerate(ENGAGEMENT_TARGETS.items()):
+        mse = mean_squared_error(y_test[column], y_pred[:, i])
+        print(f"✅ {target} MSE: {mse:.2f}")
+
+    print("💾 Saving multi-output model to:", MULTI_OUTPUT_SAVE_PATH)
+    joblib.dump({
+        "model": model,
+        "features": feature_columns,
+        "targets": list(ENGAGEMENT_TARGETS)
+    }, MULTI_OUTPUT_SAVE_PATH)
+
 if __name__ == "__main__":
-    train_and_save_model()
+    parser = argparse.ArgumentParser(description="Train SimFluence engagement models")
+    parser.add_argument("--multi-output", action="store_true",
+                        help="Train one bundled likes/comments/shares model instead of three")
+    args = parser.parse_args()
+
+    if args.multi_output:
+        train_multi_output_model()
+    else:
+        train_and_save_model()
@@ -6,22 +6,48 @@ Trains models for optimal posting time prediction using timeline data
 
 import sys
 import os
+import argparse
 
 # Add current directory to path
 sys.path.append(os.path.dirname(__file__))
 
-from time_prediction import train_time_prediction_system
+from time_prediction import TimePredictionEngine, train_time_prediction_system
+
+def build_lookup_only():
+    """
+    Rebuild the precomputed lookup table from already-trained models
+    """
+    print("📋 Building time lookup table from saved models...")
+    engine = TimePredictionEngine()
+    engine.load_models()
+    if not engine.global_model:
+        print("❌ No trained models found - run training first")
+        return 1
+    engine.save_lookup_table()
+    return 0
 
 def main():
     """
     Main training function
     """
+    parser = argparse.ArgumentParser(description="Train SimFluence time prediction models")
+    parser.add_argument("--lookup-only", action="store_true",
+                        help="Only rebuild the precomputed lookup table from saved models")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes for per-subreddit training (1 = sequential, 0 = all cores)")
+    parser.add_argument("--threads-per-model", type=int, default=None,
+                        help="XGBoost threads per model (0 = cores / workers)")
+    args = parser.parse_args()
+    
+    if args.lookup_only:
+        return build_lookup_only()
+    
     print("🚀 Starting Time Prediction Model Training...")
     print("=" * 50)
     
     try:
         # Train the complete time prediction system
-        engine = train_time_prediction_system()
+        engine = train_time_prediction_system(args.workers, args.threads_per_model)
         
         if engine:
             print("\n✅ Training completed successfully!")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test script for cancelling a streaming agent run when its client goes away
+"""
+
+import sys
+import os
+import threading
+import time
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+os.environ.setdefault("LANGCHAIN_TRACING_V2", "false")
+
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.runnables import RunnableLambda
+from langchain_integration import SimFluenceLangChainAgent
+
+
+def streaming_agent(text, sleep):
+    """Stands in for the AgentExecutor: streams one slow LLM answer"""
+    llm = FakeListChatModel(responses=[text], sleep=sleep)
+
+    def run(inputs, config):
+        chunks = [chunk.content for chunk in llm.stream(inputs["input"], config=config)]
+        return {"output": "".join(chunks), "intermediate_steps": []}
+
+    agent = SimFluenceLangChainAgent.__new__(SimFluenceLangChainAgent)
+    agent.agent = RunnableLambda(run)
+    return agent
+
+
+def agent_threads():
+    return [thread for thread in threading.enumerate() if thread.name == "agent-stream" and thread.is_alive()]
+
+
+def test_full_stream():
+    """Tokens are forwarded as they are produced, then the final result"""
+    print("🧪 Testing agent event stream...")
+    events = list(streaming_agent("hello", sleep=0)._agent_events({"input": "hi"}))
+    assert "".join(data["text"] for event, data in events if event == "token") == "hello"
+    assert events[-1] == ("final", {"output": "hello", "steps": []})
+    print("   ✅ Tokens streamed, then the final result")
+
+
+def test_close_cancels_agent():
+    """Closing the stream stops the agent and waits for its thread"""
+    events = streaming_agent("x" * 200, sleep=0.01)._agent_events({"input": "hi"})
+    assert next(events)[0] == "token"
+
+    start = time.perf_counter()
+    events.close()
+    elapsed = time.perf_counter() - start
+
+    # The full answer would take two more seconds to stream
+    assert elapsed < 0.5
+    assert not agent_threads()
+    print(f"   ✅ Agent stopped {elapsed * 1000:.0f}ms after the client went away")
+
+
+if __name__ == "__main__":
+    test_full_stream()
+    test_close_cancels_agent()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test script for the asyncio SimFluence AI client
+Runs against a local aiohttp stub server with a fixed delay per endpoint
+"""
+
+import asyncio
+import sys
+import os
+import time
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aiohttp import web
+
+from async_ai_client import AsyncSimFluenceAIClient, integrate_with_backend_service_async, run_concurrently
+
+DELAY = 0.2
+
+
+async def start_stub_server():
+    """Stub API where each endpoint takes DELAY seconds; records client ports"""
+    peers = []
+
+    def slow(body):
+        async def handler(request):
+            peers.append(request.transport.get_extra_info("peername")[1])
+            await asyncio.sleep(DELAY)
+            return web.json_response(body)
+        return handler
+
+    app = web.Application()
+    app.router.add_post("/predict/engagement", slow({"predicted_likes": 42, "engagement_score": 5, "status": "success"}))
+    app.router.add_post("/generate/caption", slow({"caption": "Stub caption", "status": "success"}))
+    app.router.add_post("/analyze/sentiment", slow({"sentiment": "positive", "status": "success"}))
+    app.router.add_get("/health", slow({"status": "healthy"}))
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{port}", peers
+
+
+async def _concurrent_integration():
+    runner, base_url, _ = await start_stub_server()
+    try:
+        async with AsyncSimFluenceAIClient(base_url) as client:
+            start = time.perf_counter()
+            result = await integrate_with_backend_service_async(
+                "Loving this new framework!", {"karma": 5000, "followers": 300}, client=client)
+            elapsed = time.perf_counter() - start
+    finally:
+        await runner.cleanup()
+    return result, elapsed
+
+
+def test_integration_pays_one_round_trip():
+    """Engagement, caption and sentiment calls overlap instead of adding up"""
+    print("🧪 Testing concurrent backend integration...")
+
+    result, elapsed = asyncio.run(_concurrent_integration())
+    print(f"   ⏱️ Three {DELAY}s calls took {elapsed:.2f}s")
+
+    assert result["optimized_caption"] == "Stub caption"
+    assert result["sentiment_analysis"] == "positive"
+    assert result["ai_confidence"] == 5
+    assert elapsed < DELAY * 2
+    print("   ✅ Calls issued concurrently")
+
+
+async def _keep_alive_and_timeouts():
+    runner, base_url, peers = await start_stub_server()
+    try:
+        async with AsyncSimFluenceAIClient(base_url) as client:
+            for _ in range(3):
+                assert (await client.health_check())["status"] == "healthy"
+            timed_out = await client.analyze_sentiment("hello", timeout=DELAY / 4)
+            failed = await run_concurrently({
+                "missing": client.get_time_prediction_status(),
+                "ok": client.analyze_sentiment("hello"),
+            })
+    finally:
+        await runner.cleanup()
+    return peers, timed_out, failed
+
+
+def test_keep_alive_and_per_call_timeout():
+    """Sequential calls share one connection; timeouts become error dicts"""
+    peers, timed_out, failed = asyncio.run(_keep_alive_and_timeouts())
+
+    assert len(set(peers[:3])) == 1
+    print("   ✅ Sequential calls reused one keep-alive connection")
+
+    assert timed_out["status"] == "error"
+    assert "timed out" in timed_out["error"]
+    assert failed["missing"]["status"] == "error"
+    assert failed["ok"]["sentiment"] == "positive"
+    print("   ✅ Per-call timeout and errors reported without cancelling other calls")
+
+
+async def _batch_with_bad_post():
+    requests_seen = []
+
+    async def predict_batch(request):
+        posts = (await request.json())["posts"]
+        requests_seen.append(len(posts))
+        if any(post["length"] < 0 for post in posts):
+            return web.json_response({"error": "Batch prediction failed"}, status=500)
+        return web.json_response({"predictions": [{"predicted_likes": post["length"]} for post in posts],
+                                  "status": "success"})
+
+    app = web.Application()
+    app.router.add_post("/predict/batch", predict_batch)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    base_url = f"http://127.0.0.1:{runner.addresses[0][1]}"
+
+    try:
+        async with AsyncSimFluenceAIClient(base_url, auto_batch=True, batch_window_ms=20) as client:
+            results = await asyncio.gather(*[
+                client.batcher.submit({"length": length}) for length in [10, 20, -1, 40]
+            ])
+            stats = client.batcher.stats()
+    finally:
+        await runner.cleanup()
+    return results, requests_seen, stats
+
+
+def test_bad_post_fails_alone():
+    """A batch rejected because of one post is retried post by post"""
+    results, requests_seen, stats = asyncio.run(_batch_with_bad_post())
+
+    assert requests_seen == [4, 1, 1, 1, 1]
+    assert results[2]["status"] == "error"
+    assert [results[i]["predicted_likes"] for i in (0, 1, 3)] == [10, 20, 40]
+    assert stats["isolated_retries"] == 1
+    print("   ✅ Only the malformed post's call failed")
+
+
+if __name__ == "__main__":
+    test_integration_pays_one_round_trip()
+    test_keep_alive_and_per_call_timeout()
+    test_bad_post_fails_alone()
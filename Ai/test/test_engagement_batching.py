@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test script for client-side auto-batching of engagement predictions
+"""
+
+import asyncio
+import sys
+import os
+import threading
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aiohttp import web
+
+from ai_client import EngagementBatcher, SimFluenceAIClient, engagement_payload
+from async_ai_client import AsyncSimFluenceAIClient
+
+
+def fake_predictions(posts):
+    """One prediction per post, derived from its length so results are traceable"""
+    return [{"predicted_likes": post["length"], "status": "success"} for post in posts]
+
+
+def test_threaded_calls_share_batches():
+    """Concurrent callers are coalesced and each gets its own result"""
+    print("🧪 Testing threaded engagement batcher...")
+
+    sent = []
+
+    def send_batch(posts):
+        sent.append(len(posts))
+        return fake_predictions(posts)
+
+    batcher = EngagementBatcher(send_batch, window_ms=50, max_batch_size=8)
+    results = {}
+
+    def call(i):
+        payload = engagement_payload({}, {}, content="x" * i)
+        results[i] = batcher.submit(payload).result()
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(1, 21)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+
+    print(f"   📦 Batch sizes: {sent}")
+    assert all(results[i]["predicted_likes"] == i for i in range(1, 21))
+    assert sum(sent) == 20
+    assert max(sent) <= 8
+    assert len(sent) < 20
+    assert batcher.stats()["items"] == 20
+    print("   ✅ Results routed back to their callers")
+
+
+def test_failed_batch_reports_errors():
+    def send_batch(posts):
+        raise ConnectionError("service down")
+
+    batcher = EngagementBatcher(send_batch, window_ms=1)
+    result = batcher.submit(engagement_payload({}, {}, "hello")).result()
+    batcher.close()
+
+    assert result["status"] == "error"
+    assert "service down" in result["error"]
+    print("   ✅ Failed batch resolves every caller with an error")
+
+
+def test_bad_post_fails_alone():
+    """A post that breaks its batch is retried alone; the others still succeed"""
+    sent = []
+
+    def send_batch(posts):
+        sent.append(len(posts))
+        return [{"predicted_likes": int(post["length"]), "status": "success"} for post in posts]
+
+    batcher = EngagementBatcher(send_batch, window_ms=100, max_batch_size=4)
+    futures = {length: batcher.submit({"length": length}) for length in ["10", "20", "abc", "40"]}
+    results = {length: future.result() for length, future in futures.items()}
+    batcher.close()
+
+    assert sent == [4, 1, 1, 1, 1]
+    assert results["abc"]["status"] == "error"
+    assert [results[length]["predicted_likes"] for length in ["10", "20", "40"]] == [10, 20, 40]
+    assert batcher.stats()["isolated_retries"] == 1
+    print("   ✅ Malformed post isolated from the rest of its batch")
+
+
+def test_unreachable_server_not_retried():
+    """Connection failures are not retried post by post"""
+    client = SimFluenceAIClient("http://127.0.0.1:9", auto_batch=True, batch_window_ms=50)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(client.predict_engagement({}, {}, "hi")))
+               for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = client.batcher.stats()
+    client.close()
+
+    assert all(result["status"] == "error" for result in results)
+    assert stats["isolated_retries"] == 0
+    print("   ✅ Unreachable server fails the batch without per-post retries")
+
+
+async def _async_batching():
+    requests_seen = []
+
+    async def predict_batch(request):
+        posts = (await request.json())["posts"]
+        requests_seen.append(len(posts))
+        return web.json_response({"predictions": fake_predictions(posts), "status": "success"})
+
+    app = web.Application()
+    app.router.add_post("/predict/batch", predict_batch)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    base_url = f"http://127.0.0.1:{runner.addresses[0][1]}"
+
+    try:
+        async with AsyncSimFluenceAIClient(base_url, auto_batch=True,
+                                           batch_window_ms=20, max_batch_size=16) as client:
+            results = await asyncio.gather(*[
+                client.predict_engagement({}, {}, content="x" * i) for i in range(1, 41)
+            ])
+    finally:
+        await runner.cleanup()
+    return results, requests_seen
+
+
+def test_async_calls_share_batches():
+    """Concurrent coroutines become a few /predict/batch requests"""
+    print("🧪 Testing asyncio engagement batcher...")
+
+    results, requests_seen = asyncio.run(_async_batching())
+
+    print(f"   📦 Batch sizes: {requests_seen}")
+    assert [result["predicted_likes"] for result in results] == list(range(1, 41))
+    assert requests_seen == [16, 16, 8]
+    print("   ✅ 40 calls sent as 3 batch requests")
+
+
+if __name__ == "__main__":
+    test_threaded_calls_share_batches()
+    test_failed_batch_reports_errors()
+    test_bad_post_fails_alone()
+    test_unreachable_server_not_retried()
+    test_async_calls_share_batches()
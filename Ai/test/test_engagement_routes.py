@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script for the engagement fields of /predict/engagement and /optimize/post
+"""
+
+import sys
+import os
+
+# api/ must come first: both api/ and src/ have a utils module
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+os.environ.setdefault("LANGCHAIN_TRACING_V2", "false")
+
+from flask import Flask
+from predict import predict_batch
+from routes.engagement import engagement_bp
+from routes.optimize import optimize_bp
+
+POST = {"length": 140, "containsImage": 1, "userFollowers": 800, "userKarma": 5200,
+        "dayOfWeek": "Monday", "postTimeOfDay": "Morning"}
+
+
+def make_client():
+    app = Flask(__name__)
+    app.register_blueprint(engagement_bp)
+    app.register_blueprint(optimize_bp)
+    return app.test_client()
+
+
+def test_engagement_uses_every_model():
+    """Comments and shares come from their own models, not a ratio of likes"""
+    print("🧪 Testing /predict/engagement...")
+
+    expected = predict_batch([POST], raw=True)[0]
+    response = make_client().post('/predict/engagement', json=POST)
+    body = response.get_json()
+
+    assert response.status_code == 200
+    assert body["predicted_likes"] == max(0, int(expected["likes"]))
+    assert body["predicted_comments"] == max(0, int(expected["comments"]))
+    assert body["predicted_shares"] == max(0, int(expected["shares"]))
+    assert body["engagement_score"] == int((body["predicted_likes"] + body["predicted_comments"] * 2) / 10)
+    print(f"   ✅ {body['predicted_likes']} likes, {body['predicted_comments']} comments, "
+          f"{body['predicted_shares']} shares")
+
+
+def test_optimize_post_engagement():
+    """/optimize/post reports the same three model outputs"""
+    response = make_client().post('/optimize/post', json={
+        "content": "x" * POST["length"],
+        "user_data": {"userFollowers": 800, "userKarma": 5200},
+        "post_settings": {"containsImage": True, "dayOfWeek": "Monday", "postTimeOfDay": "Morning"},
+        "optimization_goals": ["engagement"],
+    })
+    engagement = response.get_json()["results"]["engagement_prediction"]
+    expected = predict_batch([{**POST, "topCommentSentiment": "Positive"}], raw=True)[0]
+
+    assert response.status_code == 200
+    assert engagement["predicted_likes"] == round(expected["likes"], 1)
+    assert engagement["predicted_comments"] == max(0, int(expected["comments"]))
+    assert engagement["predicted_shares"] == max(0, int(expected["shares"]))
+    print("   ✅ /optimize/post engagement includes model comments and shares")
+
+
+def test_bad_input_rejected():
+    response = make_client().post('/predict/engagement', json={"length": "abc"})
+    assert response.status_code == 500
+    print("   ✅ Malformed input fails with a 500")
+
+
+if __name__ == "__main__":
+    test_engagement_uses_every_model()
+    test_optimize_post_engagement()
+    test_bad_input_rejected()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script for the compiled engagement feature encoder
+"""
+
+import sys
+import os
+
+# api/ must come first: both api/ and src/ have a utils module
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+from feature_encoder import FeatureEncoder
+from utils import transform_input_features
+
+FEATURE_COLUMNS = [
+    'length', 'containsImage', 'userFollowers', 'userFollowing', 'userKarma',
+    'accountAgeDays', 'avgEngagementRate', 'avgLikes', 'avgComments', 'shouldImprove',
+    'postTimeOfDay_Afternoon', 'postTimeOfDay_Evening', 'postTimeOfDay_Morning', 'postTimeOfDay_Night',
+    'dayOfWeek_Friday', 'dayOfWeek_Monday', 'dayOfWeek_Saturday', 'dayOfWeek_Sunday',
+    'dayOfWeek_Thursday', 'dayOfWeek_Tuesday', 'dayOfWeek_Wednesday',
+    'topCommentSentiment_Negative', 'topCommentSentiment_Neutral', 'topCommentSentiment_Positive'
+]
+
+
+def test_raw_encoding_matches_transform():
+    """Encoding raw posts gives the same matrix as transform + column lookup"""
+    print("🧪 Testing feature encoder...")
+
+    posts = [
+        {},
+        {"length": 120, "containsImage": True, "userKarma": 4500, "dayOfWeek": "Monday",
+         "postTimeOfDay": "Morning", "topCommentSentiment": "Neutral"},
+        {"length": 40, "dayOfWeek": "Sunday", "postTimeOfDay": "Night",
+         "topCommentSentiment": "Negative", "userFollowing": 99},
+    ]
+
+    encoder = FeatureEncoder(FEATURE_COLUMNS)
+    raw_matrix = encoder.encode(posts)
+    transformed_matrix = encoder.encode_transformed(
+        [transform_input_features(post) for post in posts])
+
+    assert raw_matrix.dtype == np.float32
+    assert raw_matrix.shape == (len(posts), len(FEATURE_COLUMNS))
+    assert np.array_equal(raw_matrix, transformed_matrix)
+
+    # Defaults: Friday / Evening / Positive
+    row = dict(zip(FEATURE_COLUMNS, raw_matrix[0]))
+    assert row['dayOfWeek_Friday'] == 1
+    assert row['postTimeOfDay_Evening'] == 1
+    assert row['topCommentSentiment_Positive'] == 1
+    assert row['accountAgeDays'] == 365
+    print("   ✅ Raw and transformed encodings match")
+
+
+def test_user_following_encoded():
+    """userFollowing fills its model column; it stays 0 when not sent"""
+    posts = [{"userFollowing": 300}, {}]
+    encoder = FeatureEncoder(FEATURE_COLUMNS)
+    column = FEATURE_COLUMNS.index('userFollowing')
+
+    assert encoder.encode(posts)[:, column].tolist() == [300, 0]
+    assert transform_input_features(posts[0])['userFollowing'] == 300
+    assert encoder.encode_transformed([transform_input_features(post) for post in posts])[:, column].tolist() == [300, 0]
+    print("   ✅ userFollowing column encoded")
+
+
+if __name__ == "__main__":
+    test_raw_encoding_matches_transform()
+    test_user_following_encoded()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for the Gemini response cache
+"""
+
+import sys
+import os
+import time
+import tempfile
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from llm_cache import LLMResponseCache, MemoryBackend, DiskBackend
+
+TEMPLATE = "Create an engaging {platform} caption for: {prompt}"
+
+
+def test_hits_and_key_normalization():
+    """Identical prompts are computed once; whitespace and key order do not matter"""
+    print("🧪 Testing LLM response cache...")
+
+    cache = LLMResponseCache(MemoryBackend())
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"status": "success", "caption": "Hello Reddit"}
+
+    inputs = {"platform": "reddit", "prompt": "my cat", "context": {"a": 1, "b": 2}}
+    first = cache.get_or_compute("caption", TEMPLATE, inputs, compute)
+    second = cache.get_or_compute(
+        "caption", "  Create an engaging {platform}\n caption for: {prompt} ",
+        {"context": {"b": 2, "a": 1}, "prompt": " my cat ", "platform": "reddit"}, compute)
+
+    assert first == second
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    print(f"   📊 {stats}")
+
+    # A different namespace or input is a separate entry
+    cache.get_or_compute("optimize", TEMPLATE, inputs, compute)
+    cache.get_or_compute("caption", TEMPLATE, dict(inputs, prompt="my dog"), compute)
+    assert len(calls) == 3
+    print("   ✅ Repeated prompts served from cache")
+
+
+def test_errors_not_cached():
+    """Responses rejected by should_cache are recomputed"""
+    cache = LLMResponseCache(MemoryBackend())
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"status": "error"}
+
+    for _ in range(2):
+        cache.get_or_compute("caption", TEMPLATE, {"prompt": "x"}, compute,
+                             should_cache=lambda r: r["status"] == "success")
+    assert len(calls) == 2
+    print("   ✅ Failed responses are not cached")
+
+
+def test_ttl_and_lru_eviction():
+    """Entries expire after the TTL and the least recently used is evicted"""
+    cache = LLMResponseCache(MemoryBackend(max_entries=2), ttl=0.05)
+    cache.set("caption", TEMPLATE, {"prompt": "a"}, "A")
+    cache.set("caption", TEMPLATE, {"prompt": "b"}, "B")
+    assert cache.get("caption", TEMPLATE, {"prompt": "a"}) == "A"
+    cache.set("caption", TEMPLATE, {"prompt": "c"}, "C")
+    assert cache.get("caption", TEMPLATE, {"prompt": "b"}) is None
+    assert cache.get("caption", TEMPLATE, {"prompt": "a"}) == "A"
+
+    time.sleep(0.06)
+    assert cache.get("caption", TEMPLATE, {"prompt": "a"}) is None
+    print("   ✅ TTL expiry and LRU eviction work")
+
+
+def test_disk_backend():
+    """The disk backend persists entries across cache instances"""
+    with tempfile.TemporaryDirectory() as directory:
+        LLMResponseCache(DiskBackend(directory)).set(
+            "caption", TEMPLATE, {"prompt": "a"}, {"caption": "A", "hashtags": ["#a"]})
+
+        cache = LLMResponseCache(DiskBackend(directory))
+        assert cache.get("caption", TEMPLATE, {"prompt": "a"}) == {"caption": "A", "hashtags": ["#a"]}
+
+        expiring = LLMResponseCache(DiskBackend(directory), ttl=-1)
+        expiring.set("caption", TEMPLATE, {"prompt": "b"}, "B")
+        assert expiring.get("caption", TEMPLATE, {"prompt": "b"}) is None
+        assert len(expiring.backend) == 1
+    print("   ✅ Disk backend persists and expires entries")
+
+
+if __name__ == "__main__":
+    test_hits_and_key_normalization()
+    test_errors_not_cached()
+    test_ttl_and_lru_eviction()
+    test_disk_backend()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script for the Prometheus metrics registry and LLM call timing
+"""
+
+import json
+import sys
+import os
+import tempfile
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+os.environ.setdefault("LANGCHAIN_TRACING_V2", "false")
+
+from metrics import MetricsRegistry, LLM_CALL_SECONDS, mark_process_dead
+
+
+def test_text_exposition():
+    """Counters, histograms and collectors render in Prometheus text format"""
+    print("🧪 Testing metrics registry...")
+
+    registry = MetricsRegistry()
+    requests = registry.counter("test_requests_total", "Requests", ["route"])
+    latency = registry.histogram("test_latency_seconds", "Latency", ["route"], buckets=(0.1, 1.0))
+    requests.inc(route="/a")
+    requests.inc(2, route="/a")
+    latency.observe(0.05, route="/a")
+    latency.observe(0.5, route="/a")
+    latency.observe(5, route="/a")
+    registry.register_collector(lambda: [("test_hit_ratio", "gauge", "Hit ratio", [({"cache": "x"}, 0.25)])])
+
+    text = registry.render()
+    print(text)
+    assert "# TYPE test_requests_total counter" in text
+    assert 'test_requests_total{route="/a"} 3' in text
+    assert 'test_latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 'test_latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'test_latency_seconds_count{route="/a"} 3' in text
+    assert 'test_latency_seconds_sum{route="/a"} 5.55' in text
+    assert 'test_hit_ratio{cache="x"} 0.25' in text
+    print("   ✅ Exposition format rendered")
+
+
+def test_label_mismatch_rejected():
+    registry = MetricsRegistry()
+    counter = registry.counter("test_total", "Test", ["route"])
+    assert registry.counter("test_total", "Test", ["route"]) is counter
+    try:
+        counter.inc(status="200")
+    except ValueError:
+        print("   ✅ Metrics re-registered by name; wrong labels rejected")
+        return
+    raise AssertionError("Expected ValueError for unknown label")
+
+
+def test_workers_aggregated():
+    """Counters and histograms sum across worker files; gauges stay per worker"""
+    with tempfile.TemporaryDirectory() as directory:
+        registry = MetricsRegistry(directory)
+        requests = registry.counter("test_requests_total", "Requests", ["route"])
+        latency = registry.histogram("test_latency_seconds", "Latency", buckets=(1.0,))
+        in_flight = registry.gauge("test_in_flight", "In flight")
+        requests.inc(2, route="/a")
+        latency.observe(0.5)
+        in_flight.inc()
+
+        # What another worker (pid 999) last wrote
+        other = MetricsRegistry()
+        other.counter("test_requests_total", "Requests", ["route"]).inc(3, route="/a")
+        other.histogram("test_latency_seconds", "Latency", buckets=(1.0,)).observe(2.0)
+        other.gauge("test_in_flight", "In flight").inc(4)
+        with open(os.path.join(directory, "metrics_999.json"), "w") as f:
+            json.dump(other.collect(), f)
+
+        text = registry.render()
+        assert 'test_requests_total{route="/a"} 5' in text
+        assert 'test_latency_seconds_bucket{le="1"} 1' in text
+        assert 'test_latency_seconds_count 2' in text
+        assert f'test_in_flight{{pid="{os.getpid()}"}} 1' in text
+        assert 'test_in_flight{pid="999"} 4' in text
+        print("   ✅ Scrape merges every worker's values")
+
+        # Its counters outlive it; its gauge does not
+        mark_process_dead(999, directory)
+        text = registry.render()
+        assert not os.path.exists(os.path.join(directory, "metrics_999.json"))
+        assert 'test_requests_total{route="/a"} 5' in text
+        assert 'test_latency_seconds_count 2' in text
+        assert 'pid="999"' not in text
+        print("   ✅ Exited worker's counters kept, its gauges dropped")
+
+
+def test_llm_calls_timed():
+    """The callback handler attached to the chat model records each call"""
+    from langchain_core.language_models import FakeListChatModel
+    from langchain_integration import LLMMetricsHandler
+
+    llm = FakeListChatModel(responses=["first", "second"], callbacks=[LLMMetricsHandler("fake")])
+    llm.invoke("hello")
+    list(llm.stream("hello again"))
+
+    text = LLM_CALL_SECONDS.render()
+    assert 'simfluence_llm_call_duration_seconds_count{model="fake",outcome="success"} 2' in text
+    print("   ✅ Invoke and stream calls timed")
+
+
+if __name__ == "__main__":
+    test_text_exposition()
+    test_label_mismatch_rejected()
+    test_workers_aggregated()
+    test_llm_calls_timed()
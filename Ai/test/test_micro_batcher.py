@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for server-side micro-batching of single-row predictions
+"""
+
+import sys
+import os
+import threading
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from micro_batcher import MicroBatcher
+
+
+def run_concurrently(batcher, values):
+    results = {}
+
+    def call(value):
+        results[value] = batcher.predict(value)
+
+    threads = [threading.Thread(target=call, args=(value,)) for value in values]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_calls_share_one_predict():
+    """Concurrent single-row calls are flushed together and routed back"""
+    print("🧪 Testing micro-batcher...")
+
+    calls = []
+
+    def predict_batch(rows):
+        calls.append(len(rows))
+        return [row * 10 for row in rows]
+
+    batcher = MicroBatcher("test", predict_batch, max_batch_size=8, max_wait_ms=50)
+    results = run_concurrently(batcher, range(20))
+
+    stats = batcher.stats()
+    print(f"   📦 Batch sizes: {stats['batch_sizes']}, flushes: {stats['flushes']}")
+    assert results == {value: value * 10 for value in range(20)}
+    assert stats["items"] == 20
+    assert len(calls) < 20
+    assert max(calls) <= 8
+    assert stats["flushes"]["full"] >= 1
+    print("   ✅ Each caller got its own row from a shared predict")
+
+
+def test_lone_call_flushes_at_deadline():
+    batcher = MicroBatcher("test", lambda rows: [row + 1 for row in rows],
+                           max_batch_size=8, max_wait_ms=5)
+    assert batcher.predict(1) == 2
+    assert batcher.stats()["flushes"] == {"full": 0, "deadline": 1}
+    print("   ✅ A lone call is flushed when the wait deadline passes")
+
+
+def test_disabled_and_errors():
+    """Wait of 0 predicts inline; predict errors reach every caller"""
+    direct = MicroBatcher("direct", lambda rows: [row for row in rows], max_wait_ms=0)
+    assert not direct.enabled
+    assert direct.predict(3) == 3
+    assert direct.stats()["batches"] == 0
+
+    def failing(rows):
+        raise ValueError("bad features")
+
+    batcher = MicroBatcher("failing", failing, max_batch_size=4, max_wait_ms=5)
+    try:
+        batcher.predict(1)
+    except ValueError:
+        assert batcher.stats()["errors"] == 1
+        print("   ✅ Disabled batcher predicts inline; errors propagate")
+        return
+    raise AssertionError("Expected ValueError from failing predict")
+
+
+def test_poison_row_fails_alone():
+    """A malformed row batched with good ones only fails its own caller"""
+    def predict_batch(rows):
+        return [float(row) * 2 for row in rows]
+
+    batcher = MicroBatcher("poison", predict_batch, max_batch_size=6, max_wait_ms=100)
+    outcomes = {}
+
+    def call(value):
+        try:
+            outcomes[value] = batcher.predict(value)
+        except ValueError as e:
+            outcomes[value] = e
+
+    values = ["1", "2", "abc", "4", "5", "6"]
+    threads = [threading.Thread(target=call, args=(value,)) for value in values]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert isinstance(outcomes["abc"], ValueError)
+    assert {value: outcomes[value] for value in values if value != "abc"} == {
+        "1": 2.0, "2": 4.0, "4": 8.0, "5": 10.0, "6": 12.0}
+    assert batcher.stats()["isolated_retries"] >= 1
+    print("   ✅ Poison row isolated; good rows in its batch still succeed")
+
+
+if __name__ == "__main__":
+    test_concurrent_calls_share_one_predict()
+    test_lone_call_flushes_at_deadline()
+    test_disabled_and_errors()
+    test_poison_row_fails_alone()
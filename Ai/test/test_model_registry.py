@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script for the engagement model registry
+"""
+
+import sys
+import os
+import tempfile
+import threading
+from unittest import mock
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from model_registry import ModelRegistry
+
+MODELS_DIR = os.path.join(os.path.dirname(__file__), '..', 'models')
+
+
+def test_model_loaded_once():
+    """Concurrent first access deserializes the artifact a single time"""
+    print("🧪 Testing model registry...")
+
+    registry = ModelRegistry(MODELS_DIR)
+    registry.register("likes", "likes_predictor.pkl")
+    assert not registry.is_loaded("likes")
+
+    payloads = []
+    threads = [threading.Thread(target=lambda: payloads.append(registry.get("likes")))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(payloads) == 8
+    assert all(p is payloads[0] for p in payloads)
+    assert "model" in payloads[0] and "features" in payloads[0]
+
+    stats = registry.stats()["likes"]
+    print(f"   📊 Load time: {stats['load_time_ms']} ms, memory: {stats['memory_bytes']} bytes")
+    assert stats["loaded"]
+    assert stats["memory_bytes"] > 0
+    print("   ✅ Model loaded once and shared")
+
+
+def test_unknown_model():
+    """Unregistered names raise instead of silently loading"""
+    registry = ModelRegistry(MODELS_DIR)
+    try:
+        registry.get("missing")
+    except KeyError:
+        print("   ✅ Unknown model rejected")
+        return
+    raise AssertionError("Expected KeyError for unregistered model")
+
+
+def test_missing_artifact_checked_once():
+    """An absent optional model costs one disk check, not one per prediction"""
+    with tempfile.TemporaryDirectory() as directory:
+        registry = ModelRegistry(directory)
+        registry.register("engagement", "engagement_predictor.pkl")
+
+        with mock.patch("model_registry.os.path.exists", wraps=os.path.exists) as exists:
+            assert not any(registry.exists("engagement") for _ in range(100))
+        assert exists.call_count == 1
+
+        # A newly written artifact is picked up after an evict
+        open(os.path.join(directory, "engagement_predictor.pkl"), "wb").close()
+        assert not registry.exists("engagement")
+        registry.evict("engagement")
+        assert registry.exists("engagement")
+    print("   ✅ Artifact presence cached until evicted")
+
+
+if __name__ == "__main__":
+    test_model_loaded_once()
+    test_unknown_model()
+    test_missing_artifact_checked_once()
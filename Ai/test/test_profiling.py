@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test script for the request profilers and their flame-graph output
+"""
+
+import json
+import sys
+import os
+import tempfile
+import threading
+import time
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from concurrency import run_stages
+from profiling import SamplingProfiler, TracingProfiler, to_collapsed, write_profile
+
+
+def busy_leaf(seconds):
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += 1
+    return total
+
+
+def busy_parent():
+    return busy_leaf(0.05)
+
+
+def frames_named(stacks, name):
+    return sum(weight for stack, weight in stacks.items() if any(frame[0] == name for frame in stack))
+
+
+def test_sampling_profiler():
+    """Samples of a busy loop land under busy_parent -> busy_leaf"""
+    print("🧪 Testing sampling profiler...")
+
+    profiler = SamplingProfiler(interval_ms=1)
+    profiler.start()
+    busy_parent()
+    stacks = profiler.stop()
+
+    leaf_time = frames_named(stacks, "busy_leaf")
+    print(f"   📊 {len(stacks)} distinct stacks, {leaf_time / 1000:.1f}ms in busy_leaf")
+    assert leaf_time > 25_000
+    names = [[frame[0] for frame in stack] for stack in stacks]
+    assert any("busy_parent" in stack and stack.index("busy_parent") < stack.index("busy_leaf")
+               for stack in names if "busy_leaf" in stack)
+    print("   ✅ Busy loop attributed to its call path")
+
+
+def test_tracing_profiler():
+    """Every call is recorded, including built-ins"""
+    profiler = TracingProfiler()
+    profiler.start()
+    busy_parent()
+    stacks = profiler.stop()
+
+    # Time spent in the profiler's own callback is not counted
+    assert frames_named(stacks, "busy_leaf") > 0.9 * sum(stacks.values())
+    assert any(frame[1] == "<built-in>" and frame[0] == "perf_counter"
+               for stack in stacks for frame in stack)
+    print("   ✅ Tracing profiler recorded Python and built-in calls")
+
+
+def predict_stage():
+    return busy_leaf(0.04)
+
+
+def sentiment_stage():
+    return busy_leaf(0.04)
+
+
+def handle_request():
+    """Shaped like /optimize/post: the work runs on the stage executor"""
+    return run_stages({"predict": predict_stage, "sentiment": sentiment_stage})
+
+
+def test_sampling_follows_stage_threads():
+    """Work fanned out through run_stages is sampled on the executor threads"""
+    profiler = SamplingProfiler(interval_ms=1)
+    profiler.start()
+    handle_request()
+    stacks = profiler.stop()
+
+    names = [[frame[0] for frame in stack] for stack in stacks]
+    for stage in ("predict_stage", "sentiment_stage"):
+        stage_stacks = [stack for stack in names if stage in stack]
+        assert stage_stacks, stage
+        assert all(stack[0].startswith("thread stage") for stack in stage_stacks)
+    assert frames_named(stacks, "busy_leaf") > 25_000
+    # The request thread itself only waits on the futures
+    assert any(stack[0] == f"thread {threading.current_thread().name}" and "handle_request" in stack
+               for stack in names)
+    print("   ✅ Stage executor frames sampled under their thread names")
+
+
+def test_tracing_follows_new_threads():
+    """Threads started during a traced request get their own stacks"""
+    profiler = TracingProfiler()
+    profiler.start()
+    worker = threading.Thread(target=busy_parent, name="traced-worker")
+    worker.start()
+    worker.join()
+    stacks = profiler.stop()
+
+    worker_stacks = [stack for stack in stacks if stack[0][0] == "thread traced-worker"]
+    assert any(frame[0] == "busy_leaf" for stack in worker_stacks for frame in stack)
+    print("   ✅ Tracing profiler followed work onto another thread")
+
+
+def test_output_formats():
+    """Collapsed stacks and speedscope files are written per profile"""
+    stacks = {
+        (("handler", "/app/api.py", 10),): 150.0,
+        (("handler", "/app/api.py", 10), ("predict", "/app/model.py", 3)): 850.4,
+    }
+
+    collapsed = to_collapsed(stacks)
+    assert "handler (api.py:10) 150" in collapsed
+    assert "handler (api.py:10);predict (model.py:3) 850" in collapsed
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "nested", "profile.speedscope.json")
+        write_profile(stacks, path, "POST /predict", fmt="speedscope")
+        with open(path) as f:
+            document = json.load(f)
+
+    profile = document["profiles"][0]
+    assert profile["type"] == "sampled"
+    assert [frame["name"] for frame in document["shared"]["frames"]] == ["handler", "predict"]
+    assert profile["samples"] == [[0], [0, 1]]
+    assert profile["endValue"] == 1000.4
+    print("   ✅ Collapsed and speedscope output written")
+
+
+if __name__ == "__main__":
+    test_sampling_profiler()
+    test_tracing_profiler()
+    test_sampling_follows_stage_threads()
+    test_tracing_follows_new_threads()
+    test_output_formats()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test script for batch sentiment analysis
+"""
+
+import sys
+import os
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sentiment_analyzer import analyze_sentiment, analyze_sentiment_batch
+
+TEXTS = [
+    "I love this, it's amazing!",
+    "This is terrible and broken",
+    "It's okay I guess",
+    "Great work, really helpful",
+    "",
+]
+
+
+def test_batch_matches_single_calls():
+    """Process-pool batches return the single-text results, in input order"""
+    print("🧪 Testing batch sentiment analysis...")
+
+    expected = [analyze_sentiment(text) for text in TEXTS]
+    sequential = analyze_sentiment_batch(TEXTS, parallel=False)
+    parallel = analyze_sentiment_batch(TEXTS * 4, parallel=True, chunk_size=3)
+
+    assert sequential["results"] == expected
+    assert parallel["results"] == expected * 4
+
+    distribution = parallel["distribution"]
+    print(f"   📊 {distribution}")
+    assert distribution["total"] == len(TEXTS) * 4
+    assert sum(distribution["counts"].values()) == distribution["total"]
+    assert distribution["counts"]["positive"] == 8
+    print("   ✅ Batch results match single-text analysis")
+
+
+def test_empty_batch():
+    batch = analyze_sentiment_batch([])
+    assert batch["results"] == []
+    assert batch["distribution"]["total"] == 0
+    print("   ✅ Empty batch handled")
+
+
+if __name__ == "__main__":
+    test_batch_matches_single_calls()
+    test_empty_batch()
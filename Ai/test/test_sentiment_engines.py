@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script for the sentiment engine registry and its result cache
+"""
+
+import sys
+import os
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sentiment_analyzer import SentimentEngineRegistry, TextBlobEngine, KeywordEngine, analyze_sentiment
+
+
+class CountingEngine:
+    """Keyword engine that counts how often it actually scores a text"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def analyze(self, text):
+        self.calls += 1
+        return KeywordEngine().analyze(text)
+
+
+def test_engines_are_long_lived():
+    """Each engine is built once and reused"""
+    print("🧪 Testing sentiment engine registry...")
+
+    registry = SentimentEngineRegistry()
+    registry.register("textblob", TextBlobEngine)
+    registry.register("keyword", KeywordEngine)
+    assert registry.get("keyword") is registry.get("keyword")
+
+    text = "I love this, it's amazing!"
+    assert registry.analyze(text, "textblob") == analyze_sentiment(text)
+    assert registry.analyze(text, "keyword")["sentiment"] == "positive"
+
+    try:
+        registry.get("missing")
+    except KeyError:
+        print("   ✅ Engines reused and unknown engines rejected")
+        return
+    raise AssertionError("Expected KeyError for unknown engine")
+
+
+def test_repeated_texts_served_from_cache():
+    """Repeats hit the LRU cache; cached results cannot be mutated by callers"""
+    registry = SentimentEngineRegistry(cache_size=2)
+    engine = CountingEngine()
+    registry.register("counting", lambda: engine)
+
+    first = registry.analyze("great stuff", "counting")
+    first["sentiment"] = "tampered"
+    assert registry.analyze("great stuff", "counting")["sentiment"] == "positive"
+    assert engine.calls == 1
+
+    registry.analyze("bad stuff", "counting")
+    registry.analyze("okay stuff", "counting")  # evicts "great stuff"
+    registry.analyze("great stuff", "counting")
+    assert engine.calls == 4
+
+    stats = registry.stats()
+    print(f"   📊 {stats}")
+    assert stats["hits"] == 1 and stats["cache_entries"] == 2
+    print("   ✅ Repeated texts scored once")
+
+
+if __name__ == "__main__":
+    test_engines_are_long_lived()
+    test_repeated_texts_served_from_cache()
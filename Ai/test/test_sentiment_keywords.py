@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Test script for the compiled sentiment keyword matcher
+"""
+
+import sys
+import os
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sentiment_analyzer import (KeywordMatcher, analyze_sentiment_keywords,
+                                analyze_emotion, analyze_sentiment_fallback)
+
+
+def test_single_pass_matches_every_lexicon():
+    """One match call reports hits for every lexicon and category"""
+    print("🧪 Testing keyword matcher...")
+
+    text = "Amazing product, I LOVE it! A bit worried it's so-so though; sad, but happy."
+    keywords = analyze_sentiment_keywords(text)
+    assert keywords["keywords"] == [
+        {"word": "amazing", "sentiment": "positive"},
+        {"word": "love", "sentiment": "positive"},
+        {"word": "happy", "sentiment": "positive"},
+        {"word": "sad", "sentiment": "negative"},
+        {"word": "worried", "sentiment": "negative"},
+        {"word": "so-so", "sentiment": "neutral"},
+    ]
+    assert keywords["positive"] == 0.5
+
+    emotion = analyze_emotion(text)
+    assert emotion["emotion_scores"]["joy"] == 0.33
+    assert analyze_sentiment_fallback(text)["sentiment"] == "positive"
+    print("   ✅ Keywords, emotions and fallback agree with the lexicons")
+
+
+def test_whole_words_only():
+    """Keywords no longer match inside longer words"""
+    matcher = KeywordMatcher({"sentiment": {"negative": ["bad", "hard"]}})
+    assert matcher.match("The hardware is badly made")["sentiment"]["negative"] == []
+    assert matcher.match("A bad-tempered, HARD review")["sentiment"]["negative"] == ["bad", "hard"]
+    print("   ✅ Only whole words match")
+
+
+if __name__ == "__main__":
+    test_single_pass_matches_every_lexicon()
+    test_whole_words_only()
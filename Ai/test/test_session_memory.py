@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script for bounded per-session conversation memory
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from session_memory import DiskSessionStore, SessionMemoryStore, estimate_tokens
+
+
+def test_history_stays_within_budget():
+    """Sustained traffic on one session keeps its prompt history bounded"""
+    print("🧪 Testing session memory...")
+
+    store = SessionMemoryStore(max_tokens=400)
+    for i in range(200):
+        store.add_turn("s1", f"Optimize draft number {i} " + "words " * 30,
+                       f"Optimized draft {i} " + "better " * 40)
+
+    history = store.get_history("s1")
+    assert estimate_tokens(history) <= 400 + 50
+    assert "Optimized draft 199" in history
+    assert "Summary of earlier conversation" in history
+    assert "draft number 0 " not in history
+
+    stats = store.stats()
+    print(f"   📊 {stats}")
+    assert stats["largest_session_tokens"] <= 400
+    print("   ✅ History truncated to the token budget")
+
+
+def test_sessions_are_isolated_and_evicted():
+    """Sessions do not see each other and idle ones are dropped"""
+    store = SessionMemoryStore(max_tokens=400, idle_ttl=0.05, max_sessions=2)
+    store.add_turn("a", "hello", "hi there")
+    assert "hello" in store.get_history("a")
+    assert store.get_history("b") == ""
+    assert store.get_history(None) == ""
+
+    store.add_turn("b", "b", "b")
+    store.add_turn("c", "c", "c")
+    assert store.get_history("a") == ""  # least recently used beyond max_sessions
+
+    time.sleep(0.06)
+    assert store.stats()["sessions"] == 0
+    assert store.evicted == 3
+    print("   ✅ Sessions isolated and idle sessions evicted")
+
+
+def test_disk_store_shared_between_workers():
+    """Two stores on one directory (two workers) see one history per session"""
+    with tempfile.TemporaryDirectory() as directory:
+        worker_a = DiskSessionStore(directory, max_tokens=4000)
+        worker_b = DiskSessionStore(directory, max_tokens=4000)
+
+        worker_a.add_turn("s1", "first question", "first answer")
+        worker_b.add_turn("s1", "second question", "second answer")
+        history = worker_a.get_history("s1")
+        assert history.index("first question") < history.index("second question")
+        assert worker_b.get_history("other") == ""
+
+        # Concurrent turns from both workers are all kept
+        threads = [threading.Thread(target=store.add_turn, args=("s2", f"q{i}", f"a{i}"))
+                   for i, store in enumerate([worker_a, worker_b] * 10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert all(f"q{i}\n" in worker_b.get_history("s2") for i in range(20))
+        print("   ✅ Disk sessions shared between workers without lost turns")
+
+        expiring = DiskSessionStore(directory, idle_ttl=0.05, max_sessions=1)
+        time.sleep(0.06)
+        assert expiring.get_history("s1") == ""
+        assert expiring.stats()["sessions"] == 0
+        print("   ✅ Idle disk sessions evicted")
+
+
+if __name__ == "__main__":
+    test_history_stays_within_budget()
+    test_sessions_are_isolated_and_evicted()
+    test_disk_store_shared_between_workers()
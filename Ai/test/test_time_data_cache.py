@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script for the cached feature-engineered timeline frame
+"""
+
+import sys
+import os
+import tempfile
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pandas as pd
+from time_prediction import TimePredictionEngine
+
+HEADER = "title,score,upvote_ratio,num_comments,created_utc,post_type,body\n"
+
+
+def write_timeline(directory, subreddit, rows):
+    path = os.path.join(directory, f"{subreddit}.csv")
+    with open(path, "w") as f:
+        f.write(HEADER)
+        for title, created in rows:
+            f.write(f"{title},10,0.9,3,{created},text,\n")
+    return path
+
+
+def test_cache_reuse_and_invalidation():
+    """Unchanged CSVs come from the cache; modified and removed ones are picked up"""
+    print("🧪 Testing timeline data cache...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        timeline_dir = os.path.join(directory, "timeline")
+        cache_dir = os.path.join(directory, "cache")
+        os.makedirs(timeline_dir)
+        write_timeline(timeline_dir, "aww", [("a", "2020-01-01 08:00:00"), ("b", "2020-01-02 09:00:00")])
+        books = write_timeline(timeline_dir, "books", [("c", "2020-01-03 10:00:00")])
+        engine = TimePredictionEngine(data_path=timeline_dir)
+
+        first = engine.load_engineered_data(cache_dir)
+        assert engine.data_cache_stats["misses"] == 2
+        assert len(first) == 3
+
+        second = engine.load_engineered_data(cache_dir)
+        assert engine.data_cache_stats["hits"] == 2 and engine.data_cache_stats["misses"] == 0
+        pd.testing.assert_frame_equal(
+            first.sort_values("title").reset_index(drop=True)[["subreddit", "title", "hour"]],
+            second.sort_values("title").reset_index(drop=True)[["subreddit", "title", "hour"]])
+        print("   ✅ Second load served from the cache")
+
+        # Same size, new mtime: the file must be re-ingested
+        write_timeline(timeline_dir, "books", [("d", "2020-01-03 22:00:00")])
+        stat = os.stat(books)
+        os.utime(books, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        third = engine.load_engineered_data(cache_dir)
+        assert engine.data_cache_stats["hits"] == 1 and engine.data_cache_stats["misses"] == 1
+        books_rows = third[third["subreddit"] == "books"]
+        assert books_rows["title"].tolist() == ["d"]
+        assert books_rows["hour"].tolist() == [22]
+        print("   ✅ Modified CSV rebuilt, others reused")
+
+        os.remove(books)
+        fourth = engine.load_engineered_data(cache_dir)
+        assert engine.data_cache_stats["removed"] == 1
+        assert set(fourth["subreddit"]) == {"aww"}
+
+        # The cache written after the removal no longer has the dropped file
+        engine.load_engineered_data(cache_dir)
+        assert engine.data_cache_stats == {**engine.data_cache_stats, "hits": 1, "misses": 0, "removed": 0}
+        print("   ✅ Removed CSV dropped from the cache")
+
+
+if __name__ == "__main__":
+    test_cache_reuse_and_invalidation()
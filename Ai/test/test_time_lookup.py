@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test script for the precomputed optimal-time lookup table
+"""
+
+import sys
+import os
+import tempfile
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from time_prediction import TimePredictionEngine, CONTENT_TYPES
+
+MODELS_DIR = os.path.join(os.path.dirname(__file__), '..', 'models')
+
+
+def live_engine(engine):
+    """The same models with the lookup table switched off"""
+    live = TimePredictionEngine()
+    live.global_model = engine.global_model
+    live.feature_columns = engine.feature_columns
+    live.subreddit_models = engine.subreddit_models
+    live.content_type_models = engine.content_type_models
+    return live
+
+
+def assert_lookup_matches_models(engine, subreddits):
+    live = live_engine(engine)
+    for subreddit in subreddits:
+        for content_type in CONTENT_TYPES:
+            cached = engine.lookup_optimal_time(subreddit, content_type)
+            assert cached is not None, (subreddit, content_type)
+            assert cached == live.predict_optimal_time(subreddit, content_type), (subreddit, content_type)
+            assert (engine.lookup_hourly_curve(subreddit, content_type, [0, 9, 18, 23]) ==
+                    live.predict_hourly_curve(subreddit, content_type, [0, 9, 18, 23]))
+
+
+def test_saved_table_matches_models():
+    """The shipped time_lookup.npz answers exactly like the models it was built from"""
+    print("🧪 Testing time lookup table...")
+
+    engine = TimePredictionEngine()
+    engine.load_models(MODELS_DIR)
+    assert engine.lookup_table is not None
+
+    assert_lookup_matches_models(engine, ["funny", "technology", "askreddit"])
+    print("   ✅ Lookup answers match live inference")
+
+
+def test_rebuilt_table_round_trips():
+    """A table saved and loaded again gives the model path's hours"""
+    engine = TimePredictionEngine()
+    engine.load_models(MODELS_DIR)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine.save_lookup_table(directory)
+        reloaded = TimePredictionEngine()
+        reloaded.global_model = engine.global_model
+        reloaded.subreddit_models = engine.subreddit_models
+        reloaded.feature_columns = engine.feature_columns
+        # No model files here: only the table is loaded
+        reloaded.load_models(directory)
+
+    assert reloaded.lookup_table is not None
+    assert_lookup_matches_models(reloaded, ["gaming", "science"])
+    assert reloaded.lookup_optimal_time("unknown_subreddit", "text") is None
+    print("   ✅ Saved table reloads and matches; unknown subreddits fall back to the models")
+
+
+if __name__ == "__main__":
+    test_saved_table_matches_models()
+    test_rebuilt_table_round_trips()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test script for per-file explicit-format timestamp parsing
+"""
+
+import sys
+import os
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pandas as pd
+from time_prediction import parse_timestamps
+
+# One value per accepted format, all meaning 2021-03-04 05:06 (seconds where the format has them)
+FORMAT_SAMPLES = {
+    '%Y-%m-%d %H:%M:%S': '2021-03-04 05:06:07',
+    '%m/%d/%Y %H:%M': '03/04/2021 05:06',
+    '%Y-%m-%dT%H:%M:%S': '2021-03-04T05:06:07',
+    '%Y-%m-%d %H:%M': '2021-03-04 05:06',
+    '%m/%d/%Y %H:%M:%S': '03/04/2021 05:06:07',
+    '%Y-%m-%d': '2021-03-04',
+}
+
+
+def test_each_format_parsed_fast():
+    """Every accepted format is detected per file and parsed on the fast path"""
+    print("🧪 Testing timestamp parsing...")
+
+    values = pd.Series(list(FORMAT_SAMPLES.values()) * 2)
+    groups = pd.Series([f"file{i}" for i in range(len(FORMAT_SAMPLES))] * 2)
+    parsed, counts = parse_timestamps(values, groups)
+
+    assert counts == {'fast': len(values), 'slow': 0, 'invalid': 0}
+    for fmt, value in FORMAT_SAMPLES.items():
+        expected = pd.to_datetime(value, format=fmt)
+        assert (parsed[values == value] == expected).all(), fmt
+    assert parsed.iloc[1] == pd.Timestamp('2021-03-04 05:06')
+    print("   ✅ All accepted formats parsed with explicit formats")
+
+
+def test_invalid_and_leftover_values():
+    """Unparseable values become NaT; odd ones in a file fall back to the mixed parser"""
+    values = pd.Series(['2021-03-04 05:06:07', '2021-03-05 06:07:08', 'not a date',
+                        'March 6 2021 07:08', None])
+    parsed, counts = parse_timestamps(values, pd.Series(['a'] * len(values)))
+
+    assert counts == {'fast': 2, 'slow': 1, 'invalid': 2}
+    assert parsed.iloc[3] == pd.Timestamp('2021-03-06 07:08')
+    assert parsed.iloc[2] is pd.NaT and parsed.iloc[4] is pd.NaT
+    print("   ✅ Invalid values rejected, leftovers parsed by the mixed parser")
+
+
+if __name__ == "__main__":
+    test_each_format_parsed_fast()
+    test_invalid_and_leftover_values()